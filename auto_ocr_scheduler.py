@@ -0,0 +1,124 @@
+"""
+Adaptive pacing for Auto-OCR.
+
+Replaces the fixed 2-second sleep between Auto-OCR passes:
+- while the region keeps changing, passes run every min_interval seconds
+- every pass that finds the region unchanged multiplies the interval by
+  backoff, up to max_interval
+- the delay after a pass is never shorter than what keeps CPU use (measured
+  as process CPU time spent in the pass) under cpu_budget of one core
+- passes run one at a time on a single worker; restarting the scheduler
+  waits for a pass still in flight instead of overlapping it
+"""
+
+import threading
+import time
+
+
+class AdaptiveOcrScheduler:
+    """Runs an OCR pass function repeatedly with adaptive, non-overlapping pacing"""
+
+    def __init__(self, min_interval=0.25, max_interval=4.0, backoff=2.0, cpu_budget=0.5):
+        """
+        min_interval: seconds between passes while text is changing
+        max_interval: longest wait while the screen is static
+        backoff: interval multiplier for every unchanged pass
+        cpu_budget: fraction of one core (0-1] Auto-OCR may use on average
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.cpu_budget = cpu_budget
+
+        self.interval = min_interval
+        self.last_delay = 0.0
+        self.last_pass_cpu = 0.0
+        self.passes = 0
+        self.cpu_time = 0.0
+        self.started_at = None
+
+        self._pass_lock = threading.Lock()
+        self._stop_event = None
+        self._wake_event = threading.Event()
+
+    def next_delay(self, changed, pass_cpu):
+        """Seconds to wait after a pass, given whether it found new text and its CPU cost"""
+        if changed:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.max_interval, self.interval * self.backoff)
+
+        # busy / (busy + idle) <= budget  =>  idle >= busy * (1 / budget - 1)
+        budget = min(1.0, max(0.01, self.cpu_budget))
+        budget_delay = pass_cpu * (1.0 / budget - 1.0)
+        return max(self.interval, budget_delay)
+
+    def run_pass(self, pass_func, stop_event=None):
+        """Run one pass (serialized with every other pass) and return (changed, cpu seconds)"""
+        with self._pass_lock:
+            if stop_event is not None and stop_event.is_set():
+                return False, 0.0  # stopped while waiting for a previous pass
+            cpu_start = time.process_time()
+            changed = bool(pass_func())
+            pass_cpu = time.process_time() - cpu_start
+
+        self.passes += 1
+        self.cpu_time += pass_cpu
+        self.last_pass_cpu = pass_cpu
+        return changed, pass_cpu
+
+    def start(self, pass_func):
+        """
+        Start calling pass_func() in a background thread until stop().
+        pass_func returns True when the region changed (and was OCR'd).
+        """
+        self.stop()
+        stop_event = threading.Event()
+        self._stop_event = stop_event
+        self.interval = self.min_interval
+        self.passes = 0
+        self.cpu_time = 0.0
+        self.started_at = time.monotonic()
+
+        def loop():
+            while not stop_event.is_set():
+                try:
+                    changed, pass_cpu = self.run_pass(pass_func, stop_event)
+                except Exception as e:
+                    print(f"Auto-OCR pass failed: {e}")
+                    changed, pass_cpu = False, 0.0
+                if stop_event.is_set():
+                    break
+
+                self.last_delay = self.next_delay(changed, pass_cpu)
+                self._wake_event.clear()
+                deadline = time.monotonic() + self.last_delay
+                # Wake early on stop() or poke()
+                while not stop_event.is_set() and not self._wake_event.is_set():
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._wake_event.wait(min(remaining, 0.1))
+
+        threading.Thread(target=loop, daemon=True).start()
+
+    def poke(self):
+        """Drop back to fast polling now (e.g. after a manual OCR or a key press)"""
+        self.interval = self.min_interval / self.backoff
+        self._wake_event.set()
+
+    def stop(self):
+        """Stop the loop; a pass in flight finishes but no new one starts"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+            self._stop_event = None
+
+    def is_running(self):
+        return self._stop_event is not None
+
+    def cpu_usage(self):
+        """Average share of one core used by passes since start()"""
+        if self.started_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self.started_at
+        return self.cpu_time / elapsed if elapsed > 0 else 0.0
@@ -0,0 +1,265 @@
+#!/usr/bin/env python
+"""
+Headless batch OCR + translation for folders of manga pages and screenshots.
+
+Reuses the shared OCR engine, the normalization engine and the Ollama
+translator backend without any Tk or screen-capture dependency, so it runs on
+display-less machines. Results are written as JSON Lines, one record per
+image region, as soon as each one is translated.
+
+Examples:
+    python batch_translate.py chapter01/ -o chapter01.jsonl
+    python batch_translate.py shots/ --regions region_map.json --processes --ocr-workers 4
+    python batch_translate.py pages/ --no-translate --ocr-workers 2
+    python batch_translate.py manga/ --bubbles -o manga.jsonl
+
+The optional region map is a JSON object mapping image file names (relative
+to the input folder) to lists of [x, y, width, height] regions. The key "*"
+applies to every image without its own entry. Images without regions are
+OCR'd whole. With --bubbles, text blocks / speech bubbles are detected inside
+each region and only those crops are OCR'd (one line per block).
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from PIL import Image
+
+from text_normalizer import normalize_for_translation
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.webp', '.bmp')
+
+
+def find_images(input_dir, recursive=False):
+    """Sorted image paths under input_dir"""
+    paths = []
+    if recursive:
+        for folder, _, files in os.walk(input_dir):
+            paths.extend(os.path.join(folder, name) for name in files)
+    else:
+        paths = [os.path.join(input_dir, name) for name in os.listdir(input_dir)]
+    return sorted(p for p in paths if p.lower().endswith(IMAGE_EXTENSIONS) and os.path.isfile(p))
+
+
+def load_region_map(path):
+    """Load the {file name: [[x, y, w, h], ...]} map (empty if no path)"""
+    if not path:
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def regions_for(image_path, input_dir, region_map):
+    """Regions to OCR for an image; [None] means the whole image"""
+    name = os.path.relpath(image_path, input_dir).replace(os.sep, '/')
+    regions = region_map.get(name, region_map.get('*'))
+    return [tuple(r) for r in regions] if regions else [None]
+
+
+def crop_regions(image_path, regions):
+    """Open an image and return one RGB crop per region"""
+    with Image.open(image_path) as image:
+        image = image.convert('RGB')
+        return [image if region is None else
+                image.crop((region[0], region[1], region[0] + region[2], region[1] + region[3]))
+                for region in regions]
+
+
+def recognize_crops(engine, crops, bubbles=False):
+    """
+    OCR crops in one batched call. With bubbles, every detected text block of
+    every crop goes into the same batch and block texts are joined per crop.
+    """
+    if not bubbles:
+        texts = engine.recognize_batch(crops)
+        return [normalize_for_translation(text.strip()) for text in texts]
+
+    from bubble_detector import crop_blocks, detect_text_blocks
+
+    block_crops, owners = [], []
+    for index, crop in enumerate(crops):
+        blocks = detect_text_blocks(crop)
+        pieces = crop_blocks(crop, blocks) if blocks else [crop]
+        block_crops.extend(pieces)
+        owners.extend([index] * len(pieces))
+
+    lines = [[] for _ in crops]
+    for owner, text in zip(owners, engine.recognize_batch(block_crops)):
+        text = normalize_for_translation(text.strip())
+        if text:
+            lines[owner].append(text)
+    return ["\n".join(crop_lines) for crop_lines in lines]
+
+
+# --- OCR in threads (one shared model, inference serialized by the engine) ---
+
+def ocr_image_threaded(image_path, regions, bubbles=False):
+    from ocr_engine import get_ocr_engine
+
+    start = time.perf_counter()
+    texts = recognize_crops(get_ocr_engine(), crop_regions(image_path, regions), bubbles)
+    return texts, time.perf_counter() - start
+
+
+# --- OCR in worker processes (one model per process, true parallelism) ---
+
+_process_engine = None
+
+
+def _init_process_worker():
+    global _process_engine
+    from ocr_engine import OcrEngine, OcrModelHolder, _create_manga_ocr
+
+    # Already one process per model: never nest an OCR_WORKER_PROCESSES pool
+    _process_engine = OcrEngine(holder=OcrModelHolder(factory=_create_manga_ocr))
+    _process_engine.wait_ready()
+
+
+def ocr_image_in_process(image_path, regions, bubbles=False):
+    start = time.perf_counter()
+    texts = recognize_crops(_process_engine, crop_regions(image_path, regions), bubbles)
+    return texts, time.perf_counter() - start
+
+
+class JsonlWriter:
+    """Thread-safe JSON Lines writer that flushes every record"""
+
+    def __init__(self, path):
+        self.file = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8')
+        self.lock = threading.Lock()
+
+    def write(self, record):
+        line = json.dumps(record, ensure_ascii=False)
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+
+    def close(self):
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+def build_translator(args):
+    """Translator backend plus the persistent cache, or (None, None) with --no-translate"""
+    if args.no_translate:
+        return None, None
+    from translation_cache import TranslationCache
+    from translator_backend import OllamaTranslator
+
+    translator = OllamaTranslator(host=args.host, max_connections=args.translate_concurrency)
+    cache = TranslationCache(args.cache) if args.cache else None
+    return translator, cache
+
+
+def translate(translator, cache, text):
+    """Translate one line, using the cache when available"""
+    from translator_backend import PROMPT_VERSION
+
+    if cache is not None:
+        cached = cache.get(text, translator.model, PROMPT_VERSION)
+        if cached is not None:
+            return cached
+    translation = translator.translate(text)
+    if cache is not None:
+        cache.put(text, translator.model, PROMPT_VERSION, translation)
+    return translation
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch OCR and translate a folder of images")
+    parser.add_argument("input_dir", help="Folder containing page images or screenshots")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output file (default: stdout)")
+    parser.add_argument("--regions", help="JSON map of image name -> [[x, y, w, h], ...]")
+    parser.add_argument("--recursive", action="store_true", help="Include images in sub-folders")
+    parser.add_argument("--ocr-workers", type=int, default=2, help="Parallel OCR jobs")
+    parser.add_argument("--bubbles", action="store_true",
+                        help="Detect text blocks / speech bubbles and OCR only those")
+    parser.add_argument("--processes", action="store_true",
+                        help="Run OCR in worker processes (one model each) instead of threads")
+    parser.add_argument("--translate-concurrency", type=int, default=2,
+                        help="Maximum simultaneous Ollama requests")
+    parser.add_argument("--no-translate", action="store_true", help="Only OCR, skip translation")
+    parser.add_argument("--host", help="Ollama host (default: $OLLAMA_HOST or localhost)")
+    parser.add_argument("--cache", default="translation_cache.sqlite3",
+                        help="Translation cache database ('' to disable)")
+    args = parser.parse_args()
+
+    images = find_images(args.input_dir, args.recursive)
+    if not images:
+        print(f"No images found in {args.input_dir}", file=sys.stderr)
+        return 1
+
+    region_map = load_region_map(args.regions)
+    translator, cache = build_translator(args)
+    writer = JsonlWriter(args.output)
+
+    if args.processes:
+        ocr_pool = ProcessPoolExecutor(max_workers=args.ocr_workers, initializer=_init_process_worker)
+        ocr_job = ocr_image_in_process
+    else:
+        from ocr_engine import get_ocr_engine
+        get_ocr_engine().start()
+        ocr_pool = ThreadPoolExecutor(max_workers=args.ocr_workers)
+        ocr_job = ocr_image_threaded
+    translate_pool = ThreadPoolExecutor(max_workers=max(1, args.translate_concurrency))
+
+    def finish(record, text):
+        """Translate (if enabled) and write one region's record"""
+        try:
+            if translator is not None and text:
+                start = time.perf_counter()
+                record["translation"] = translate(translator, cache, text)
+                record["translate_seconds"] = round(time.perf_counter() - start, 3)
+        except Exception as e:
+            record["error"] = f"Translation failed: {e}"
+        writer.write(record)
+
+    start_time = time.perf_counter()
+    ocr_futures = {}
+    for image_path in images:
+        regions = regions_for(image_path, args.input_dir, region_map)
+        future = ocr_pool.submit(ocr_job, image_path, regions, args.bubbles)
+        ocr_futures[future] = (image_path, regions)
+
+    translate_futures = []
+    done_pages = 0
+    for future in as_completed(ocr_futures):
+        image_path, regions = ocr_futures[future]
+        name = os.path.relpath(image_path, args.input_dir)
+        done_pages += 1
+        try:
+            texts, ocr_seconds = future.result()
+        except Exception as e:
+            writer.write({"file": name, "error": f"OCR failed: {e}"})
+            continue
+
+        for region, text in zip(regions, texts):
+            record = {
+                "file": name,
+                "region": list(region) if region else None,
+                "text": text,
+                "ocr_seconds": round(ocr_seconds, 3),
+            }
+            translate_futures.append(translate_pool.submit(finish, record, text))
+        print(f"[{done_pages}/{len(images)}] OCR done: {name}", file=sys.stderr)
+
+    for future in translate_futures:
+        future.result()
+
+    ocr_pool.shutdown()
+    translate_pool.shutdown()
+    writer.close()
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Processed {len(images)} images in {elapsed:.1f}s "
+          f"({len(images) / elapsed * 60:.1f} pages/min)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Benchmark batched multi-region OCR against sequential MangaOCR calls.
+
+Crops N regions (the ones in region_config.json, repeated as needed) either
+from a real screenshot passed with --image or from a synthetic frame, then
+compares N single-image model calls with one batched generate() call.
+The OCR result cache is bypassed so every run pays for inference.
+"""
+
+import argparse
+import time
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from bench_capture_ocr import load_region_sizes
+from ocr_engine import get_ocr_engine
+
+
+def synthetic_screen(width=1920, height=1080):
+    """A light frame with dark strokes so the model has something to decode"""
+    image = Image.new('RGB', (width, height), (235, 235, 235))
+    draw = ImageDraw.Draw(image)
+    rng = np.random.default_rng(0)
+    for _ in range(400):
+        x, y = int(rng.integers(0, width - 40)), int(rng.integers(0, height - 40))
+        draw.line((x, y, x + int(rng.integers(5, 40)), y + int(rng.integers(5, 40))), fill=(20, 20, 20), width=3)
+    return image
+
+
+def make_crops(screen, sizes, count):
+    """Crop count regions of the given sizes from the screen image"""
+    crops = []
+    for i in range(count):
+        width, height = sizes[i % len(sizes)]
+        width, height = min(width, screen.width), min(height, screen.height)
+        x = (i * 97) % (screen.width - width + 1)
+        y = (i * 53) % (screen.height - height + 1)
+        crops.append(screen.crop((x, y, x + width, y + height)))
+    return crops
+
+
+def time_call(func, repeats):
+    """Mean wall-clock seconds of func()"""
+    func()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batched multi-region OCR")
+    parser.add_argument("--image", help="Screenshot to crop regions from (default: synthetic frame)")
+    parser.add_argument("--counts", type=int, nargs="+", default=[2, 4, 8], help="Region counts to test")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per measurement")
+    parser.add_argument("--config", default="region_config.json", help="Region config to read sizes from")
+    args = parser.parse_args()
+
+    screen = Image.open(args.image).convert('RGB') if args.image else synthetic_screen()
+    sizes = load_region_sizes(args.config)
+
+    engine = get_ocr_engine()
+    print("Loading MangaOCR...")
+    if not engine.wait_ready():
+        print("MangaOCR could not be loaded")
+        return
+
+    print(f"{'Regions':>7} | {'sequential (s)':>14} | {'batched (s)':>11} | {'speedup':>7}")
+    print("-" * 50)
+
+    for count in args.counts:
+        crops = make_crops(screen, sizes, count)
+        sequential = time_call(lambda: [engine._infer(crop) for crop in crops], args.repeats)
+        batched = time_call(lambda: engine._infer_batch(crops), args.repeats)
+        print(f"{count:>7} | {sequential:>14.2f} | {batched:>11.2f} | {sequential / batched:>6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
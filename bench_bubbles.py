@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+"""
+Benchmark bubble-by-bubble OCR against whole-region OCR.
+
+For every page, times:
+- whole: one MangaOCR inference on the full captured region
+- bubbles: text-block detection plus one batched inference over the crops
+
+Pages come from --pages (a folder of real manga pages / screenshots) or are
+synthesized at the region sizes in region_config.json: textured background art
+with a few white speech bubbles holding glyph-like vertical text columns.
+Both paths bypass the OCR result cache. --detect-only skips the model and
+times the detector alone.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+from bench_capture_ocr import load_region_sizes
+from bubble_detector import crop_blocks, detect_text_blocks
+
+
+def make_page(width, height, seed=0):
+    """Synthetic page: noisy art, white ellipse bubbles with dark text columns"""
+    rng = np.random.default_rng(seed)
+    page = rng.integers(60, 190, size=(height, width, 3), dtype=np.uint8)
+    page = cv2.GaussianBlur(page, (9, 9), 0)
+
+    bubble_count = max(1, width // 400)
+    char = max(10, height // 12)
+    for index in range(bubble_count):
+        cx = int((index + 0.5) * width / bubble_count)
+        cy = height // 2
+        axes = (min(width // (bubble_count * 2) - 10, char * 3), min(height // 2 - 10, char * 6))
+        cv2.ellipse(page, (cx, cy), axes, 0, 0, 360, (255, 255, 255), -1)
+        cv2.ellipse(page, (cx, cy), axes, 0, 0, 360, (0, 0, 0), 2)
+
+        # Two vertical columns of blocky "characters"
+        for column in range(2):
+            x = cx + (column - 1) * int(char * 1.4) + char // 4
+            for row in range(max(1, (2 * axes[1] - 2 * char) // (char + 4))):
+                y = cy - axes[1] + char + row * (char + 4)
+                cv2.rectangle(page, (x, y), (x + char - 4, y + char - 4), (20, 20, 20), 2)
+                cv2.line(page, (x + 2, y + char // 2), (x + char - 6, y + char // 2), (20, 20, 20), 2)
+
+    return Image.fromarray(page, 'RGB')
+
+
+def load_pages(folder):
+    names = sorted(n for n in os.listdir(folder) if n.lower().endswith(('.png', '.jpg', '.jpeg', '.webp')))
+    pages = []
+    for name in names:
+        with Image.open(os.path.join(folder, name)) as image:
+            pages.append((name, image.convert('RGB')))
+    return pages
+
+
+def time_call(func, repeats):
+    """Return (mean ms, last result) of func()"""
+    result = func()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        result = func()
+    return (time.perf_counter() - start) * 1000 / repeats, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bubble OCR vs whole-region OCR")
+    parser.add_argument("--pages", help="Folder of page images (default: synthetic pages)")
+    parser.add_argument("--config", default="region_config.json", help="Region config to read sizes from")
+    parser.add_argument("--repeats", type=int, default=5, help="Iterations per page")
+    parser.add_argument("--detect-only", action="store_true", help="Time the detector without MangaOCR")
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = load_pages(args.pages)
+    else:
+        pages = [(f"{w}x{h}", make_page(w, h)) for w, h in load_region_sizes(args.config)]
+
+    engine = None
+    if not args.detect_only:
+        from ocr_engine import get_ocr_engine
+        engine = get_ocr_engine()
+        engine.start()
+        engine.wait_ready()
+
+    print(f"{'Page':>16} | {'blocks':>6} | {'detect (ms)':>11} | {'whole (ms)':>10} | {'bubbles (ms)':>12} | {'speedup':>7}")
+    print("-" * 80)
+
+    for name, page in pages:
+        detect_ms, blocks = time_call(lambda: detect_text_blocks(page), args.repeats)
+        if engine is None:
+            print(f"{name:>16} | {len(blocks):>6} | {detect_ms:>11.2f} | {'-':>10} | {'-':>12} | {'-':>7}")
+            continue
+
+        whole_ms, _ = time_call(lambda: engine._infer(page), args.repeats)
+
+        def bubble_ocr():
+            found = detect_text_blocks(page)
+            return engine._infer_batch(crop_blocks(page, found)) if found else [engine._infer(page)]
+
+        bubble_ms, _ = time_call(bubble_ocr, args.repeats)
+        print(f"{name:>16} | {len(blocks):>6} | {detect_ms:>11.2f} | {whole_ms:>10.1f} | "
+              f"{bubble_ms:>12.1f} | {whole_ms / bubble_ms:>6.2f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
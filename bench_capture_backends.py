@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Benchmark per-frame capture latency for each screen capture backend.
+
+For every available backend and every region size from region_config.json,
+times grab_array (into the reusable buffer, what Auto-OCR uses for change
+detection) and grab (a new PIL image, what goes to OCR). The file-backed
+fake screen always runs; MSS and pyautogui need a display (use xvfb-run on
+headless Linux).
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+from bench_capture_ocr import load_region_sizes
+from screen_capture import MSS_INSTALLED, FileBackend, MssBackend, PyAutoGuiBackend
+
+
+def available_backends(sizes):
+    width = max(w for w, _ in sizes)
+    height = max(h for _, h in sizes)
+    screen = np.random.default_rng(0).integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+    backends = [FileBackend([screen])]
+
+    has_display = not sys.platform.startswith("linux") or bool(os.environ.get("DISPLAY"))
+    if has_display and MSS_INSTALLED:
+        backends.append(MssBackend())
+    if has_display:
+        try:
+            import pyautogui  # noqa: F401
+            backends.append(PyAutoGuiBackend())
+        except Exception as e:
+            print(f"pyautogui backend unavailable: {e}")
+    return backends
+
+
+def time_call(func, repeats):
+    """Return the mean wall-clock time of func() in milliseconds"""
+    func()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark screen capture backends")
+    parser.add_argument("--repeats", type=int, default=50, help="Grabs per backend and region size")
+    parser.add_argument("--config", default="region_config.json", help="Region config to read sizes from")
+    args = parser.parse_args()
+
+    sizes = load_region_sizes(args.config)
+    backends = available_backends(sizes)
+
+    print(f"{'Backend':>10} | {'Region':>12} | {'grab_array (ms)':>15} | {'grab PIL (ms)':>13} | {'fps (array)':>11}")
+    print("-" * 74)
+
+    for backend in backends:
+        for width, height in sizes:
+            region = (0, 0, width, height)
+            array_ms = time_call(lambda: backend.grab_array(region), args.repeats)
+            image_ms = time_call(lambda: backend.grab(region), args.repeats)
+            print(f"{backend.name:>10} | {width:>5}x{height:<6} | {array_ms:>15.2f} | "
+                  f"{image_ms:>13.2f} | {1000 / array_ms:>11.0f}")
+        backend.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+#!/usr/bin/env python
+"""
+Benchmark the capture-to-OCR hand-off.
+
+Compares the old path (RGB->BGR swap, PNG write to _ocr_tmp.png, PNG decode)
+with the in-memory path that hands the captured PIL image straight to MangaOCR.
+Region sizes are taken from region_config.json so the numbers match real
+dialogue boxes. Pass --with-ocr to include the MangaOCR inference itself.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import cv2
+import numpy as np
+from PIL import Image
+
+DEFAULT_SIZES = [(1644, 232), (1251, 346), (800, 200)]
+
+
+def load_region_sizes(config_file="region_config.json"):
+    """Collect unique (width, height) pairs from the saved region config"""
+    if not os.path.exists(config_file):
+        return DEFAULT_SIZES
+
+    try:
+        with open(config_file, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except Exception as e:
+        print(f"Could not read {config_file}: {e}")
+        return DEFAULT_SIZES
+
+    sizes = []
+    for regions in config.values():
+        for region_data in regions:
+            _, _, width, height = region_data['region']
+            if (width, height) not in sizes:
+                sizes.append((width, height))
+    return sizes or DEFAULT_SIZES
+
+
+def make_frame(width, height):
+    """Build a screenshot-like PIL image (noisy background, dark text band)"""
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+    pixels[height // 3:2 * height // 3, :, :] //= 4
+    return Image.fromarray(pixels, 'RGB')
+
+
+def prepare_via_temp_file(screenshot, temp_path):
+    """Old path: color swap, PNG encode, disk write, PNG decode"""
+    img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+    cv2.imwrite(temp_path, img)
+    loaded = Image.open(temp_path)
+    # MangaOCR converts every input to grayscale then back to RGB
+    return loaded.convert('L').convert('RGB')
+
+
+def prepare_in_memory(screenshot):
+    """New path: the captured image goes straight to MangaOCR"""
+    return screenshot.convert('L').convert('RGB')
+
+
+def time_call(func, repeats):
+    """Return the mean wall-clock time of func() in milliseconds"""
+    func()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark capture-to-OCR hand-off")
+    parser.add_argument("--repeats", type=int, default=50, help="Iterations per region size")
+    parser.add_argument("--config", default="region_config.json", help="Region config to read sizes from")
+    parser.add_argument("--with-ocr", action="store_true", help="Also run MangaOCR on each prepared frame")
+    args = parser.parse_args()
+
+    manga_ocr = None
+    if args.with_ocr:
+        from manga_ocr import MangaOcr
+        manga_ocr = MangaOcr()
+
+    temp_path = os.path.join(tempfile.gettempdir(), "_ocr_bench_tmp.png")
+    sizes = load_region_sizes(args.config)
+
+    print(f"{'Region':>12} | {'temp file (ms)':>14} | {'in-memory (ms)':>14} | {'saved (ms)':>10}")
+    print("-" * 60)
+
+    for width, height in sizes:
+        screenshot = make_frame(width, height)
+
+        if manga_ocr:
+            old = lambda: manga_ocr(prepare_via_temp_file(screenshot, temp_path))
+            new = lambda: manga_ocr(screenshot)
+        else:
+            old = lambda: prepare_via_temp_file(screenshot, temp_path)
+            new = lambda: prepare_in_memory(screenshot)
+
+        old_ms = time_call(old, args.repeats)
+        new_ms = time_call(new, args.repeats)
+        print(f"{width:>5}x{height:<6} | {old_ms:>14.2f} | {new_ms:>14.2f} | {old_ms - new_ms:>10.2f}")
+
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
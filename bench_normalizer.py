@@ -0,0 +1,178 @@
+#!/usr/bin/env python
+"""
+Benchmark the shared text normalization engine.
+
+Runs the precompiled engine (text_normalizer) and verbatim copies of the two
+original implementations over a corpus of OCR outputs, checks that every line
+normalizes identically, and reports lines per second for each.
+
+The corpus is a UTF-8 file with one OCR result per line ("\\n" inside a result
+is written as a literal backslash-n). Without --corpus, a built-in sample of
+game/manga OCR lines plus randomized noisy lines is used.
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+
+from text_normalizer import normalize_for_translation, normalize_light
+
+SAMPLE_LINES = [
+    "「おい、待てよ！？」",
+    "今日はいい天気ですね。散歩に行きましょう。",
+    "な、なんだって……！？",
+    "そんな…… ありえない。。。",
+    "ちょっと待って?!  まだ話は終わってない",
+    "この先は危険だ。、気をつけろ",
+    "『魔王を倒す』？』",
+    "HP が 足りない！！！！",
+    "あ",
+    "　ここは\nどこだ？",
+    "アイテムを手に入れた！ 回復薬×3",
+    "»選択肢を選んでください«",
+    "...そうか。",
+    "．．．わかった",
+    "そうだね？」",
+    "もう一度\n\n説明して",
+    "～～～ 第一章 ～～～",
+    "はい、、、わかりました",
+]
+
+NOISE_ALPHABET = list("あいうえおかきくけこアイウエオ日本語魔王勇者。、！？!?』」「…‥～〜．.»« 　\n") + ["a", "1"]
+
+
+def legacy_normalize_for_translation(text):
+    """ScreenTranslatorApp.normalize_for_translation before the shared engine"""
+    if not text:
+        return text
+        
+    # Remove stray characters and OCR noise
+    # Remove trailing/leading single kana characters (common OCR artifacts)
+    text = re.sub(r'[\u3000\s]*[\u3041-\u3096\u30A1-\u30FA]{1,2}[\u3000\s]*$', ' ', text)
+    text = re.sub(r'^[\u3000\s]*[\u3041-\u3096\u30A1-\u30FA]{1,2}[\u3000\s]*', ' ', text)
+        
+    # Remove repeated symbols and noise
+    text = re.sub(r'[\uFF5E\u301C\u2026\u2025]{2,}', ' ', text)
+    text = re.sub(r'[\u3000\s]{2,}', ' ', text)
+        
+    # Normalize punctuation
+    punctuation_fixes = {
+        '……': '・・・',
+        '。。': '。。',
+        '、、': '、、',
+        '？！': '！？',
+        '？』': '！？',
+        '?!' : '！？',
+        '!?' : '！？',
+        '。、': '、',
+        '、。': '。',
+    }
+        
+    for bad, good in punctuation_fixes.items():
+        text = text.replace(bad, good)
+        
+    # Fix broken line structures and merge split sentences
+    # Remove line breaks within sentences
+    text = re.sub(r'(?<=[\u3041-\u3096\u30A1-\u30FA\u4E00-\u9FFF])\n(?=[\u3041-\u3096\u30A1-\u30FA\u4E00-\u9FFF])', '', text)
+        
+    # Normalize Japanese punctuation spacing
+    text = re.sub(r'([、。！？])\s+', r'\1', text)  # Remove spaces after punctuation
+    text = re.sub(r'\s+([、。！？])', r'\1', text)  # Remove spaces before punctuation
+        
+    # Clean up multiple punctuation marks
+    text = re.sub(r'([。！？])\1{2,}', r'\1\1', text)  # Limit to 2 consecutive same punctuation
+    text = re.sub(r'([、])\1{2,}', r'\1\1', text)    # Limit to 2 consecutive commas
+        
+    # Remove leading/trailing whitespace and normalize internal spacing
+    text = re.sub(r'\s+', ' ', text).strip()
+        
+    # Ensure proper sentence boundaries
+    text = re.sub(r'([。！？])([\u3041-\u3096\u30A1-\u30FA\u4E00-\u9FFF])', r'\1 \2', text)
+        
+    return text.strip()
+
+
+def legacy_normalize_light(text):
+    """jap_extracter.normalize_for_translation before the shared engine"""
+    fixes = {
+        "．．．": "・・・",
+        "...": "・・・",
+        "？！」": "！？",
+        "？」": "！？",
+        "?!": "！？",
+        "!?": "！？",
+        "»": "",
+        "«": "",
+    }
+    for bad, good in fixes.items():
+        text = text.replace(bad, good)
+    text = text.replace("  ", " ").strip()
+    return text
+
+
+def load_corpus(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.rstrip('\n').replace('\\n', '\n') for line in f if line.strip()]
+
+
+def noisy_lines(count, seed=0):
+    """Random OCR-like strings that stress every rule and their interactions"""
+    rng = random.Random(seed)
+    return ["".join(rng.choice(NOISE_ALPHABET) for _ in range(rng.randint(0, 40))) for _ in range(count)]
+
+
+def check_identical(lines, new, legacy, name):
+    """Return the number of lines where the engine and the legacy rules disagree"""
+    mismatches = 0
+    for line in lines:
+        expected, actual = legacy(line), new(line)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"  {name} mismatch for {line!r}: expected {expected!r}, got {actual!r}")
+    return mismatches
+
+
+def lines_per_second(func, lines, repeats, rounds=5):
+    """Best of several timed rounds, so a noisy machine does not skew the ratio"""
+    best = float('inf')
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for line in lines:
+                func(line)
+        best = min(best, time.perf_counter() - start)
+    return len(lines) * repeats / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark OCR text normalization")
+    parser.add_argument("--corpus", help="File with one recorded OCR output per line")
+    parser.add_argument("--noise", type=int, default=20000, help="Random noisy lines added to the check")
+    parser.add_argument("--repeats", type=int, default=20, help="Passes over the corpus when timing")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else SAMPLE_LINES
+    check_lines = corpus + noisy_lines(args.noise)
+
+    failures = 0
+    for name, new, legacy in (
+        ("full", normalize_for_translation, legacy_normalize_for_translation),
+        ("light", normalize_light, legacy_normalize_light),
+    ):
+        mismatches = check_identical(check_lines, new, legacy, name)
+        failures += mismatches
+        legacy_rate = lines_per_second(legacy, corpus, args.repeats)
+        new_rate = lines_per_second(new, corpus, args.repeats)
+        status = "identical" if not mismatches else f"{mismatches} MISMATCHES"
+        print(f"{name:>5}: {len(check_lines)} lines {status} | "
+              f"legacy {legacy_rate:,.0f} lines/s, engine {new_rate:,.0f} lines/s "
+              f"({new_rate / legacy_rate:.2f}x)")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
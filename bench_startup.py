@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+"""
+Benchmark cold start of the translator window.
+
+Each scenario runs in a fresh interpreter so imports and model loading are cold:
+- eager: import manga_ocr and build MangaOcr() before creating the window
+  (what ScreenTranslatorApp used to do)
+- lazy: create ScreenTranslatorApp with the background model loader and record
+  when the window is up and when the model becomes ready
+
+Requires a display and the full dependency set (manga-ocr, ollama, ...).
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+EAGER_SCRIPT = r"""
+import json, time
+start = time.perf_counter()
+from manga_ocr import MangaOcr
+model = MangaOcr()
+import tkinter as tk
+root = tk.Tk()
+root.update()
+window = time.perf_counter() - start
+root.destroy()
+print(json.dumps({"window": window, "model_ready": window}))
+"""
+
+LAZY_SCRIPT = r"""
+import json, time
+start = time.perf_counter()
+import tkinter as tk
+from translator_app import ScreenTranslatorApp
+root = tk.Tk()
+app = ScreenTranslatorApp(root)
+root.update()
+window = time.perf_counter() - start
+app.ocr_engine.wait_ready()
+model_ready = time.perf_counter() - start
+root.destroy()
+print(json.dumps({"window": window, "model_ready": model_ready}))
+"""
+
+
+def run_scenario(script):
+    """Run a scenario in a fresh interpreter and return its timings"""
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip())
+    # Model loading prints progress lines; the timings are on the last line
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark translator cold start")
+    parser.add_argument("--runs", type=int, default=3, help="Cold launches per scenario")
+    args = parser.parse_args()
+
+    print(f"{'Scenario':>8} | {'window up (s)':>13} | {'model ready (s)':>15}")
+    print("-" * 44)
+
+    for name, script in (("eager", EAGER_SCRIPT), ("lazy", LAZY_SCRIPT)):
+        try:
+            runs = [run_scenario(script) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{name:>8} | failed: {e}")
+            continue
+        window = sum(r["window"] for r in runs) / len(runs)
+        model_ready = sum(r["model_ready"] for r in runs) / len(runs)
+        print(f"{name:>8} | {window:>13.2f} | {model_ready:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Per-game cache partitions.
+
+Translation and OCR caches keep one partition per game executable. Only a
+few partitions stay in memory: switching to a game makes its partition
+active, loading it from disk in a background thread if it is not in memory
+yet, and the least recently played games beyond the limit are evicted.
+Caches that write behind persist a partition when the player switches away
+from its game.
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+NO_GAME = ""  # partition used before any game is known (standalone translator)
+
+
+class GamePartitions:
+    """LRU of per-game cache partitions with background loading"""
+
+    def __init__(self, factory, loader=None, saver=None, max_games=4):
+        """
+        factory(): new empty partition
+        loader(game, partition): fill a new partition from disk (background thread)
+        saver(game, partition): persist a partition switched away from (background thread)
+        max_games: partitions kept in memory, including the active one
+        """
+        self.factory = factory
+        self.loader = loader
+        self.saver = saver
+        self.max_games = max(1, max_games)
+        self.partitions = OrderedDict()  # game -> partition, least recently played first
+        self.ready = {}                  # game -> Event set once the partition is loaded
+        self.game = None
+        self.active = None
+        self.lock = threading.Lock()
+        # One background worker: saves and loads run in the order games were switched
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def activate(self, game):
+        """
+        Make game's partition the active one and return it. A partition that is
+        not in memory starts empty and fills in the background.
+        """
+        with self.lock:
+            if game == self.game:
+                return self.active
+
+            partition = self.partitions.get(game)
+            load = partition is None
+            if load:
+                partition = self.partitions[game] = self.factory()
+                self.ready[game] = threading.Event()
+            self.partitions.move_to_end(game)
+            leaving = [(self.game, self.active)] if self.active is not None else []
+            self.game, self.active = game, partition
+
+            while len(self.partitions) > self.max_games:
+                old_game, _ = self.partitions.popitem(last=False)
+                self.ready.pop(old_game, None)
+            ready = self.ready[game]
+
+        save = leaving if self.saver is not None else []
+        if load or save:
+            self.executor.submit(self._save_and_load, save, game, partition, ready, load)
+        return partition
+
+    def _save_and_load(self, save, game, partition, ready, load):
+        for old_game, old_partition in save:
+            try:
+                self.saver(old_game, old_partition)
+            except Exception as e:
+                print(f"Saving cache partition for {old_game or 'no game'} failed: {e}")
+        if load:
+            try:
+                if self.loader is not None:
+                    self.loader(game, partition)
+            except Exception as e:
+                print(f"Loading cache partition for {game or 'no game'} failed: {e}")
+            finally:
+                ready.set()
+
+    def wait_ready(self, timeout=None):
+        """Block until the active partition has finished loading"""
+        with self.lock:
+            ready = self.ready.get(self.game)
+        return ready.wait(timeout) if ready is not None else True
+
+    def wait_idle(self, timeout=None):
+        """Block until every queued save and load has finished"""
+        try:
+            self.executor.submit(lambda: None).result(timeout)
+        except RuntimeError:
+            pass  # interpreter shutdown: the worker has already finished its queue
+
+    def items(self):
+        """Snapshot of (game, partition) pairs in memory"""
+        with self.lock:
+            return list(self.partitions.items())
+
+    def __len__(self):
+        return len(self.partitions)
@@ -0,0 +1,68 @@
+"""
+Cheap change detection for Auto-OCR captures.
+
+Each capture is converted to grayscale and compared with the last frame that
+was actually sent to OCR, tile by tile at full resolution. A frame counts as
+changed when any one tile changed enough: a one-word edit is a tiny fraction
+of a wide dialogue box, but most of the tiles it touches. Frames that are
+effectively identical are skipped so MangaOCR and Ollama only run when the
+dialogue box changes.
+"""
+
+import numpy as np
+from PIL import Image
+
+
+class FrameChangeDetector:
+    """Decides whether a captured region changed enough to be re-OCR'd"""
+
+    def __init__(self, threshold=0.02, pixel_tolerance=24, tile_size=32):
+        """
+        threshold: fraction of pixels (0-1) that must change in at least one tile
+        pixel_tolerance: per-pixel grayscale delta (0-255) ignored as noise
+        tile_size: edge of the square tiles compared, in pixels
+        """
+        self.threshold = threshold
+        self.pixel_tolerance = pixel_tolerance
+        self.tile_size = tile_size
+        self.last_fingerprint = None
+        self.frames_seen = 0
+        self.frames_skipped = 0
+
+    def fingerprint(self, image):
+        """Full-resolution grayscale version of the capture"""
+        if isinstance(image, np.ndarray):
+            image = Image.fromarray(image)
+        return np.asarray(image.convert('L'), dtype=np.int16)
+
+    def change_ratio(self, fingerprint):
+        """Largest fraction of changed pixels in any tile, against the last OCR'd frame"""
+        if self.last_fingerprint is None or self.last_fingerprint.shape != fingerprint.shape:
+            return 1.0
+        changed = (np.abs(fingerprint - self.last_fingerprint) > self.pixel_tolerance).astype(np.int32)
+        height, width = changed.shape
+        rows = np.arange(0, height, self.tile_size)
+        cols = np.arange(0, width, self.tile_size)
+        counts = np.add.reduceat(np.add.reduceat(changed, rows, axis=0), cols, axis=1)
+        # Edge tiles can be smaller than tile_size
+        tile_heights = np.diff(np.append(rows, height))
+        tile_widths = np.diff(np.append(cols, width))
+        return float((counts / np.outer(tile_heights, tile_widths)).max())
+
+    def has_changed(self, image):
+        """Return True (and remember the frame) if the capture should be OCR'd"""
+        fingerprint = self.fingerprint(image)
+        self.frames_seen += 1
+
+        if self.change_ratio(fingerprint) <= self.threshold:
+            self.frames_skipped += 1
+            return False
+
+        self.last_fingerprint = fingerprint
+        return True
+
+    def reset(self):
+        """Forget the last frame so the next capture is always OCR'd"""
+        self.last_fingerprint = None
+        self.frames_seen = 0
+        self.frames_skipped = 0
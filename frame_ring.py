@@ -0,0 +1,215 @@
+"""
+Shared-memory ring buffer of fixed-size frame slots.
+
+Pickling full-resolution frames through a pipe or multiprocessing.Queue
+costs a serialize, a kernel copy and a deserialize per frame. The ring keeps
+frames in one multiprocessing.shared_memory block instead: the writer copies
+(or captures) a frame straight into a slot, and readers in other processes
+get zero-copy NumPy views of it. Only the frame's sequence number needs to
+travel between processes.
+
+Each slot has a small header [sequence, height, width, channels]. The writer
+clears the sequence while it fills a slot and publishes it last, so a reader
+can tell whether the slot still holds the frame it was told about: a view is
+valid while slot_sequence(seq) == seq. Stale frames (overwritten, or older
+than the newest published frame) can therefore be detected and skipped.
+
+Writes may come from several threads of the creating process (reserving and
+publishing are serialized by a lock); any number of readers.
+"""
+
+import threading
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+_HEADER_FIELDS = 4  # sequence, height, width, channels
+_HEADER_BYTES = 64  # per-slot header area, keeps slot data 64-byte aligned
+_GLOBAL_BYTES = 64  # ring header: [latest published sequence]
+
+
+_attach_lock = threading.Lock()
+
+
+class StaleFrameError(Exception):
+    """The requested frame was overwritten before it could be read"""
+
+
+def _attach_untracked(name):
+    """
+    Attach to an existing shared-memory block without handing it to this
+    process's resource tracker; the creating process owns and unlinks it.
+    Before Python 3.13 every attach registers the block, so an attaching
+    process with a tracker of its own unlinks the block at exit and warns
+    about a leak. Unregistering after attaching is no better: spawned
+    children share the creator's tracker, which then fails on the creator's
+    own unlink.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13
+        pass
+
+    with _attach_lock:
+        register = resource_tracker.register
+
+        def register_except_shared_memory(resource, rtype):
+            if rtype != "shared_memory":
+                register(resource, rtype)
+
+        resource_tracker.register = register_except_shared_memory
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class SharedFrameRing:
+    """Fixed-size frame slots in one shared-memory block"""
+
+    def __init__(self, slots, max_height, max_width, channels=3, name=None):
+        """
+        Create a ring (name=None) or attach to an existing one by name.
+        Attaching processes must pass the same geometry.
+        """
+        self.slots = slots
+        self.max_height = max_height
+        self.max_width = max_width
+        self.channels = channels
+        self.slot_bytes = max_height * max_width * channels
+        self.stride = _HEADER_BYTES + self.slot_bytes
+        size = _GLOBAL_BYTES + self.stride * slots
+
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = _attach_untracked(name)
+
+        buf = self.shm.buf
+        self._latest = np.ndarray((1,), dtype=np.int64, buffer=buf, offset=0)
+        self._headers = [
+            np.ndarray((_HEADER_FIELDS,), dtype=np.int64, buffer=buf, offset=_GLOBAL_BYTES + i * self.stride)
+            for i in range(slots)
+        ]
+        self._data = [
+            np.ndarray((self.slot_bytes,), dtype=np.uint8, buffer=buf,
+                       offset=_GLOBAL_BYTES + i * self.stride + _HEADER_BYTES)
+            for i in range(slots)
+        ]
+        if self.owner:
+            self._latest[0] = -1
+            for header in self._headers:
+                header[:] = (-1, 0, 0, 0)
+        self._next_seq = 0
+        self._write_lock = threading.Lock()
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def spec(self):
+        """Arguments for attaching to this ring from another process"""
+        return {"slots": self.slots, "max_height": self.max_height, "max_width": self.max_width,
+                "channels": self.channels, "name": self.name}
+
+    @classmethod
+    def attach(cls, spec):
+        return cls(**spec)
+
+    # --- writer side ---
+
+    def reserve(self, height, width, channels=None):
+        """
+        Claim the next slot and return (seq, view) to fill in place (e.g. by a
+        capture backend). Nothing is visible to readers until publish(seq).
+        """
+        channels = channels or self.channels
+        if height > self.max_height or width > self.max_width or channels > self.channels:
+            raise ValueError(f"{width}x{height}x{channels} frame does not fit "
+                             f"{self.max_width}x{self.max_height}x{self.channels} slots")
+        with self._write_lock:
+            seq = self._next_seq
+            self._next_seq += 1
+
+        header = self._headers[seq % self.slots]
+        header[0] = -1  # invalidate the old frame before overwriting it
+        header[1:] = (height, width, channels)
+        return seq, self._view(seq % self.slots, height, width, channels)
+
+    def publish(self, seq):
+        """Make a reserved slot visible to readers"""
+        with self._write_lock:
+            self._headers[seq % self.slots][0] = seq
+            if seq > self._latest[0]:
+                self._latest[0] = seq
+
+    def write(self, frame):
+        """Copy a (height, width[, channels]) uint8 frame into the next slot; returns its sequence number"""
+        frame = np.asarray(frame, dtype=np.uint8)
+        height, width = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        seq, view = self.reserve(height, width, channels)
+        np.copyto(view, frame.reshape(view.shape))
+        self.publish(seq)
+        return seq
+
+    # --- reader side ---
+
+    def _view(self, slot, height, width, channels):
+        data = self._data[slot][:height * width * channels]
+        shape = (height, width, channels) if channels > 1 else (height, width)
+        return data.reshape(shape)
+
+    def latest_sequence(self):
+        """Sequence number of the newest published frame (-1 if none)"""
+        return int(self._latest[0])
+
+    def slot_sequence(self, seq):
+        """Sequence number currently held by the slot seq maps to"""
+        return int(self._headers[seq % self.slots][0])
+
+    def is_valid(self, seq):
+        """True while frame seq has not been overwritten"""
+        return self.slot_sequence(seq) == seq
+
+    def is_stale(self, seq):
+        """True if frame seq is overwritten or a newer frame has been published"""
+        return not self.is_valid(seq) or self.latest_sequence() > seq
+
+    def read(self, seq):
+        """
+        Zero-copy view of frame seq. The view aliases the slot: check
+        is_valid(seq) after using it (or copy it) to be sure it was not
+        overwritten meanwhile. Raises StaleFrameError if already overwritten.
+        """
+        slot = seq % self.slots
+        header = self._headers[slot]
+        if int(header[0]) != seq:
+            raise StaleFrameError(f"Frame {seq} is no longer in the ring")
+        height, width, channels = (int(v) for v in header[1:])
+        return self._view(slot, height, width, channels)
+
+    def read_copy(self, seq):
+        """Copy of frame seq, guaranteed not to be torn by a concurrent write"""
+        frame = self.read(seq).copy()
+        if not self.is_valid(seq):
+            raise StaleFrameError(f"Frame {seq} was overwritten while being read")
+        return frame
+
+    def read_latest(self):
+        """(seq, view) of the newest frame, skipping everything older; (-1, None) if empty"""
+        seq = self.latest_sequence()
+        if seq < 0:
+            return -1, None
+        try:
+            return seq, self.read(seq)
+        except StaleFrameError:
+            return -1, None
+
+    def close(self):
+        """Detach; the creating process also frees the shared memory"""
+        self._latest = self._headers = self._data = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
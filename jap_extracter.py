@@ -1,53 +1,137 @@
-import pyautogui
-import cv2
-import numpy as np
+import time
 import pyperclip
-from manga_ocr import MangaOcr
+from bubble_detector import crop_blocks, detect_text_blocks
+from ocr_engine import MANGA_OCR_INSTALLED, get_ocr_engine
+from perf_trace import get_tracer
+from screen_capture import get_capture_backend
+from text_normalizer import normalize_light
 
-manga_ocr = MangaOcr()
+if not MANGA_OCR_INSTALLED:
+    raise ImportError("No module named 'manga_ocr'")
+
+# Shared with every other entry point. The model is not loaded at import
+# time: spawned OCR workers re-import the launcher's __main__ (and with it this
+# module), and must not start an engine of their own. Entry points start it
+# early; otherwise the first OCR call starts it.
+ocr_engine = get_ocr_engine()
 
 def normalize_for_translation(text: str) -> str:
     """
     Fix OCR artifacts WITHOUT changing Japanese meaning or structure.
-    Safe for translators (LLMs, NMT, etc).
+    Uses the light profile of the shared text_normalizer engine.
+    """
+    return normalize_light(text)
+
+def capture_region(region):
+    """
+    Grab a screen region as an in-memory PIL image
+    (MSS when installed, pyautogui otherwise).
+    """
+    return get_capture_backend().grab(region)
+
+def ocr_raw_lines(image, detect_bubbles=False):
+    """
+    MangaOCR stage only: raw text of the whole image, or of each detected
+    text block / speech bubble in reading order (batched in one model call).
+    Falls back to whole-image OCR when no block is found.
+    """
+    ocr_engine.start()
+    if detect_bubbles:
+        blocks = detect_text_blocks(image)
+        if blocks:
+            return ocr_engine.recognize_batch(crop_blocks(image, blocks))
+    return [ocr_engine.recognize(image)]
+
+def normalize_lines(lines):
+    """Normalization stage: clean each OCR line and join the non-empty ones"""
+    lines = [normalize_for_translation(line.strip()) for line in lines]
+    return "\n".join(line for line in lines if line)
+
+def recognize_image(image, detect_bubbles=False):
+    """
+    Run MangaOCR directly on a PIL image (no temp file, no color swap).
+    Repeat captures of the same text box are answered from the engine's cache.
+    Blocks until the shared model has finished loading.
+    With detect_bubbles, only the detected text blocks are OCR'd.
+    """
+    return normalize_lines(ocr_raw_lines(image, detect_bubbles))
+
+def recognize_text_blocks(image):
+    """
+    Detect text blocks / speech bubbles in the image and OCR only those crops
+    in one batched model call. Block texts are joined in reading order, one
+    per line.
     """
+    return recognize_image(image, detect_bubbles=True)
 
-    fixes = {
-        "．．．": "・・・",
-        "...": "・・・",
-        "？！」": "！？",
-        "？」": "！？",
-        "?!": "！？",
-        "!?": "！？",
-        "»": "",
-        "«": "",
-    }
+def ocr_region(region, image=None, detect_bubbles=False, timings=None):
+    """
+    The OCR pipeline shared by the launcher and the replay harness:
+    capture (unless an image of the region is given) -> OCR -> normalize.
+    Stage durations in seconds go to the shared tracer and to the optional
+    timings dict.
+    """
+    measured = {}
 
-    for bad, good in fixes.items():
-        text = text.replace(bad, good)
+    start = time.perf_counter()
+    if image is None:
+        image = capture_region(region)
+        measured['capture'] = time.perf_counter() - start
+        start = time.perf_counter()
 
-    # Remove accidental spaces inside JP sentences
-    text = text.replace("  ", " ").strip()
+    lines = ocr_raw_lines(image, detect_bubbles)
+    measured['ocr'] = time.perf_counter() - start
 
+    start = time.perf_counter()
+    text = normalize_lines(lines)
+    measured['normalize'] = time.perf_counter() - start
+
+    tracer = get_tracer()
+    for stage, seconds in measured.items():
+        tracer.record(stage, seconds)
+    if timings is not None:
+        timings.update(measured)
     return text
 
-def extract_japanese_text(region):
+def extract_japanese_text_multi(regions):
     """
-    MangaOCR-based extraction, meaning-preserving.
+    OCR several regions from a single screenshot with one batched model call.
+    Returns a list of (region, text) in the order the regions were given.
     """
+    if not regions:
+        return []
+
+    left = min(r[0] for r in regions)
+    top = min(r[1] for r in regions)
+    right = max(r[0] + r[2] for r in regions)
+    bottom = max(r[1] + r[3] for r in regions)
+    screenshot = capture_region((left, top, right - left, bottom - top))
+
+    crops = [
+        screenshot.crop((x - left, y - top, x - left + w, y - top + h))
+        for x, y, w, h in regions
+    ]
+
+    try:
+        ocr_engine.start()
+        texts = ocr_engine.recognize_batch(crops)
+        return [(region, normalize_for_translation(text.strip()))
+                for region, text in zip(regions, texts)]
+
+    except Exception as e:
+        print(f"❌ MangaOCR failed: {e}")
+        return [(region, "") for region in regions]
 
-    screenshot = pyautogui.screenshot(region=region)
-    img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
+def extract_japanese_text(region, detect_bubbles=False):
+    """
+    MangaOCR-based extraction, meaning-preserving.
+    """
 
-    # Save temp image (MangaOCR requires path or PIL)
-    temp_path = "_ocr_tmp.png"
-    cv2.imwrite(temp_path, img)
+    with get_tracer().span("capture"):
+        screenshot = capture_region(region)
 
     try:
-        text = manga_ocr(temp_path)
-        text = text.strip()
-        text = normalize_for_translation(text)
-        return text
+        return ocr_region(region, screenshot, detect_bubbles)
 
     except Exception as e:
         print(f"❌ MangaOCR failed: {e}")
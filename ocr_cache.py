@@ -0,0 +1,308 @@
+"""
+OCR result cache keyed by a perceptual hash of the captured region.
+
+Re-OCR and Auto-OCR keep capturing the same dialogue box. Each capture is
+keyed by its size, a difference hash (dHash) and a digest of its pixels, so
+the stored MangaOCR text is returned for a pixel-identical capture without
+running the model again.
+
+Recaptures are rarely pixel-identical (capture noise, scaling), so captures
+whose dHash is within max_distance bits of a cached one are candidates for a
+near-identical match. The dHash grid is coarse: two short lines in the same
+box ("Yes." / "No.") can have the same dHash, so a candidate is only served
+after it is confirmed against a stored thumbnail of the capture.
+
+Entries are partitioned per game executable (set_game). With a store opened
+(open_store), a game's partition is written to SQLite when the player
+switches away from it and loaded back in the background when they return.
+"""
+
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+import numpy as np
+from PIL import Image
+
+from cache_partitions import NO_GAME, GamePartitions
+
+# Rough per-entry bookkeeping cost (dict slots, tuple, int objects)
+ENTRY_OVERHEAD_BYTES = 200
+
+# Near-hit confirmation: thumbnail width, and the largest per-pixel difference
+# (0-255) still treated as noise. Downscaling averages capture noise away while
+# a changed glyph stays a local difference.
+THUMBNAIL_WIDTH = 512
+MAX_PIXEL_DIFF = 10
+
+
+def perceptual_hash(image, hash_width=64, hash_height=16):
+    """
+    Difference hash of an image as an int with hash_width * hash_height bits.
+
+    The grid is wide by default because dialogue boxes are much wider than tall;
+    a square 8x8 grid would make different lines of text collide.
+    """
+    if isinstance(image, np.ndarray):
+        image = Image.fromarray(image)
+
+    thumb = image.convert('L').resize((hash_width + 1, hash_height), Image.BILINEAR)
+    pixels = np.asarray(thumb, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big')
+
+
+def thumbnail(image, width=THUMBNAIL_WIDTH):
+    """Small grayscale copy of a capture (aspect ratio kept) for near-hit confirmation"""
+    if isinstance(image, np.ndarray):
+        image = Image.fromarray(image)
+    if image.width > width:
+        height = max(1, round(image.height * width / image.width))
+        image = image.convert('L').resize((width, height), Image.BILINEAR)
+    return np.asarray(image.convert('L'), dtype=np.uint8)
+
+
+def thumbnails_match(a, b, max_pixel_diff=MAX_PIXEL_DIFF):
+    """True if two thumbnails differ by no more than noise anywhere"""
+    if a.shape != b.shape:
+        return False
+    return int(np.abs(a.astype(np.int16) - b.astype(np.int16)).max()) <= max_pixel_diff
+
+
+def hamming_distance(a, b):
+    """Number of differing bits between two hashes"""
+    return bin(a ^ b).count('1')
+
+
+class _OcrPartition:
+    """One game's cached captures"""
+
+    def __init__(self):
+        self.entries = OrderedDict()  # key -> (text, entry size, thumbnail or None)
+        self.total_bytes = 0
+
+
+class OcrResultCache:
+    """Bounded LRU of recognized text keyed by (region size, perceptual hash), partitioned per game"""
+
+    def __init__(self, max_entries=256, max_bytes=8 * 1024 * 1024, max_distance=4, db_path=None,
+                 max_games=4):
+        """
+        max_entries: maximum number of cached captures per game
+        max_bytes: approximate memory budget for each game's cached entries
+            (thumbnails included: about 37 KB each for a 1644x232 dialogue box)
+        max_distance: hash bits that may differ for a near-identical match (0 = exact only);
+            near matches are confirmed against a stored thumbnail
+        db_path: SQLite file for per-game persistence (None = memory only, see open_store)
+        max_games: game partitions kept in memory
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_distance = max_distance
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self.conn = None
+        self.partitions = GamePartitions(_OcrPartition, loader=self._load_partition,
+                                         saver=self._save_partition, max_games=max_games)
+        self.partitions.activate(NO_GAME)
+        if db_path:
+            self.open_store(db_path)
+
+    def open_store(self, db_path):
+        """Persist game partitions in a SQLite file from now on"""
+        try:
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(db_path, check_same_thread=False)
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(ocr_results)")]
+            if columns and "digest" not in columns:
+                # Entries keyed by dHash alone can hold another line's text; start over
+                conn.execute("DROP TABLE ocr_results")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS ocr_results ("
+                "game TEXT, width INTEGER, height INTEGER, hash TEXT, digest TEXT, text TEXT, "
+                "PRIMARY KEY (game, width, height, digest))"
+            )
+            conn.commit()
+        except sqlite3.Error as e:
+            print(f"OCR cache disabled on disk: {e}")
+            return
+        with self.lock:
+            self.conn = conn
+        atexit.register(self.close)
+
+    def _load_partition(self, game, partition):
+        """Fill a game's partition from the store (background thread)"""
+        with self.lock:
+            if self.conn is None:
+                return
+            rows = self.conn.execute(
+                "SELECT width, height, hash, digest, text FROM ocr_results WHERE game = ? ORDER BY rowid",
+                (game,)
+            ).fetchall()
+            # Stored oldest first; captures made since the switch stay the most recent
+            recent = list(partition.entries.items())
+            partition.entries.clear()
+            partition.total_bytes = 0
+            # Thumbnails are not stored: reloaded entries only serve exact matches
+            for width, height, image_hash, digest, text in rows:
+                key = ((width, height), int(image_hash, 16), digest)
+                self._insert(partition, key, text)
+            for key, (text, _, thumb) in recent:
+                self._insert(partition, key, text, thumb)
+
+    def _save_partition(self, game, partition):
+        """Replace a game's stored entries with its partition (background thread)"""
+        with self.lock:
+            if self.conn is None:
+                return
+            rows = [(game, size[0], size[1], format(image_hash, 'x'), digest, text)
+                    for (size, image_hash, digest), (text, _, _) in partition.entries.items()]
+            try:
+                self.conn.execute("DELETE FROM ocr_results WHERE game = ?", (game,))
+                self.conn.executemany("INSERT OR REPLACE INTO ocr_results VALUES (?, ?, ?, ?, ?, ?)", rows)
+                self.conn.commit()
+            except sqlite3.Error as e:
+                print(f"OCR cache write failed: {e}")
+
+    def flush(self):
+        """Write the current game's partition to the store"""
+        self._save_partition(self.partitions.game, self.partitions.active)
+
+    def close(self):
+        """Save the current game's partition and close the store"""
+        self.partitions.wait_idle()
+        self.flush()
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
+
+    def set_game(self, game):
+        """Switch to a game's partition; the previous one is saved and this one loaded in the background"""
+        self.partitions.activate(game or NO_GAME)
+
+    @property
+    def game(self):
+        return self.partitions.game
+
+    def wait_ready(self, timeout=None):
+        """Block until the current game's partition has been loaded"""
+        return self.partitions.wait_ready(timeout)
+
+    @staticmethod
+    def make_key(image):
+        """Cache key for a captured image: (size, dHash, pixel digest)"""
+        if isinstance(image, np.ndarray):
+            size = (image.shape[1], image.shape[0])
+            pixels = np.ascontiguousarray(image).tobytes()
+        else:
+            size = image.size
+            pixels = image.tobytes()
+        digest = hashlib.blake2b(pixels, digest_size=16).hexdigest()
+        return size, perceptual_hash(image), digest
+
+    @staticmethod
+    def _entry_size(key, text, thumb=None):
+        thumb_size = thumb.nbytes if thumb is not None else 0
+        return (len(text.encode('utf-8')) + key[1].bit_length() // 8 + len(key[2])
+                + thumb_size + ENTRY_OVERHEAD_BYTES)
+
+    def lookup(self, key, image=None):
+        """
+        Return cached text for a key, or None. Near-identical matches
+        (max_distance > 0) need the captured image to be confirmed.
+        """
+        with self.lock:
+            entries = self.partitions.active.entries
+            entry = entries.get(key)
+            if entry is not None:
+                entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            if self.max_distance > 0 and image is not None:
+                size, image_hash, _ = key
+                thumb = None
+                for other_key, (text, _, other_thumb) in reversed(entries.items()):
+                    if (other_thumb is None or other_key[0] != size
+                            or hamming_distance(other_key[1], image_hash) > self.max_distance):
+                        continue
+                    if thumb is None:
+                        thumb = thumbnail(image)
+                    if thumbnails_match(thumb, other_thumb):
+                        entries.move_to_end(other_key)
+                        self.hits += 1
+                        self.near_hits += 1
+                        return text
+
+            self.misses += 1
+            return None
+
+    def _insert(self, partition, key, text, thumb=None):
+        """Add an entry to a partition, evicting old entries to fit the budget (lock held)"""
+        entry_size = self._entry_size(key, text, thumb)
+        entries = partition.entries
+        if key in entries:
+            partition.total_bytes -= entries.pop(key)[1]
+        entries[key] = (text, entry_size, thumb)
+        partition.total_bytes += entry_size
+
+        while entries and (len(entries) > self.max_entries or partition.total_bytes > self.max_bytes):
+            _, (_, evicted_size, _) = entries.popitem(last=False)
+            partition.total_bytes -= evicted_size
+
+    def store(self, key, text, image=None):
+        """
+        Remember the recognized text for a key, evicting old entries to fit the
+        budget. The image is kept as a thumbnail for near-hit confirmation.
+        """
+        thumb = thumbnail(image) if self.max_distance > 0 and image is not None else None
+        with self.lock:
+            self._insert(self.partitions.active, key, text, thumb)
+
+    def recognize(self, image, recognizer):
+        """Return recognizer(image), served from the cache when the capture repeats"""
+        key = self.make_key(image)
+        text = self.lookup(key, image)
+        if text is None:
+            text = recognizer(image)
+            self.store(key, text, image)
+        return text
+
+    def clear(self):
+        """Drop all cached results of every game and reset counters"""
+        partitions = self.partitions.items()
+        with self.lock:
+            for _, partition in partitions:
+                partition.entries.clear()
+                partition.total_bytes = 0
+            self.hits = self.near_hits = self.misses = 0
+            if self.conn is not None:
+                try:
+                    self.conn.execute("DELETE FROM ocr_results")
+                    self.conn.commit()
+                except sqlite3.Error as e:
+                    print(f"OCR cache clear failed: {e}")
+
+    def stats(self):
+        """Hit/miss counters and memory use for tuning"""
+        with self.lock:
+            partition = self.partitions.active
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "near_hits": self.near_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "game": self.partitions.game,
+                "loaded_games": len(self.partitions),
+                "entries": len(partition.entries),
+                "bytes": partition.total_bytes,
+            }
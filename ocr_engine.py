@@ -0,0 +1,304 @@
+"""
+Shared, lazily loaded MangaOCR model and the OCR engine built on it.
+
+Importing manga_ocr pulls in torch and transformers and building MangaOcr()
+loads the model weights, which together take several seconds. The holder in
+this module does both on a background thread, once per process, so windows can
+appear immediately. Callers that need the model block in get() until it is
+ready, which naturally queues OCR requests made while the model is loading.
+
+Setting OCR_WORKER_PROCESSES=N runs the model in N worker processes
+(ocr_worker_pool) instead, keeping inference off the Tk process's GIL.
+"""
+
+import importlib.util
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+from ocr_cache import OcrResultCache
+
+MANGA_OCR_INSTALLED = importlib.util.find_spec("manga_ocr") is not None
+
+
+def _create_manga_ocr():
+    """Import manga_ocr and build the model (slow)"""
+    from manga_ocr import MangaOcr
+    return MangaOcr()
+
+
+def _create_worker_pool(workers):
+    """Start MangaOCR worker processes (slow: every worker loads the model)"""
+    from ocr_worker_pool import OcrWorkerPool
+    return OcrWorkerPool(workers)
+
+
+def default_model_factory():
+    """
+    In-process MangaOCR, or a worker pool when OCR_WORKER_PROCESSES is set.
+    Pool workers inherit the variable but never start pools of their own.
+    """
+    try:
+        workers = int(os.environ.get("OCR_WORKER_PROCESSES", "0"))
+    except ValueError:
+        workers = 0
+    if workers > 0 and multiprocessing.parent_process() is None:
+        return lambda: _create_worker_pool(workers)
+    return _create_manga_ocr
+
+
+class OcrModelHolder:
+    """Loads a model once on a background thread and hands it out when ready"""
+
+    def __init__(self, factory=None):
+        self.factory = factory or default_model_factory()
+        self.model = None
+        self.error = None
+        self.loading = False
+        self.ready_event = threading.Event()
+        self.lock = threading.Lock()
+        self.callbacks = []
+
+    def start_loading(self):
+        """Begin loading in the background (no-op if already loading or loaded)"""
+        with self.lock:
+            if self.loading or self.ready_event.is_set():
+                return
+            self.loading = True
+        thread = threading.Thread(target=self._load, daemon=True)
+        thread.start()
+
+    def _load(self):
+        model, error = None, None
+        try:
+            model = self.factory()
+            print("✓ MangaOCR initialized successfully")
+        except Exception as e:
+            error = e
+            print(f"❌ Failed to initialize MangaOCR: {e}")
+
+        with self.lock:
+            self.model = model
+            self.error = error
+            self.loading = False
+            callbacks = list(self.callbacks)
+            self.ready_event.set()
+
+        for callback in callbacks:
+            try:
+                callback(error)
+            except Exception as e:
+                print(f"OCR ready callback failed: {e}")
+
+    def reload(self):
+        """Drop the current model and load a fresh one in the background"""
+        with self.lock:
+            if self.loading:
+                return
+            if hasattr(self.model, 'close'):
+                self.model.close()
+            self.model = None
+            self.error = None
+            self.ready_event.clear()
+        self.start_loading()
+
+    def add_ready_callback(self, callback):
+        """
+        Call callback(error) every time a load finishes (error is None on success).
+        Runs immediately if the model has already finished loading.
+        Callbacks run on the loader thread; UI code should marshal with root.after.
+        """
+        with self.lock:
+            self.callbacks.append(callback)
+            finished = self.ready_event.is_set()
+            error = self.error
+        if finished:
+            callback(error)
+
+    def is_ready(self):
+        """True once the model loaded successfully"""
+        return self.ready_event.is_set() and self.model is not None
+
+    def is_loading(self):
+        """True while the model is being loaded"""
+        return not self.ready_event.is_set()
+
+    def has_failed(self):
+        """True if the last load attempt failed"""
+        return self.ready_event.is_set() and self.error is not None
+
+    def wait_ready(self, timeout=None):
+        """Block until loading finishes; returns True if the model is usable"""
+        self.start_loading()
+        self.ready_event.wait(timeout)
+        return self.is_ready()
+
+    def get(self, timeout=None):
+        """Return the model, waiting for it to load; raises RuntimeError if unavailable"""
+        if not self.wait_ready(timeout):
+            if self.error is not None:
+                raise RuntimeError(f"MangaOCR failed to initialize: {self.error}")
+            raise RuntimeError("MangaOCR is still loading")
+        return self.model
+
+
+_model_holder = None
+_model_holder_lock = threading.Lock()
+
+
+def get_model_holder():
+    """Return the process-wide MangaOCR holder"""
+    global _model_holder
+    with _model_holder_lock:
+        if _model_holder is None:
+            _model_holder = OcrModelHolder()
+        return _model_holder
+
+
+class OcrEngine:
+    """
+    Process-wide OCR service shared by every entry point.
+
+    Wraps the shared model holder with the OCR result cache and serializes
+    inference, so the launcher, the translator window and jap_extracter all use
+    a single copy of the MangaOCR weights.
+    """
+
+    def __init__(self, holder=None, cache=None):
+        self.holder = holder or get_model_holder()
+        self.cache = cache or OcrResultCache()
+        self.inference_lock = threading.Lock()
+        self.stats_lock = threading.Lock()
+        self.inference_count = 0
+        self.inference_time = 0.0
+
+    def start(self):
+        """Begin loading the model in the background"""
+        self.holder.start_loading()
+
+    def reload(self):
+        """Load a fresh copy of the model in the background"""
+        self.holder.reload()
+
+    def add_ready_callback(self, callback):
+        """See OcrModelHolder.add_ready_callback"""
+        self.holder.add_ready_callback(callback)
+
+    def is_ready(self):
+        return self.holder.is_ready()
+
+    def is_loading(self):
+        return self.holder.is_loading()
+
+    def has_failed(self):
+        return self.holder.has_failed()
+
+    def wait_ready(self, timeout=None):
+        return self.holder.wait_ready(timeout)
+
+    def _lock_for(self, model):
+        """In-process models run one inference at a time; worker pools run in parallel"""
+        return nullcontext() if getattr(model, 'thread_safe', False) else self.inference_lock
+
+    def _count(self, images, seconds):
+        with self.stats_lock:
+            self.inference_time += seconds
+            self.inference_count += images
+
+    def _infer(self, image):
+        """Run the model on one image"""
+        model = self.holder.get()
+        with self._lock_for(model):
+            start = time.perf_counter()
+            text = model(image)
+            self._count(1, time.perf_counter() - start)
+        return text
+
+    def _infer_batch(self, images):
+        """
+        Run the model on several images in one batched generate() call.
+
+        Uses MangaOcr's preprocessing and decoding internals; falls back to
+        sequential calls if the installed manga-ocr does not expose them.
+        """
+        model = self.holder.get()
+        if hasattr(model, 'recognize_many'):
+            start = time.perf_counter()
+            texts = model.recognize_many(images)
+            self._count(len(images), time.perf_counter() - start)
+            return texts
+        if len(images) == 1 or not all(hasattr(model, attr) for attr in ('_preprocess', 'model', 'tokenizer')):
+            return [self._infer(image) for image in images]
+
+        import torch
+        from manga_ocr.ocr import post_process
+
+        with self.inference_lock:
+            start = time.perf_counter()
+            pixel_values = torch.stack([
+                model._preprocess(image.convert('L').convert('RGB')) for image in images
+            ])
+            outputs = model.model.generate(pixel_values.to(model.model.device), max_length=300).cpu()
+            texts = [post_process(model.tokenizer.decode(output, skip_special_tokens=True))
+                     for output in outputs]
+            self._count(len(images), time.perf_counter() - start)
+        return texts
+
+    def recognize(self, image):
+        """Return the raw MangaOCR text for a PIL image, using the result cache"""
+        return self.cache.recognize(image, self._infer)
+
+    def recognize_batch(self, images):
+        """
+        Return the raw MangaOCR text for each image, in order.
+        Cached images are answered immediately; the rest go through one batched inference.
+        """
+        keys = [self.cache.make_key(image) for image in images]
+        texts = [self.cache.lookup(key, image) for key, image in zip(keys, images)]
+        pending = [i for i, text in enumerate(texts) if text is None]
+
+        if pending:
+            recognized = self._infer_batch([images[i] for i in pending])
+            for i, text in zip(pending, recognized):
+                self.cache.store(keys[i], text, images[i])
+                texts[i] = text
+        return texts
+
+    @staticmethod
+    def memory_usage():
+        """Resident memory of this process in bytes (None if psutil is missing)"""
+        if psutil is None:
+            return None
+        try:
+            return psutil.Process().memory_info().rss
+        except Exception:
+            return None
+
+    def stats(self):
+        """Inference counters and process memory for display"""
+        return {
+            "inferences": self.inference_count,
+            "avg_inference_ms": (self.inference_time / self.inference_count * 1000
+                                 if self.inference_count else 0.0),
+            "rss_bytes": self.memory_usage(),
+        }
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_ocr_engine():
+    """Return the process-wide OCR engine"""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = OcrEngine()
+        return _engine
@@ -14,18 +14,9 @@ from tkinter import ttk, messagebox, filedialog
 import pyautogui
 import cv2
 import numpy as np
-import json
-import os
 import threading
 import time
 import psutil
-try:
-    import win32gui
-    import win32process
-    WIN32_AVAILABLE = True
-except ImportError:
-    WIN32_AVAILABLE = False
-    print("Warning: pywin32 not available. Game detection will be limited.")
 from PIL import Image, ImageTk
 try:
     import keyboard  # For global hotkeys
@@ -33,22 +24,43 @@ try:
 except ImportError:
     KEYBOARD_AVAILABLE = False
     print("Warning: keyboard module not available. Hotkeys will not work.")
-from datetime import datetime
-import re
 
 # Import our existing modules
 try:
-    from jap_extracter import extract_japanese_text, normalize_for_translation
+    from jap_extracter import (extract_japanese_text, normalize_for_translation,
+                               capture_region, recognize_image, extract_japanese_text_multi,
+                               ocr_region)
     OCR_AVAILABLE = True
 except ImportError as e:
     print(f"Warning: OCR module not available: {e}")
     OCR_AVAILABLE = False
     
-    def extract_japanese_text(region):
+    def extract_japanese_text(region, detect_bubbles=False):
         return "OCR not available - please install manga-ocr"
     
     def normalize_for_translation(text):
         return text
+    
+    def capture_region(region):
+        return get_capture_backend().grab(region)
+    
+    def recognize_image(image, detect_bubbles=False):
+        return "OCR not available - please install manga-ocr"
+    
+    def extract_japanese_text_multi(regions):
+        return [(region, "OCR not available - please install manga-ocr") for region in regions]
+    
+    def ocr_region(region, image=None, detect_bubbles=False, timings=None):
+        return "OCR not available - please install manga-ocr"
+
+from auto_ocr_scheduler import AdaptiveOcrScheduler
+from frame_diff import FrameChangeDetector
+from ocr_engine import get_ocr_engine
+from perf_trace import get_tracer
+from region_store import RegionStore
+from screen_capture import get_capture_backend
+from text_chunker import DEFAULT_MAX_TOKENS, iter_chunks
+from window_tracker import get_window_tracker
 
 try:
     from translator_app import ScreenTranslatorApp
@@ -62,76 +74,38 @@ except ImportError as e:
 class GameRegionManager:
     """Manages OCR regions for different games/executables"""
     
-    def __init__(self, config_file="region_config.json"):
+    def __init__(self, config_file="region_config.json", window_tracker=None):
         self.config_file = config_file
-        self.regions = self.load_regions()
-        
-    def load_regions(self):
-        """Load saved regions from config file"""
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading regions: {e}")
-                return {}
-        return {}
+        # Deduplicated, capped history per game, written to disk in the background
+        self.store = RegionStore(config_file)
+        # One cached foreground-window snapshot shared with the launcher
+        self.window_tracker = window_tracker or get_window_tracker()
     
     def save_regions(self):
-        """Save regions to config file"""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.regions, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving regions: {e}")
+        """Write regions to the config file now (normally done in the background)"""
+        self.store.flush()
     
     def get_active_window_info(self):
-        """Get the executable name of the currently active window"""
-        if not WIN32_AVAILABLE:
-            return "unknown", "Unknown Window (pywin32 not available)"
-            
-        try:
-            hwnd = win32gui.GetForegroundWindow()
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            process = psutil.Process(pid)
-            exe_name = process.name().lower()
-            window_title = win32gui.GetWindowText(hwnd)
-            return exe_name, window_title
-        except Exception as e:
-            print(f"Error getting active window: {e}")
-            return "unknown", "Unknown Window"
+        """Get the executable name and title of the currently active window"""
+        snapshot = self.window_tracker.current()
+        return snapshot.exe_name, snapshot.title
     
     def save_region_for_game(self, region):
         """Save region for the currently active game"""
         exe_name, window_title = self.get_active_window_info()
-        if exe_name not in self.regions:
-            self.regions[exe_name] = []
-        
-        # Store region with timestamp and window info
-        region_data = {
-            "region": region,
-            "timestamp": datetime.now().isoformat(),
-            "window_title": window_title,
-            "last_used": datetime.now().isoformat()
-        }
-        
-        self.regions[exe_name].append(region_data)
-        self.save_regions()
+        self.store.save_region(exe_name, region, window_title)
         return exe_name
     
     def get_regions_for_current_game(self):
-        """Get saved regions for the currently active game"""
+        """Get saved regions for the currently active game, most recent first"""
         exe_name, _ = self.get_active_window_info()
-        return self.regions.get(exe_name, [])
-    
-    def get_last_region_for_game(self):
-        """Get the most recently used region for current game"""
-        regions = self.get_regions_for_current_game()
-        if regions:
-            # Sort by last_used timestamp
-            regions.sort(key=lambda x: x.get('last_used', ''), reverse=True)
-            return regions[0]['region']
-        return None
+        return self.store.regions_for(exe_name)
+    
+    def get_last_region_for_game(self, exe_name=None):
+        """Get the most recently used region for a game (default: the active one)"""
+        if exe_name is None:
+            exe_name, _ = self.get_active_window_info()
+        return self.store.last_region(exe_name)
 
 
 class RegionSelector:
@@ -279,6 +253,23 @@ class OCRLauncherApp:
         self.translator_app = None
         self.ocr_running = False
         
+        # OCR engine shared with the embedded translator window (one model in memory);
+        # the model loads in the background while the window comes up
+        self.ocr_engine = get_ocr_engine()
+        self.ocr_engine.start()
+        
+        # OCR and translation caches follow the game that owns the OCR region (the
+        # foreground game until a region is chosen); its partition is loaded in the
+        # background and idle games are evicted
+        self.ocr_engine.cache.open_store("ocr_cache.sqlite3")
+        self.cache_game = None
+        self.last_window = None
+        self.own_exe = psutil.Process().name().lower()
+        
+        # Auto-OCR skips frames that did not change since the last OCR pass
+        self.change_detector = FrameChangeDetector()
+        self.auto_ocr_scheduler = AdaptiveOcrScheduler()
+        
         # Setup UI
         self.setup_ui()
         
@@ -311,6 +302,15 @@ class OCRLauncherApp:
         )
         game_label.pack(pady=(0, 10))
         
+        # Shared OCR engine status
+        self.engine_info_var = tk.StringVar(value="OCR Engine: loading...")
+        engine_label = ttk.Label(
+            main_frame,
+            textvariable=self.engine_info_var,
+            font=("Arial", 9)
+        )
+        engine_label.pack(pady=(0, 10))
+        
         # Buttons frame
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(pady=10)
@@ -334,6 +334,15 @@ class OCRLauncherApp:
         )
         self.reocr_btn.pack(pady=5)
         
+        # OCR every saved region of the current game in one pass
+        self.multi_btn = ttk.Button(
+            button_frame,
+            text="📚 OCR All Game Regions",
+            command=self.ocr_all_game_regions,
+            width=30
+        )
+        self.multi_btn.pack(pady=5)
+        
         # Toggle auto-OCR button
         self.auto_btn = ttk.Button(
             button_frame,
@@ -343,6 +352,50 @@ class OCRLauncherApp:
         )
         self.auto_btn.pack(pady=5)
         
+        # Auto-OCR change sensitivity
+        sensitivity_frame = ttk.Frame(button_frame)
+        sensitivity_frame.pack(pady=5)
+        ttk.Label(sensitivity_frame, text="Auto-OCR change threshold (%):").pack(side=tk.LEFT)
+        self.change_threshold_var = tk.DoubleVar(value=self.change_detector.threshold * 100)
+        threshold_spinbox = ttk.Spinbox(
+            sensitivity_frame,
+            from_=0.0,
+            to=20.0,
+            increment=0.1,
+            width=6,
+            textvariable=self.change_threshold_var,
+            command=self.update_change_threshold
+        )
+        threshold_spinbox.pack(side=tk.LEFT, padx=(5, 0))
+        threshold_spinbox.bind("<Return>", lambda e: self.update_change_threshold())
+        threshold_spinbox.bind("<FocusOut>", lambda e: self.update_change_threshold())
+        
+        # Auto-OCR CPU budget
+        budget_frame = ttk.Frame(button_frame)
+        budget_frame.pack(pady=5)
+        ttk.Label(budget_frame, text="Auto-OCR CPU budget (% of one core):").pack(side=tk.LEFT)
+        self.cpu_budget_var = tk.IntVar(value=int(self.auto_ocr_scheduler.cpu_budget * 100))
+        budget_spinbox = ttk.Spinbox(
+            budget_frame,
+            from_=5,
+            to=100,
+            increment=5,
+            width=6,
+            textvariable=self.cpu_budget_var,
+            command=self.update_cpu_budget
+        )
+        budget_spinbox.pack(side=tk.LEFT, padx=(5, 0))
+        budget_spinbox.bind("<Return>", lambda e: self.update_cpu_budget())
+        budget_spinbox.bind("<FocusOut>", lambda e: self.update_cpu_budget())
+        
+        # Manga pages: OCR each detected text bubble instead of the whole region
+        self.bubble_detection_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(
+            button_frame,
+            text="Detect text bubbles (manga pages)",
+            variable=self.bubble_detection_var
+        ).pack(pady=5)
+        
         # Separator
         separator = ttk.Separator(main_frame, orient='horizontal')
         separator.pack(fill=tk.X, pady=20)
@@ -403,6 +456,8 @@ class OCRLauncherApp:
                 translator_root = tk.Tk()
                 translator_root.withdraw()  # Hide initially
                 self.translator_app = ScreenTranslatorApp(translator_root)
+                if self.cache_game:
+                    self.translator_app.translation_cache.set_game(self.cache_game)
                 translator_root.mainloop()
             except Exception as e:
                 print(f"Error starting translator app: {e}")
@@ -413,10 +468,44 @@ class OCRLauncherApp:
     
     def update_game_info(self):
         """Update the current game information"""
-        exe_name, window_title = self.region_manager.get_active_window_info()
-        self.game_info_var.set(f"Current Game: {exe_name} - {window_title[:30]}...")
+        # Cheap: the tracker only re-queries the OS when the foreground window changed
+        window = (exe_name, window_title) = self.region_manager.get_active_window_info()
+        if window != self.last_window:
+            self.last_window = window
+            self.game_info_var.set(f"Current Game: {exe_name} - {window_title[:30]}...")
+            # Once a region is chosen, OCR keeps reading that game's screen even
+            # while another window (browser, chat) is in front
+            if self.last_exe is None:
+                self.switch_game_caches(exe_name)
+        self.update_engine_info()
         self.root.after(1000, self.update_game_info)  # Update every second
     
+    def switch_game_caches(self, exe_name):
+        """Point the OCR and translation caches at a game's partition"""
+        # The launcher, the translator window and other windows without a saved
+        # region (idle process, desktop, ...) are never games
+        if exe_name in ("unknown", self.own_exe) or exe_name == self.cache_game:
+            return
+        if self.region_manager.get_last_region_for_game(exe_name) is None:
+            return
+        self.cache_game = exe_name
+        self.ocr_engine.cache.set_game(exe_name)
+        if self.translator_app:
+            self.translator_app.translation_cache.set_game(exe_name)
+        print(f"Caches switched to {exe_name}")
+    
+    def update_engine_info(self):
+        """Show the shared OCR engine state and process memory"""
+        if self.ocr_engine.is_ready():
+            state = "ready"
+        elif self.ocr_engine.has_failed():
+            state = "failed to load"
+        else:
+            state = "loading..."
+        rss = self.ocr_engine.memory_usage()
+        memory = f"{rss / (1024 * 1024):.0f} MB" if rss is not None else "unknown"
+        self.engine_info_var.set(f"OCR Engine: {state} | Memory: {memory}")
+    
     def select_region(self):
         """Select a new OCR region"""
         self.status_var.set("Selecting region...")
@@ -431,6 +520,7 @@ class OCRLauncherApp:
             exe_name = self.region_manager.save_region_for_game(region)
             self.last_region = region
             self.last_exe = exe_name
+            self.switch_game_caches(exe_name)
             
             # Enable Re-OCR button
             self.reocr_btn.config(state=tk.NORMAL)
@@ -447,15 +537,58 @@ class OCRLauncherApp:
         """Re-OCR the last selected region"""
         if not self.last_region:
             # Try to get last region for current game
-            region = self.region_manager.get_last_region_for_game()
+            exe_name, _ = self.region_manager.get_active_window_info()
+            region = self.region_manager.get_last_region_for_game(exe_name)
             if region:
                 self.last_region = region
+                self.last_exe = exe_name
+                self.switch_game_caches(exe_name)
             else:
                 self.status_var.set("No region selected yet")
                 return
         
         self.status_var.set("Re-OCR in progress...")
         self.perform_ocr(self.last_region)
+        
+        # The user saw new text: let Auto-OCR drop back to fast polling
+        if self.ocr_running:
+            self.auto_ocr_scheduler.poke()
+    
+    def ocr_all_game_regions(self):
+        """OCR every saved region for the current game with one screenshot and one batched model call"""
+        regions = []
+        for region_data in self.region_manager.get_regions_for_current_game():
+            region = tuple(region_data['region'])
+            if region not in regions:
+                regions.append(region)
+        
+        if not regions:
+            self.status_var.set("No saved regions for the current game")
+            return
+        
+        self.status_var.set(f"OCR of {len(regions)} regions in progress...")
+        thread = threading.Thread(target=self.perform_multi_region_ocr, args=(regions,), daemon=True)
+        thread.start()
+    
+    def perform_multi_region_ocr(self, regions):
+        """OCR several regions in a batch and send the combined text to the translator"""
+        try:
+            start = time.perf_counter()
+            results = extract_japanese_text_multi(regions)
+            elapsed = time.perf_counter() - start
+            
+            texts = [text for _, text in results if text and text.strip()]
+            if texts:
+                self.send_to_translator("\n".join(texts), source="all_regions")
+                self.status_var.set(
+                    f"OCR successful: {len(texts)}/{len(regions)} regions with text ({elapsed:.2f}s)"
+                )
+            else:
+                self.status_var.set("No text detected in any region")
+                
+        except Exception as e:
+            self.status_var.set(f"OCR Error: {str(e)}")
+            print(f"OCR Error: {e}")
     
     def toggle_auto_ocr(self):
         """Toggle continuous OCR mode"""
@@ -470,28 +603,74 @@ class OCRLauncherApp:
             self.status_var.set("Auto-OCR started")
             self.start_continuous_ocr()
         else:
+            self.auto_ocr_scheduler.stop()
             self.auto_btn.config(text="⚡ Start Auto-OCR")
             self.status_var.set("Auto-OCR stopped")
     
+    def update_change_threshold(self):
+        """Apply the Auto-OCR change threshold from the UI"""
+        try:
+            percent = float(self.change_threshold_var.get())
+        except (tk.TclError, ValueError):
+            self.change_threshold_var.set(self.change_detector.threshold * 100)
+            return
+        self.change_detector.threshold = max(0.0, percent) / 100
+    
+    def update_cpu_budget(self):
+        """Apply the Auto-OCR CPU budget from the UI"""
+        try:
+            percent = int(self.cpu_budget_var.get())
+        except (tk.TclError, ValueError):
+            self.cpu_budget_var.set(int(self.auto_ocr_scheduler.cpu_budget * 100))
+            return
+        self.auto_ocr_scheduler.cpu_budget = min(100, max(1, percent)) / 100
+    
     def start_continuous_ocr(self):
-        """Start continuous OCR in background"""
-        def continuous_ocr():
-            while self.ocr_running and self.last_region:
-                self.perform_ocr(self.last_region)
-                time.sleep(2)  # OCR every 2 seconds
+        """
+        Start continuous OCR in background.
+        Polls quickly while the region changes and backs off while it is static
+        (see AdaptiveOcrScheduler); passes never overlap.
+        """
+        self.change_detector.reset()
+        scheduler = self.auto_ocr_scheduler
+        
+        def continuous_ocr_pass():
+            if not (self.ocr_running and self.last_region):
+                scheduler.stop()
+                return False
+            try:
+                # Unchanged frames stay in the backend's reusable buffer;
+                # only frames that go to OCR become PIL images
+                tracer = get_tracer()
+                with tracer.span("capture"):
+                    frame = get_capture_backend().grab_array(self.last_region)
+                with tracer.span("change_detect"):
+                    changed = self.change_detector.has_changed(frame)
+                if changed:
+                    self.perform_ocr(self.last_region, Image.fromarray(frame, 'RGB'))
+                    return True
+                self.status_var.set(
+                    f"Auto-OCR: region unchanged "
+                    f"({self.change_detector.frames_skipped}/{self.change_detector.frames_seen} frames skipped, "
+                    f"polling every {scheduler.last_delay:.1f}s, "
+                    f"CPU {scheduler.cpu_usage() * 100:.0f}%)"
+                )
+            except Exception as e:
+                self.status_var.set(f"Capture Error: {str(e)}")
+                print(f"Capture Error: {e}")
+            return False
         
-        thread = threading.Thread(target=continuous_ocr, daemon=True)
-        thread.start()
+        scheduler.start(continuous_ocr_pass)
     
-    def perform_ocr(self, region):
-        """Perform OCR on the specified region"""
+    def perform_ocr(self, region, image=None):
+        """Perform OCR on the specified region (or an already captured image of it)"""
         try:
             # Extract text
-            text = extract_japanese_text(region)
+            text = ocr_region(region, image, self.bubble_detection_var.get())
             
             if text and text.strip():
                 # Send to translator app
-                self.send_to_translator(text)
+                self.send_to_translator(text, source=str(tuple(region)))
                 self.status_var.set(f"OCR successful: {len(text)} characters extracted")
             else:
                 self.status_var.set("No text detected in region")
@@ -500,95 +679,38 @@ class OCRLauncherApp:
             self.status_var.set(f"OCR Error: {str(e)}")
             print(f"OCR Error: {e}")
     
-    def send_to_translator(self, text):
-        """Send extracted text to translator app"""
+    def send_to_translator(self, text, source="default"):
+        """
+        Send extracted text to the translator app's scheduler.
+        Newer text from the same source replaces anything still pending for it.
+        """
         if not self.translator_app:
             self.status_var.set("Translator app not ready")
             return
             
         try:
-            # Chunk long text if needed
-            chunks = self.chunk_text(text)
-            
-            # Send each chunk for translation
-            for i, chunk in enumerate(chunks):
-                if chunk.strip():
-                    # Update translator input (thread-safe)
-                    self.root.after(0, self.update_translator_input, chunk, i, len(chunks))
+            # Queue each chunk as soon as it is cut, so the first one is already
+            # translating while later ones are prepared; later chunks are appended
+            for part, chunk in enumerate(self.chunk_text(text)):
+                self.translator_app.submit_ocr_text(chunk, source=source, part=part)
                     
         except Exception as e:
             self.status_var.set(f"Failed to send to translator: {e}")
     
-    def chunk_text(self, text, max_length=500):
-        """Split long text into manageable chunks"""
-        if len(text) <= max_length:
-            return [text]
-        
-        # Split by sentences first
-        sentences = re.split(r'[。！？.!?]+', text)
-        chunks = []
-        current_chunk = ""
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-                
-            # Add punctuation back if it was a sentence ending
-            if len(current_chunk) > 0 and text[len(current_chunk):len(current_chunk)+1] in '。！？.!?':
-                sentence = text[len(current_chunk):len(current_chunk)+1] + sentence
-            
-            if len(current_chunk) + len(sentence) <= max_length:
-                current_chunk += sentence
-            else:
-                if current_chunk:
-                    chunks.append(current_chunk.strip())
-                current_chunk = sentence
-        
-        if current_chunk:
-            chunks.append(current_chunk.strip())
-        
-        # If still too long, force split
-        final_chunks = []
-        for chunk in chunks:
-            if len(chunk) <= max_length:
-                final_chunks.append(chunk)
-            else:
-                # Split by max_length
-                for i in range(0, len(chunk), max_length):
-                    final_chunks.append(chunk[i:i+max_length])
-        
-        return final_chunks
-    
-    def update_translator_input(self, text, chunk_index, total_chunks):
-        """Update translator app input field (called from main thread)"""
-        if not self.translator_app:
-            return
-            
-        try:
-            # Clear and insert new text
-            self.translator_app.input_text.delete(1.0, tk.END)
-            self.translator_app.input_text.insert(tk.END, text)
-            
-            # Auto-translate
-            self.translator_app.start_translation()
-            
-            # Update status
-            if total_chunks > 1:
-                self.status_var.set(f"Translated chunk {chunk_index + 1}/{total_chunks}")
-            else:
-                self.status_var.set("Translation sent to translator app")
-                
-        except Exception as e:
-            print(f"Error updating translator: {e}")
+    def chunk_text(self, text, max_tokens=DEFAULT_MAX_TOKENS):
+        """
+        Lazily split long text into sentence-aligned chunks that fit the
+        translator model's token budget (punctuation is kept).
+        """
+        return iter_chunks(text, max_tokens)
     
     def refresh_region_list(self):
         """Refresh the list of recent regions"""
         self.region_listbox.delete(0, tk.END)
         
-        for exe_name, regions in self.region_manager.regions.items():
+        for exe_name, regions in self.region_manager.store.all_games():
             self.region_listbox.insert(tk.END, f"--- {exe_name} ---")
-            for region_data in regions[-3:]:  # Show last 3 regions
+            for region_data in regions[:3]:  # Show the 3 most recent regions
                 region = region_data['region']
                 timestamp = region_data.get('timestamp', 'Unknown')
                 title = region_data.get('window_title', 'Unknown')[:30]
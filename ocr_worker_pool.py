@@ -0,0 +1,193 @@
+"""
+Out-of-process MangaOCR workers.
+
+Inference in the Tk process competes with the mainloop for the GIL (PyTorch
+preprocessing, tokenizer decoding), which makes the UI stutter during OCR.
+OcrWorkerPool runs the model in child processes instead:
+
+- every worker loads MangaOCR once at start-up and keeps it
+- frames travel through a shared-memory frame slot per worker (frame_ring);
+  only the frame's sequence number goes over the pipe, and only the
+  recognized text comes back
+- frames are sent as 8-bit grayscale (MangaOCR converts to grayscale first
+  anyway), a third of the RGB size. The parent converts straight into the
+  slot and the worker recognizes a zero-copy view of it
+- with several workers, independent frames are recognized in parallel
+
+The pool is a drop-in MangaOcr replacement (callable image -> text), so it
+plugs into OcrModelHolder/OcrEngine and keeps the result cache, ready
+callbacks and stats of the in-process engine.
+"""
+
+import atexit
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from PIL import Image
+
+from frame_ring import SharedFrameRing, StaleFrameError
+
+MAX_FRAME_SIZE = (2160, 3840)  # (height, width) of the largest frame sent through shared memory
+
+
+def _worker_main(conn, ring_spec, torch_threads, model_factory):
+    """Child process: load the model once, then answer frame requests until told to stop"""
+    try:
+        if model_factory is None:
+            import torch
+            torch.set_num_threads(torch_threads)
+            from ocr_engine import _create_manga_ocr
+            model_factory = _create_manga_ocr
+        model = model_factory()
+        ring = SharedFrameRing.attach(ring_spec)
+        conn.send(("ready", None))
+    except Exception as e:
+        conn.send(("ready", str(e)))
+        return
+
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        command = message[0]
+
+        if command == "stop":
+            break
+
+        try:
+            if command == "frame":
+                seq = message[1]
+                # Zero-copy: the image maps the slot. The parent only rewrites it after
+                # this reply, but check the slot's sequence number again after inference
+                # (seqlock-style) so text is never read from a frame replaced meanwhile
+                text = model(Image.fromarray(ring.read(seq), 'L'))
+                if not ring.is_valid(seq):
+                    raise StaleFrameError(f"Frame {seq} was overwritten during inference")
+            else:  # "pickled": oversized frame sent through the pipe
+                text = model(Image.fromarray(message[1], 'L'))
+            conn.send(("ok", text))
+        except StaleFrameError as e:
+            conn.send(("stale", str(e)))
+        except Exception as e:
+            conn.send(("error", str(e)))
+
+    ring.close()
+
+
+class _Worker:
+    """Parent-side handle: process, pipe and the worker's frame slot"""
+
+    def __init__(self, context, max_frame_size, torch_threads, model_factory):
+        # One slot is enough: a worker has one frame in flight, and the slot is
+        # only rewritten once the worker has answered for the previous one
+        self.ring = SharedFrameRing(1, max_frame_size[0], max_frame_size[1], channels=1)
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child_conn, self.ring.spec(), torch_threads, model_factory),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+
+    def wait_ready(self):
+        _, error = self.conn.recv()
+        if error is not None:
+            raise RuntimeError(f"OCR worker failed to load MangaOCR: {error}")
+
+    def _request(self, message):
+        self.conn.send(message)
+        return self.conn.recv()
+
+    def _write_frame(self, image):
+        """Write image as grayscale straight into the slot; returns its sequence number"""
+        width, height = image.size
+        seq, view = self.ring.reserve(height, width, 1)
+        # A PIL image mapped onto the slot, so the pixels are pasted (and converted)
+        # in place instead of going through an intermediate array
+        slot = Image.frombuffer('L', (width, height), view, 'raw', 'L', 0, 1)
+        slot.readonly = False
+        slot.paste(image if image.mode == 'L' else image.convert('L'))
+        self.ring.publish(seq)
+        return seq
+
+    def recognize(self, image):
+        width, height = image.size
+
+        status, payload = "stale", None
+        if height <= self.ring.max_height and width <= self.ring.max_width:
+            status, payload = self._request(("frame", self._write_frame(image)))
+        if status == "stale":
+            # Oversized, or the slot was overwritten before the worker was done with it
+            status, payload = self._request(("pickled", np.asarray(image.convert('L'))))
+
+        if status != "ok":
+            raise RuntimeError(f"OCR worker error: {payload}")
+        return payload
+
+    def close(self):
+        try:
+            self.conn.send(("stop",))
+        except Exception:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.conn.close()
+        self.ring.close()
+
+
+class OcrWorkerPool:
+    """Callable MangaOCR replacement backed by worker processes"""
+
+    # OcrEngine may call this from several threads at once
+    thread_safe = True
+
+    def __init__(self, workers=1, max_frame_size=MAX_FRAME_SIZE, model_factory=None):
+        """
+        Start the workers and block until every one has loaded the model.
+        model_factory: picklable callable building the model in each worker
+        (default: MangaOCR)
+        """
+        context = multiprocessing.get_context("spawn")
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+        self.workers = [_Worker(context, max_frame_size, torch_threads, model_factory)
+                        for _ in range(workers)]
+        self.idle = queue.Queue()
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.closed = False
+        self.lock = threading.Lock()
+
+        try:
+            for worker in self.workers:
+                worker.wait_ready()
+                self.idle.put(worker)
+        except Exception:
+            self.close()
+            raise
+        atexit.register(self.close)
+
+    def __call__(self, image):
+        """Recognize one PIL image on the next free worker"""
+        worker = self.idle.get()
+        try:
+            return worker.recognize(image)
+        finally:
+            self.idle.put(worker)
+
+    def recognize_many(self, images):
+        """Recognize several images, spread across the workers"""
+        return list(self.executor.map(self, images))
+
+    def close(self):
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+        self.executor.shutdown(wait=False)
+        for worker in self.workers:
+            worker.close()
@@ -0,0 +1,136 @@
+"""
+Lightweight per-stage tracing for the OCR -> translation pipeline.
+
+Each stage ("capture", "ocr", "normalize", "translate", "ui_update", ...)
+keeps its most recent durations in a fixed-size ring buffer, so tracing
+costs a perf_counter pair and a deque append per call and memory stays
+bounded however long the app runs. Summaries (mean and p50/p95/p99) are
+computed on demand, and the raw samples can be exported as JSON or CSV for
+offline analysis.
+"""
+
+import csv
+import functools
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(fraction * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class PerfTracer:
+    """Thread-safe per-stage duration ring buffers"""
+
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.enabled = True
+        self.lock = threading.Lock()
+        self.samples = {}   # stage -> deque of (wall clock timestamp, seconds)
+        self.counts = {}    # stage -> samples recorded since reset (not capped)
+
+    def record(self, stage, seconds):
+        """Add one duration for stage"""
+        if not self.enabled:
+            return
+        with self.lock:
+            ring = self.samples.get(stage)
+            if ring is None:
+                ring = self.samples[stage] = deque(maxlen=self.capacity)
+            ring.append((time.time(), seconds))
+            self.counts[stage] = self.counts.get(stage, 0) + 1
+
+    @contextmanager
+    def span(self, stage):
+        """Time the body of a with-block as one sample of stage"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def summary(self):
+        """{stage: {count, window, mean_ms, p50_ms, p95_ms, p99_ms, max_ms, last_ms}}"""
+        with self.lock:
+            snapshot = {stage: list(ring) for stage, ring in self.samples.items()}
+            counts = dict(self.counts)
+
+        summary = {}
+        for stage, samples in snapshot.items():
+            durations = sorted(seconds for _, seconds in samples)
+            summary[stage] = {
+                "count": counts.get(stage, 0),
+                "window": len(durations),
+                "mean_ms": sum(durations) / len(durations) * 1000,
+                "p50_ms": percentile(durations, 0.50) * 1000,
+                "p95_ms": percentile(durations, 0.95) * 1000,
+                "p99_ms": percentile(durations, 0.99) * 1000,
+                "max_ms": durations[-1] * 1000,
+                "last_ms": samples[-1][1] * 1000,
+            }
+        return summary
+
+    def all_samples(self):
+        """Every buffered sample as (timestamp, stage, seconds), oldest first"""
+        with self.lock:
+            rows = [(timestamp, stage, seconds)
+                    for stage, ring in self.samples.items()
+                    for timestamp, seconds in ring]
+        return sorted(rows)
+
+    def export_json(self, path):
+        """Write the summary and the raw samples to a JSON file"""
+        data = {
+            "exported_at": time.time(),
+            "summary": self.summary(),
+            "samples": [{"timestamp": ts, "stage": stage, "ms": seconds * 1000}
+                        for ts, stage, seconds in self.all_samples()],
+        }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+
+    def export_csv(self, path):
+        """Write the raw samples to a CSV file (timestamp, stage, ms)"""
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(["timestamp", "stage", "ms"])
+            for timestamp, stage, seconds in self.all_samples():
+                writer.writerow([f"{timestamp:.6f}", stage, f"{seconds * 1000:.3f}"])
+
+    def export(self, path):
+        """Export as CSV for *.csv paths, JSON otherwise"""
+        if path.lower().endswith('.csv'):
+            self.export_csv(path)
+        else:
+            self.export_json(path)
+
+    def reset(self):
+        with self.lock:
+            self.samples.clear()
+            self.counts.clear()
+
+
+_shared_tracer = PerfTracer()
+
+
+def get_tracer():
+    """Return the process-wide tracer"""
+    return _shared_tracer
+
+
+def traced(stage):
+    """Decorator recording every call of the function as one sample of stage"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _shared_tracer.span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,160 @@
+"""
+Saved OCR regions per game executable, persisted to region_config.json.
+
+Every region selection used to append to an ever-growing per-game list and
+rewrite the whole file, indented, on the UI thread, with no protection
+against a crash mid-write. RegionStore instead:
+
+- keeps each game's regions in memory in most-recently-used order, with
+  identical rectangles merged into one entry, so the last region is an O(1)
+  lookup and nothing is re-sorted
+- caps the history per game (oldest regions are dropped)
+- writes the file from a background thread, coalescing the changes of one
+  flush_delay window into a single write, through a temporary file and
+  os.replace so the previous file stays intact if the write fails
+
+The file format is unchanged: {exe_name: [region entries]}, now stored most
+recent first. Files from older versions are deduplicated and capped on load.
+"""
+
+import atexit
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+DEFAULT_MAX_REGIONS = 20
+
+
+class RegionStore:
+    """Per-game region history with debounced, atomic write-behind persistence"""
+
+    def __init__(self, config_file="region_config.json", max_regions_per_game=DEFAULT_MAX_REGIONS,
+                 flush_delay=1.0):
+        """
+        max_regions_per_game: regions remembered per game
+        flush_delay: seconds of quiet before pending changes are written
+        """
+        self.config_file = config_file
+        self.max_regions = max_regions_per_game
+        self.flush_delay = flush_delay
+        self.games = {}  # exe name -> OrderedDict(region tuple -> entry), most recent last
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.changed = threading.Event()
+        self.closed = False
+        self.writes = 0
+        self.load()
+
+        self.writer = threading.Thread(target=self._write_loop, daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    def load(self):
+        """Load saved regions from the config file"""
+        if not os.path.exists(self.config_file):
+            return
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except Exception as e:
+            print(f"Error loading regions: {e}")
+            return
+
+        with self.lock:
+            self.games.clear()
+            for exe_name, entries in data.items():
+                # Older files are oldest first and may repeat rectangles; the newest use wins
+                entries = sorted(entries, key=lambda entry: entry.get('last_used', ''))
+                for entry in entries:
+                    self._remember(exe_name, entry)
+
+    def _remember(self, exe_name, entry):
+        """Insert or refresh an entry as the game's most recent region (lock held)"""
+        regions = self.games.setdefault(exe_name, OrderedDict())
+        key = tuple(entry['region'])
+        previous = regions.pop(key, None)
+        if previous is not None:
+            entry['timestamp'] = previous.get('timestamp', entry.get('timestamp'))
+        regions[key] = entry
+        while len(regions) > self.max_regions:
+            regions.popitem(last=False)
+
+    def save_region(self, exe_name, region, window_title=""):
+        """Record a region selection for a game; written to disk shortly after"""
+        now = datetime.now().isoformat()
+        entry = {
+            "region": list(region),
+            "timestamp": now,
+            "window_title": window_title,
+            "last_used": now
+        }
+        with self.lock:
+            self._remember(exe_name, entry)
+        self.changed.set()
+
+    def regions_for(self, exe_name):
+        """A game's saved region entries, most recent first"""
+        with self.lock:
+            return [dict(entry) for entry in reversed(self.games.get(exe_name, {}).values())]
+
+    def last_region(self, exe_name):
+        """The game's most recently used region, or None"""
+        with self.lock:
+            regions = self.games.get(exe_name)
+            if not regions:
+                return None
+            return next(reversed(regions.values()))['region']
+
+    def all_games(self):
+        """(exe name, entries most recent first) for every game"""
+        with self.lock:
+            return [(exe_name, [dict(entry) for entry in reversed(regions.values())])
+                    for exe_name, regions in self.games.items()]
+
+    def _write_loop(self):
+        """Background writer: wait for changes, let them settle, write once"""
+        while True:
+            self.changed.wait()
+            if self.closed:
+                return
+            # Debounce: keep waiting while selections keep coming
+            while True:
+                self.changed.clear()
+                if self.changed.wait(self.flush_delay) is False or self.closed:
+                    break
+            self.flush()
+
+    def flush(self):
+        """Write the regions to disk now (atomically)"""
+        with self.lock:
+            data = {exe_name: [entry for entry in reversed(regions.values())]
+                    for exe_name, regions in self.games.items()}
+            payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+        with self.write_lock:
+            temp_file = f"{self.config_file}.tmp"
+            try:
+                directory = os.path.dirname(self.config_file)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(temp_file, 'w', encoding='utf-8') as f:
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(temp_file, self.config_file)
+                self.writes += 1
+            except Exception as e:
+                print(f"Error saving regions: {e}")
+
+    def close(self):
+        """Write pending changes and stop the writer thread"""
+        if self.closed:
+            return
+        pending = self.changed.is_set()
+        self.closed = True
+        self.changed.set()
+        self.writer.join(timeout=5)
+        if pending or self.writer.is_alive():
+            self.flush()
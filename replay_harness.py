@@ -0,0 +1,290 @@
+#!/usr/bin/env python
+"""
+Record and replay captured regions for reproducible pipeline benchmarks.
+
+record: grabs a screen region at a fixed rate for a while and saves it as a
+compressed .npz. Consecutive identical frames are stored once, so a static
+dialogue box costs a single frame no matter how long it stays up.
+
+replay: installs a ReplayBackend as the shared capture backend and pushes
+every recorded frame through the same OCR pipeline the launcher uses
+(capture -> change detection -> OCR -> normalize, optionally -> translate),
+then reports per-stage latency and throughput. No display, no game and no
+mouse needed.
+
+Examples:
+    python replay_harness.py record 100 800 1644 232 --seconds 30 --fps 4 -o dialogue.npz
+    python replay_harness.py replay dialogue.npz --translate --json results.json
+    python replay_harness.py info dialogue.npz
+"""
+
+import argparse
+import json
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+from screen_capture import CaptureBackend, get_capture_backend, set_capture_backend
+
+
+class Recording:
+    """A timed sequence of frames of one screen region"""
+
+    def __init__(self, region, frames=None, sequence=None, timestamps=None):
+        self.region = tuple(int(v) for v in region)
+        self.frames = list(frames) if frames is not None else []           # unique frames
+        self.sequence = list(sequence) if sequence is not None else []     # frame index per capture
+        self.timestamps = list(timestamps) if timestamps is not None else []  # seconds since start
+
+    def __len__(self):
+        return len(self.sequence)
+
+    def append(self, frame, timestamp):
+        """Add a capture, storing the pixels only if they differ from the previous capture"""
+        if not self.frames or not np.array_equal(self.frames[-1], frame):
+            self.frames.append(frame.copy())
+        self.sequence.append(len(self.frames) - 1)
+        self.timestamps.append(timestamp)
+
+    def frame(self, index):
+        return self.frames[self.sequence[index]]
+
+    def duration(self):
+        return self.timestamps[-1] if self.timestamps else 0.0
+
+    def save(self, path):
+        np.savez_compressed(
+            path,
+            region=np.array(self.region, dtype=np.int32),
+            frames=np.stack(self.frames),
+            sequence=np.array(self.sequence, dtype=np.int32),
+            timestamps=np.array(self.timestamps, dtype=np.float64),
+        )
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            return cls(data['region'], list(data['frames']), data['sequence'].tolist(), data['timestamps'].tolist())
+
+
+def record_region(region, seconds, fps=4.0, backend=None):
+    """Capture region every 1/fps seconds for the given duration"""
+    backend = backend or get_capture_backend()
+    recording = Recording(region)
+    interval = 1.0 / fps
+    start = time.perf_counter()
+
+    while True:
+        now = time.perf_counter() - start
+        if now > seconds:
+            break
+        recording.append(backend.grab_array(region), now)
+        time.sleep(max(0.0, interval - (time.perf_counter() - start - now)))
+    return recording
+
+
+class ReplayBackend(CaptureBackend):
+    """
+    Capture backend that serves a Recording instead of the screen.
+    Grabs must fall inside the recorded region. By default every grab returns
+    the next frame. With realtime=True captures come at the recorded pace: a
+    grab waits until the next recorded capture is due, and captures a slow
+    caller is late for are skipped, like a live screen would be.
+    """
+
+    name = "replay"
+
+    def __init__(self, recording, realtime=False, loop=False):
+        super().__init__()
+        self.recording = recording
+        self.realtime = realtime
+        self.loop = loop
+        self.position = 0
+        self.started_at = None
+
+    @property
+    def finished(self):
+        return not self.loop and self.position >= len(self.recording)
+
+    def _next_index(self):
+        index = self.position
+        if index >= len(self.recording):
+            if not self.loop:
+                raise EOFError("Replay finished")
+            index = 0
+            self.started_at = None
+
+        if self.realtime:
+            if self.started_at is None:
+                self.started_at = time.perf_counter() - self.recording.timestamps[index]
+            elapsed = time.perf_counter() - self.started_at
+            due = self.recording.timestamps[index]
+            if elapsed < due:
+                # Sleep instead of serving the same capture again and again
+                time.sleep(due - elapsed)
+            else:
+                # Late: jump to the newest capture that is already due
+                latest = int(np.searchsorted(self.recording.timestamps, elapsed, side='right')) - 1
+                index = max(index, latest)
+
+        self.position = index + 1
+        return index
+
+    def _grab_into(self, region, buffer):
+        x, y, width, height = region
+        rx, ry, rwidth, rheight = self.recording.region
+        if x < rx or y < ry or x + width > rx + rwidth or y + height > ry + rheight:
+            raise ValueError(f"Region {tuple(region)} is outside the recorded region {self.recording.region}")
+        frame = self.recording.frame(self._next_index())
+        np.copyto(buffer, frame[y - ry:y - ry + height, x - rx:x - rx + width])
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def replay(recording, detect_bubbles=False, translator=None, all_frames=False, realtime=False, ocr=None):
+    """
+    Run the recording through the launcher's OCR pipeline.
+    ocr: called like jap_extracter.ocr_region(region, image, detect_bubbles, timings)
+        (default: jap_extracter.ocr_region with the shared MangaOCR engine)
+    Returns {"frames", "ocr_passes", "wall_seconds", "stages": {stage: [seconds, ...]}}.
+    """
+    from frame_diff import FrameChangeDetector
+
+    if ocr is None:
+        from jap_extracter import ocr_engine, ocr_region as ocr
+        ocr_engine.start()
+        ocr_engine.wait_ready()
+
+    backend = ReplayBackend(recording, realtime=realtime)
+    previous = set_capture_backend(backend)
+    detector = FrameChangeDetector()
+    stages = {"capture": [], "ocr": [], "normalize": [], "translate": [], "total": []}
+    ocr_passes = 0
+    start = time.perf_counter()
+
+    try:
+        while not backend.finished:
+            timings = {}
+            pass_start = time.perf_counter()
+            try:
+                frame = get_capture_backend().grab_array(recording.region)
+            except EOFError:
+                break
+            timings['capture'] = time.perf_counter() - pass_start
+
+            # Same gate as Auto-OCR: unchanged frames never reach the model
+            if all_frames or detector.has_changed(frame):
+                ocr_passes += 1
+                text = ocr(recording.region, Image.fromarray(frame, 'RGB'), detect_bubbles, timings)
+                if translator is not None and text:
+                    translate_start = time.perf_counter()
+                    translator.translate(text)
+                    timings['translate'] = time.perf_counter() - translate_start
+
+            timings['total'] = time.perf_counter() - pass_start
+            for stage, seconds in timings.items():
+                stages[stage].append(seconds)
+    finally:
+        set_capture_backend(previous)
+
+    return {
+        "frames": len(stages["total"]),
+        "ocr_passes": ocr_passes,
+        "wall_seconds": time.perf_counter() - start,
+        "stages": stages,
+    }
+
+
+def summarize(result):
+    """Per-stage count/mean/p50/p95/max in milliseconds plus throughput"""
+    summary = {
+        "frames": result["frames"],
+        "ocr_passes": result["ocr_passes"],
+        "wall_seconds": round(result["wall_seconds"], 3),
+        "frames_per_second": round(result["frames"] / result["wall_seconds"], 2) if result["wall_seconds"] else 0.0,
+        "stages": {},
+    }
+    for stage, values in result["stages"].items():
+        if not values:
+            continue
+        summary["stages"][stage] = {
+            "count": len(values),
+            "mean_ms": round(sum(values) / len(values) * 1000, 2),
+            "p50_ms": round(percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(percentile(values, 0.95) * 1000, 2),
+            "max_ms": round(max(values) * 1000, 2),
+        }
+    return summary
+
+
+def print_summary(summary):
+    print(f"{summary['frames']} frames, {summary['ocr_passes']} OCR passes in {summary['wall_seconds']:.1f}s "
+          f"({summary['frames_per_second']:.1f} frames/s)\n")
+    print(f"{'Stage':>10} | {'count':>6} | {'mean (ms)':>9} | {'p50 (ms)':>9} | {'p95 (ms)':>9} | {'max (ms)':>9}")
+    print("-" * 67)
+    for stage, stats in summary["stages"].items():
+        print(f"{stage:>10} | {stats['count']:>6} | {stats['mean_ms']:>9.2f} | {stats['p50_ms']:>9.2f} | "
+              f"{stats['p95_ms']:>9.2f} | {stats['max_ms']:>9.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record / replay screen regions for OCR pipeline benchmarks")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_cmd = commands.add_parser("record", help="Record a screen region")
+    record_cmd.add_argument("region", type=int, nargs=4, metavar=("X", "Y", "WIDTH", "HEIGHT"))
+    record_cmd.add_argument("--seconds", type=float, default=10.0, help="Recording length")
+    record_cmd.add_argument("--fps", type=float, default=4.0, help="Captures per second")
+    record_cmd.add_argument("-o", "--output", default="recording.npz", help="Output .npz file")
+
+    replay_cmd = commands.add_parser("replay", help="Benchmark the OCR pipeline on a recording")
+    replay_cmd.add_argument("recording", help="Recording .npz file")
+    replay_cmd.add_argument("--bubbles", action="store_true", help="OCR detected text bubbles only")
+    replay_cmd.add_argument("--translate", action="store_true", help="Also translate through Ollama")
+    replay_cmd.add_argument("--host", help="Ollama host (default: $OLLAMA_HOST or localhost)")
+    replay_cmd.add_argument("--all-frames", action="store_true", help="OCR every frame, not only changed ones")
+    replay_cmd.add_argument("--realtime", action="store_true", help="Replay at the recorded pace")
+    replay_cmd.add_argument("--json", help="Write the summary to this JSON file")
+
+    info_cmd = commands.add_parser("info", help="Describe a recording")
+    info_cmd.add_argument("recording", help="Recording .npz file")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        print(f"Recording {tuple(args.region)} for {args.seconds:.0f}s at {args.fps} fps...")
+        recording = record_region(tuple(args.region), args.seconds, args.fps)
+        recording.save(args.output)
+        print(f"✓ Saved {len(recording)} captures ({len(recording.frames)} unique frames) to {args.output}")
+        return 0
+
+    recording = Recording.load(args.recording)
+
+    if args.command == "info":
+        x, y, width, height = recording.region
+        print(f"Region: {recording.region} ({width}x{height})")
+        print(f"Captures: {len(recording)} over {recording.duration():.1f}s, unique frames: {len(recording.frames)}")
+        return 0
+
+    translator = None
+    if args.translate:
+        from translator_backend import OllamaTranslator
+        translator = OllamaTranslator(host=args.host)
+
+    summary = summarize(replay(recording, args.bubbles, translator, args.all_frames, args.realtime))
+    print_summary(summary)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
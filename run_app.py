@@ -29,9 +29,10 @@ def check_dependencies():
     except ImportError:
         missing_packages.append("opencv-python")
         
-    try:
-        from manga_ocr import MangaOcr
-    except ImportError:
+    # Only check that manga-ocr is installed; importing it pulls in torch and is
+    # left to the background model loader so the window appears immediately
+    from ocr_engine import MANGA_OCR_INSTALLED
+    if not MANGA_OCR_INSTALLED:
         missing_packages.append("manga-ocr")
     
     if missing_packages:
@@ -50,6 +51,10 @@ def main():
     if not check_dependencies():
         sys.exit(1)
     
+    # Start loading the shared OCR model while the rest of the app imports
+    from ocr_engine import get_ocr_engine
+    get_ocr_engine().start()
+    
     # Import and run the main application
     try:
         from translator_app import main as app_main
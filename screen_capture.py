@@ -0,0 +1,185 @@
+"""
+Pluggable screen capture backends.
+
+Every backend grabs a screen region (x, y, width, height) either as a PIL
+image (grab) or as an RGB uint8 NumPy array written into a buffer that is
+reused between calls (grab_array). Backends:
+
+- MssBackend: MSS (XShm/XGetImage on Linux, GDI on Windows, CoreGraphics on
+  macOS) copying straight from the raw BGRA grab into the preallocated buffer
+- PyAutoGuiBackend: the original pyautogui.screenshot path, kept as fallback
+- FileBackend: a fake screen fed from image files or in-memory frames, for
+  tests and benchmarks on machines without a display (or under Xvfb)
+
+get_capture_backend() returns the shared backend (MSS when installed,
+pyautogui otherwise); set_capture_backend() swaps it, e.g. for replays.
+"""
+
+import importlib.util
+import os
+import threading
+
+import numpy as np
+from PIL import Image
+
+MSS_INSTALLED = importlib.util.find_spec("mss") is not None
+
+
+class CaptureBackend:
+    """Base class: subclasses implement _grab_into(region, buffer) or grab(region)"""
+
+    name = "base"
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def buffer_for(self, width, height):
+        """This thread's reusable (height, width, 3) frame buffer"""
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None or buffer.shape[:2] != (height, width):
+            buffer = np.empty((height, width, 3), dtype=np.uint8)
+            self._local.buffer = buffer
+        return buffer
+
+    def grab_array(self, region):
+        """
+        Capture region into this thread's reusable buffer and return it.
+        The array is overwritten by the next grab on the same thread - copy it
+        (or use grab()) to keep a frame.
+        """
+        x, y, width, height = region
+        buffer = self.buffer_for(width, height)
+        self._grab_into(region, buffer)
+        return buffer
+
+    def grab(self, region):
+        """Capture region as a new PIL RGB image"""
+        return Image.fromarray(self.grab_array(region), 'RGB')
+
+    def _grab_into(self, region, buffer):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class MssBackend(CaptureBackend):
+    """Fast native grabber; one mss instance per thread (they are not thread-safe)"""
+
+    name = "mss"
+
+    def _sct(self):
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            import mss
+            sct = mss.mss()
+            self._local.sct = sct
+        return sct
+
+    def _grab_into(self, region, buffer):
+        x, y, width, height = region
+        shot = self._sct().grab({"left": x, "top": y, "width": width, "height": height})
+        bgra = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        # BGRA -> RGB in one strided copy, no intermediate arrays
+        np.copyto(buffer, bgra[:, :, 2::-1])
+
+    def close(self):
+        sct = getattr(self._local, 'sct', None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+
+class PyAutoGuiBackend(CaptureBackend):
+    """Generic pyautogui path (allocates a PIL image per call)"""
+
+    name = "pyautogui"
+
+    def grab(self, region):
+        import pyautogui
+        return pyautogui.screenshot(region=tuple(region)).convert('RGB')
+
+    def _grab_into(self, region, buffer):
+        np.copyto(buffer, np.asarray(self.grab(region)))
+
+
+class FileBackend(CaptureBackend):
+    """
+    Fake screen backed by frames (image paths, a folder of images, PIL images
+    or arrays). The screen origin is the top-left of the frame; every grab
+    advances to the next frame, looping at the end unless loop=False.
+    """
+
+    name = "file"
+
+    def __init__(self, frames, loop=True):
+        super().__init__()
+        if isinstance(frames, str):
+            if os.path.isdir(frames):
+                frames = [os.path.join(frames, name) for name in sorted(os.listdir(frames))
+                          if name.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp', '.webp'))]
+            else:
+                frames = [frames]
+        self.frames = [self._load(frame) for frame in frames]
+        if not self.frames:
+            raise ValueError("FileBackend needs at least one frame")
+        self.loop = loop
+        self.index = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load(frame):
+        if isinstance(frame, np.ndarray):
+            return np.ascontiguousarray(frame[:, :, :3], dtype=np.uint8)
+        if isinstance(frame, str):
+            with Image.open(frame) as image:
+                return np.asarray(image.convert('RGB'))
+        return np.asarray(frame.convert('RGB'))
+
+    def next_frame(self):
+        with self._lock:
+            frame = self.frames[self.index]
+            if self.index + 1 < len(self.frames):
+                self.index += 1
+            elif self.loop:
+                self.index = 0
+            return frame
+
+    def _grab_into(self, region, buffer):
+        x, y, width, height = region
+        frame = self.next_frame()
+        if x < 0 or y < 0 or x + width > frame.shape[1] or y + height > frame.shape[0]:
+            raise ValueError(f"Region {tuple(region)} is outside the {frame.shape[1]}x{frame.shape[0]} fake screen")
+        np.copyto(buffer, frame[y:y + height, x:x + width])
+
+
+def create_capture_backend(name="auto"):
+    """Build a backend by name ("auto", "mss", "pyautogui"); auto prefers MSS"""
+    if name == "auto":
+        name = "mss" if MSS_INSTALLED else "pyautogui"
+    if name == "mss":
+        return MssBackend()
+    if name == "pyautogui":
+        return PyAutoGuiBackend()
+    raise ValueError(f"Unknown capture backend: {name}")
+
+
+_shared_backend = None
+_shared_backend_lock = threading.Lock()
+
+
+def get_capture_backend():
+    """Return the process-wide capture backend"""
+    global _shared_backend
+    with _shared_backend_lock:
+        if _shared_backend is None:
+            _shared_backend = create_capture_backend(os.environ.get("OCR_CAPTURE_BACKEND", "auto"))
+        return _shared_backend
+
+
+def set_capture_backend(backend):
+    """Replace the process-wide capture backend (returns the previous one)"""
+    global _shared_backend
+    with _shared_backend_lock:
+        previous, _shared_backend = _shared_backend, backend
+        return previous
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+Test script for the per-game partitions of the translation and OCR caches.
+"""
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+from ocr_cache import OcrResultCache
+from translation_cache import TranslationCache
+
+
+def test_translation_partitions():
+    """Each game keeps its own in-memory entries; returning to a game is warm"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TranslationCache(os.path.join(tmp, "cache.sqlite3"), max_games=2)
+        cache.set_game("game_a.exe")
+        cache.wait_ready(5)
+        cache.put("こんにちは世界", "model", 1, "Hello world")
+
+        cache.set_game("game_b.exe")
+        cache.wait_ready(5)
+        b_entries = cache.stats()["memory_entries"]
+
+        cache.set_game("game_a.exe")
+        cache.wait_ready(5)
+        a_stats = cache.stats()
+        hit = cache.get("こんにちは世界", "model", 1)
+        cache.close()
+
+    ok = (
+        b_entries == 0
+        and a_stats["memory_entries"] == 1
+        and a_stats["fuzzy_index_entries"] == 1
+        and hit == "Hello world"
+    )
+    print(f"{'✓' if ok else '✗'} Translation partitions per game")
+    return ok
+
+
+def test_translation_eviction_and_reload():
+    """Partitions beyond max_games leave memory and are reloaded from disk"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = TranslationCache(os.path.join(tmp, "cache.sqlite3"), max_games=2)
+        for game in ("game_a.exe", "game_b.exe", "game_c.exe"):
+            cache.set_game(game)
+            cache.wait_ready(5)
+            cache.put(f"{game}のセリフです", "model", 1, f"A line from {game}")
+
+        loaded = cache.stats()["loaded_games"]
+        cache.set_game("game_a.exe")
+        cache.wait_ready(5)
+        stats = cache.stats()
+        hit = cache.get("game_a.exeのセリフです", "model", 1)
+        cache.close()
+
+    ok = (
+        loaded == 2
+        and stats["memory_entries"] == 1
+        and hit == "A line from game_a.exe"
+        and cache.disk_hits == 0
+    )
+    print(f"{'✓' if ok else '✗'} Evicted game partitions reload from disk")
+    return ok
+
+
+def test_translation_shared_lines():
+    """A line translated in another game is reused and copied into this game"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "cache.sqlite3")
+        cache = TranslationCache(db_path)
+        cache.set_game("game_a.exe")
+        cache.put("ありがとう", "model", 1, "Thank you")
+        cache.set_game("game_b.exe")
+        cache.wait_ready(5)
+        hit = cache.get("ありがとう", "model", 1)
+        cache.close()
+
+        with sqlite3.connect(db_path) as conn:
+            games = sorted(row[0] for row in conn.execute("SELECT game FROM translations"))
+
+    ok = hit == "Thank you" and games == ["game_a.exe", "game_b.exe"]
+    print(f"{'✓' if ok else '✗'} Lines shared between games")
+    return ok
+
+
+def test_translation_legacy_database():
+    """Databases from before partitions keep their rows"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "cache.sqlite3")
+        key = TranslationCache.make_key("おはよう", "model", 1)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("CREATE TABLE translations (key TEXT PRIMARY KEY, source TEXT, model TEXT, "
+                         "prompt_version TEXT, translation TEXT)")
+            conn.execute("INSERT INTO translations VALUES (?, ?, ?, ?, ?)",
+                         (key, "おはよう", "model", "1", "Good morning"))
+
+        cache = TranslationCache(db_path)
+        cache.wait_ready(5)
+        hit = cache.get("おはよう", "model", 1)
+        cache.close()
+
+    ok = hit == "Good morning"
+    print(f"{'✓' if ok else '✗'} Legacy cache database migrated")
+    return ok
+
+
+def test_ocr_partitions_persist():
+    """OCR results are saved when switching away and loaded back after a restart"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "ocr.sqlite3")
+        key_a = ((200, 40), 0xABCDEF, "a" * 32)
+        key_b = ((200, 40), 0x123456, "b" * 32)
+
+        cache = OcrResultCache(db_path=db_path)
+        cache.set_game("game_a.exe")
+        cache.store(key_a, "テキストA")
+        cache.set_game("game_b.exe")
+        cache.store(key_b, "テキストB")
+        cache.wait_ready(5)
+        miss_in_b = cache.lookup(key_a)
+        cache.close()
+
+        restarted = OcrResultCache(db_path=db_path, max_distance=0)
+        restarted.set_game("game_a.exe")
+        restarted.wait_ready(5)
+        hit_a = restarted.lookup(key_a)
+        other_game = restarted.lookup(key_b)
+        restarted.set_game("game_b.exe")
+        restarted.wait_ready(5)
+        hit_b = restarted.lookup(key_b)
+        restarted.close()
+
+    ok = miss_in_b is None and hit_a == "テキストA" and other_game is None and hit_b == "テキストB"
+    print(f"{'✓' if ok else '✗'} OCR partitions persist per game")
+    return ok
+
+
+def main():
+    print("Testing per-game cache partitions...\n")
+    results = [
+        test_translation_partitions(),
+        test_translation_eviction_and_reload(),
+        test_translation_shared_lines(),
+        test_translation_legacy_database(),
+        test_ocr_partitions_persist(),
+    ]
+    if all(results):
+        print("\n✓ All cache partition tests passed!")
+    else:
+        print("\n✗ Some cache partition tests failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
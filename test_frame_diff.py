@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Test script for Auto-OCR change detection.
+
+Renders dialogue lines into a dialogue box the size of a typical saved
+region (1644x232), so no screen capture is needed.
+"""
+
+import sys
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from frame_diff import FrameChangeDetector
+
+BOX_SIZE = (1644, 232)
+FONT = ImageFont.load_default(size=32)
+
+
+def render_line(text, noise=0, seed=0):
+    """A dark dialogue box with one line of 32 px white text, optionally with pixel noise"""
+    image = Image.new('RGB', BOX_SIZE, (20, 20, 40))
+    ImageDraw.Draw(image).text((60, 90), text, fill=(255, 255, 255), font=FONT)
+    pixels = np.asarray(image)
+    if noise:
+        rng = np.random.default_rng(seed)
+        pixels = np.clip(pixels + rng.integers(-noise, noise + 1, size=pixels.shape), 0, 255)
+    return pixels.astype(np.uint8)
+
+
+def test_small_edits_count_as_changed():
+    """One-word and punctuation edits inside a wide box are new dialogue"""
+    edits = [
+        ("Yes, I understand.", "No, I understand."),
+        ("See you tomorrow.", "See you today."),
+        ("See you tomorrow.", "See you tomorrow!"),
+    ]
+    results = []
+    for before, after in edits:
+        detector = FrameChangeDetector()
+        detector.has_changed(render_line(before))
+        results.append(detector.has_changed(render_line(after)))
+
+    ok = all(results)
+    print(f"{'✓' if ok else '✗'} Small edits in a wide box are detected ({sum(results)}/{len(edits)})")
+    return ok
+
+
+def test_unchanged_and_noisy_frames_skipped():
+    """Repeated captures of the same line, with capture noise, are skipped"""
+    detector = FrameChangeDetector()
+    first = detector.has_changed(render_line("See you tomorrow."))
+    repeats = [detector.has_changed(render_line("See you tomorrow.", noise=8, seed=seed))
+               for seed in range(5)]
+
+    ok = first and not any(repeats) and detector.frames_skipped == 5 and detector.frames_seen == 6
+    print(f"{'✓' if ok else '✗'} Unchanged and noisy frames are skipped")
+    return ok
+
+
+def test_reset_and_resize():
+    """After reset or a region resize the next frame is always OCR'd"""
+    detector = FrameChangeDetector()
+    frame = render_line("Hello")
+    detector.has_changed(frame)
+    detector.reset()
+    after_reset = detector.has_changed(frame)
+    resized = detector.has_changed(frame[:, :800])
+
+    ok = after_reset and resized
+    print(f"{'✓' if ok else '✗'} Reset and resized regions force OCR")
+    return ok
+
+
+def main():
+    print("Testing frame change detection...\n")
+    results = [
+        test_small_edits_count_as_changed(),
+        test_unchanged_and_noisy_frames_skipped(),
+        test_reset_and_resize(),
+    ]
+    if all(results):
+        print("\n✓ All frame change detection tests passed!")
+    else:
+        print("\n✗ Some frame change detection tests failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
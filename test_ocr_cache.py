@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Test script for the OCR result cache.
+
+Renders short dialogue lines into a game-sized text box, so no screen or
+MangaOCR model is needed.
+"""
+
+import sys
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from ocr_cache import OcrResultCache, hamming_distance
+
+BOX_SIZE = (1644, 232)
+
+
+def render_line(text, noise=0, seed=0):
+    """A dark dialogue box with one short white line, optionally with pixel noise"""
+    image = Image.new('RGB', BOX_SIZE, (20, 20, 40))
+    ImageDraw.Draw(image).text((60, 90), text, fill=(255, 255, 255))
+    if noise:
+        rng = np.random.default_rng(seed)
+        pixels = np.asarray(image, dtype=np.int16)
+        pixels = pixels + rng.integers(-noise, noise + 1, size=pixels.shape)
+        image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    return image
+
+
+def cache_text(cache, image, text):
+    cache.store(cache.make_key(image), text, image)
+
+
+def test_distinct_short_lines():
+    """Two different short lines in the same box are separate entries"""
+    yes, no = render_line("Yes."), render_line("No.")
+    cache = OcrResultCache()
+    cache_text(cache, yes, "はい。")
+
+    distance = hamming_distance(cache.make_key(yes)[1], cache.make_key(no)[1])
+    ok = (
+        cache.lookup(cache.make_key(no), no) is None
+        and cache.lookup(cache.make_key(yes), yes) == "はい。"
+    )
+    print(f"{'✓' if ok else '✗'} Distinct short lines do not share a result ({distance} bits apart)")
+    return ok
+
+
+def test_near_match_needs_confirmation():
+    """With a wide hash distance, only captures that match the stored thumbnail are hits"""
+    cache = OcrResultCache(max_distance=8)
+    yes, no = render_line("Yes."), render_line("No.")
+    cache_text(cache, yes, "はい。")
+
+    noisy_yes = render_line("Yes.", noise=3, seed=1)
+    wrong = cache.lookup(cache.make_key(no), no)
+    noisy = cache.lookup(cache.make_key(noisy_yes), noisy_yes)
+    stats = cache.stats()
+
+    ok = wrong is None and noisy == "はい。" and stats["misses"] == 1
+    print(f"{'✓' if ok else '✗'} Near matches are confirmed by thumbnail "
+          f"({stats['near_hits']} near hit{'s' if stats['near_hits'] != 1 else ''})")
+    return ok
+
+
+def test_noisy_recapture_hits_by_default():
+    """A default cache answers slightly noisy recaptures of a line without the model"""
+    calls = []
+
+    def recognizer(image):
+        calls.append(image)
+        return "はい。"
+
+    cache = OcrResultCache()
+    cache.recognize(render_line("Yes."), recognizer)
+    texts = [cache.recognize(render_line("Yes.", noise=3, seed=seed), recognizer) for seed in range(8)]
+    other = cache.recognize(render_line("No."), lambda image: "いいえ。")
+
+    ok = texts == ["はい。"] * 8 and len(calls) == 1 and other == "いいえ。"
+    print(f"{'✓' if ok else '✗'} Noisy recaptures hit by default ({cache.stats()['near_hits']} near hits)")
+    return ok
+
+
+def test_recognize_uses_cache():
+    """recognize() runs the model once per distinct capture"""
+    calls = []
+
+    def recognizer(image):
+        calls.append(image)
+        return f"text {len(calls)}"
+
+    cache = OcrResultCache()
+    first = cache.recognize(render_line("Hello"), recognizer)
+    repeat = cache.recognize(render_line("Hello"), recognizer)
+    other = cache.recognize(render_line("Bye"), recognizer)
+
+    ok = first == repeat == "text 1" and other == "text 2" and len(calls) == 2
+    print(f"{'✓' if ok else '✗'} recognize() caches repeated captures")
+    return ok
+
+
+def main():
+    print("Testing OCR result cache...\n")
+    results = [
+        test_distinct_short_lines(),
+        test_near_match_needs_confirmation(),
+        test_noisy_recapture_hits_by_default(),
+        test_recognize_uses_cache(),
+    ]
+    if all(results):
+        print("\n✓ All OCR cache tests passed!")
+    else:
+        print("\n✗ Some OCR cache tests failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Test script for the OCR worker pool's shared-memory frame transport.
+
+Workers run a fake model that reports a frame's pixel value, so no MangaOCR
+download is needed.
+"""
+
+import sys
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+from ocr_worker_pool import OcrWorkerPool
+
+SLOW_VALUE = 10
+
+
+def _fake_model(image):
+    """Pixel value of the frame; slow for SLOW_VALUE frames"""
+    value = image.getpixel((0, 0))
+    if value == SLOW_VALUE:
+        time.sleep(1.5)
+        value = image.getpixel((0, 0))  # read the pixels again after the slow inference
+    return str(value)
+
+
+def fake_model_factory():
+    return _fake_model
+
+
+def test_parallel_frames_keep_their_pixels():
+    """Frames sent to other workers during a slow inference do not touch its frame"""
+    pool = OcrWorkerPool(workers=2, model_factory=fake_model_factory)
+    try:
+        slow_result = []
+        slow = threading.Thread(
+            target=lambda: slow_result.append(pool(Image.new('L', (64, 16), SLOW_VALUE)))
+        )
+        slow.start()
+        time.sleep(0.3)
+
+        # The other worker gets several frames while the first one is still busy
+        fast_results = [pool(Image.new('L', (64, 16), 200)) for _ in range(6)]
+        slow.join()
+    finally:
+        pool.close()
+
+    ok = slow_result == [str(SLOW_VALUE)] and fast_results == ["200"] * 6
+    print(f"{'✓' if ok else '✗'} Parallel frames keep their pixels (slow frame -> {slow_result})")
+    return ok
+
+
+def test_overwrite_during_inference_detected():
+    """A slot overwritten while the worker reads it is detected and the frame resent"""
+    pool = OcrWorkerPool(workers=1, model_factory=fake_model_factory)
+    try:
+        slow_result = []
+        slow = threading.Thread(
+            target=lambda: slow_result.append(pool(Image.new('L', (64, 16), SLOW_VALUE)))
+        )
+        slow.start()
+        time.sleep(0.3)
+        # Rewrite the worker's slot behind its back, mid-inference
+        pool.workers[0].ring.write(np.full((16, 64), 200, dtype=np.uint8))
+        slow.join()
+    finally:
+        pool.close()
+
+    ok = slow_result == [str(SLOW_VALUE)]
+    print(f"{'✓' if ok else '✗'} Overwritten frames are detected after inference (-> {slow_result})")
+    return ok
+
+
+def test_recognize_many():
+    """Several frames spread across workers keep their order"""
+    pool = OcrWorkerPool(workers=2, model_factory=fake_model_factory)
+    try:
+        values = [50, 60, 70, 80, 90]
+        results = pool.recognize_many([Image.new('L', (32, 32), value) for value in values])
+    finally:
+        pool.close()
+
+    ok = results == [str(value) for value in values]
+    print(f"{'✓' if ok else '✗'} recognize_many keeps frame order")
+    return ok
+
+
+def main():
+    print("Testing OCR worker pool...\n")
+    results = [
+        test_parallel_frames_keep_their_pixels(),
+        test_overwrite_during_inference_detected(),
+        test_recognize_many(),
+    ]
+    if all(results):
+        print("\n✓ All OCR worker pool tests passed!")
+    else:
+        print("\n✗ Some OCR worker pool tests failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Test script for the per-game region store.
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from region_store import RegionStore
+
+
+def test_dedupe_and_recent_first():
+    """Re-selecting a rectangle refreshes it instead of adding a duplicate"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RegionStore(os.path.join(tmp, "regions.json"), flush_delay=0.05)
+        store.save_region("game.exe", (10, 10, 200, 50), "Title")
+        store.save_region("game.exe", (0, 300, 640, 120), "Title")
+        store.save_region("game.exe", (10, 10, 200, 50), "Title")
+        regions = [tuple(entry['region']) for entry in store.regions_for("game.exe")]
+        last = store.last_region("game.exe")
+        store.close()
+
+    ok = regions == [(10, 10, 200, 50), (0, 300, 640, 120)] and tuple(last) == (10, 10, 200, 50)
+    print(f"{'✓' if ok else '✗'} Identical rectangles are merged, most recent first")
+    return ok
+
+
+def test_history_cap():
+    """Only the newest regions of a game are kept"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = RegionStore(os.path.join(tmp, "regions.json"), max_regions_per_game=5, flush_delay=0.05)
+        for i in range(50):
+            store.save_region("game.exe", (i, 0, 100, 100))
+        regions = store.regions_for("game.exe")
+        store.close()
+
+    ok = len(regions) == 5 and regions[0]['region'] == [49, 0, 100, 100] and regions[-1]['region'][0] == 45
+    print(f"{'✓' if ok else '✗'} History is capped per game")
+    return ok
+
+
+def test_debounced_atomic_write():
+    """A burst of selections becomes one write, through a temporary file"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "regions.json")
+        store = RegionStore(path, flush_delay=0.2)
+        for i in range(20):
+            store.save_region("game.exe", (i, 0, 100, 100))
+        written_early = os.path.exists(path)
+        time.sleep(0.6)
+        writes = store.writes
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        leftovers = [name for name in os.listdir(tmp) if name != "regions.json"]
+        store.close()
+
+    ok = (
+        not written_early
+        and writes == 1
+        and data["game.exe"][0]["region"] == [19, 0, 100, 100]
+        and not leftovers
+    )
+    print(f"{'✓' if ok else '✗'} Debounced atomic write ({writes} write for 20 selections)")
+    return ok
+
+
+def test_close_flushes_and_reloads():
+    """Pending changes are written on close and read back"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "regions.json")
+        store = RegionStore(path, flush_delay=10)
+        store.save_region("a.exe", (1, 2, 3, 4), "A")
+        store.save_region("b.exe", (5, 6, 7, 8), "B")
+        store.close()
+
+        reloaded = RegionStore(path)
+        ok = (
+            reloaded.last_region("a.exe") == [1, 2, 3, 4]
+            and reloaded.last_region("b.exe") == [5, 6, 7, 8]
+            and reloaded.last_region("c.exe") is None
+        )
+        reloaded.close()
+
+    print(f"{'✓' if ok else '✗'} Close writes pending changes")
+    return ok
+
+
+def test_legacy_config():
+    """Old append-only files are deduplicated and capped on load"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "regions.json")
+        entries = [
+            {"region": [i % 3, 0, 100, 100], "timestamp": f"2024-01-01T00:00:{i:02d}",
+             "window_title": "Old", "last_used": f"2024-01-01T00:00:{i:02d}"}
+            for i in range(30)
+        ]
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"game.exe": entries}, f, indent=2)
+
+        store = RegionStore(path)
+        regions = store.regions_for("game.exe")
+        store.close()
+
+    ok = (
+        [entry['region'][0] for entry in regions] == [2, 1, 0]
+        and regions[0]['last_used'] == "2024-01-01T00:00:29"
+    )
+    print(f"{'✓' if ok else '✗'} Legacy config deduplicated on load")
+    return ok
+
+
+def main():
+    print("Testing region store...\n")
+    results = [
+        test_dedupe_and_recent_first(),
+        test_history_cap(),
+        test_debounced_atomic_write(),
+        test_close_flushes_and_reloads(),
+        test_legacy_config(),
+    ]
+    if all(results):
+        print("\n✓ All region store tests passed!")
+    else:
+        print("\n✗ Some region store tests failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+"""
+Test script for the record/replay harness.
+
+Replays a small generated recording with a stub OCR, so no screen, game or
+MangaOCR model is needed.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from replay_harness import Recording, ReplayBackend, replay, summarize
+
+REGION = (100, 800, 320, 64)
+INTERVAL = 0.05
+
+
+def make_recording():
+    """Three dialogue 'lines' held for a few captures each (8 captures, 3 unique frames)"""
+    recording = Recording(REGION)
+    width, height = REGION[2], REGION[3]
+    lines = []
+    for i in range(3):
+        frame = np.full((height, width, 3), 20, dtype=np.uint8)
+        frame[20:44, 10 + 60 * i:70 + 60 * i] = 255  # a block of "text" that moves per line
+        lines.append(frame)
+    for capture, line in enumerate([0, 0, 0, 1, 1, 2, 2, 2]):
+        recording.append(lines[line], capture * INTERVAL)
+    return recording
+
+
+def stub_ocr(region, image, detect_bubbles=False, timings=None):
+    """Reports where the text block is, standing in for MangaOCR"""
+    pixels = np.asarray(image.convert('L'))
+    if timings is not None:
+        timings['ocr'] = 0.0
+    return f"block at {int(np.argmax(pixels[32] > 128))}"
+
+
+def saved_and_loaded():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "dialogue.npz")
+        make_recording().save(path)
+        return Recording.load(path)
+
+
+def test_round_trip():
+    """Saved recordings keep their captures, unique frames and timing"""
+    recording = saved_and_loaded()
+    ok = (
+        recording.region == REGION
+        and len(recording) == 8
+        and len(recording.frames) == 3
+        and abs(recording.duration() - 7 * INTERVAL) < 1e-9
+    )
+    print(f"{'✓' if ok else '✗'} Recording round trip ({len(recording)} captures, {len(recording.frames)} unique)")
+    return ok
+
+
+def test_replay_counts():
+    """Every capture is replayed and only changed frames reach OCR"""
+    result = replay(saved_and_loaded(), ocr=stub_ocr)
+    every_frame = replay(saved_and_loaded(), ocr=stub_ocr, all_frames=True)
+    summary = summarize(result)
+
+    ok = (
+        result["frames"] == 8
+        and result["ocr_passes"] == 3
+        and every_frame["ocr_passes"] == 8
+        and summary["stages"]["ocr"]["count"] == 3
+    )
+    print(f"{'✓' if ok else '✗'} Replay counts ({result['ocr_passes']} OCR passes for {result['frames']} frames)")
+    return ok
+
+
+def test_realtime_is_paced():
+    """Realtime replay serves each capture once, at the recorded pace, without spinning"""
+    recording = saved_and_loaded()
+    result = replay(recording, ocr=stub_ocr, realtime=True)
+
+    ok = (
+        result["frames"] == 8
+        and result["ocr_passes"] == 3
+        and recording.duration() * 0.9 <= result["wall_seconds"] < recording.duration() + 0.3
+    )
+    print(f"{'✓' if ok else '✗'} Realtime replay is paced "
+          f"({result['frames']} frames in {result['wall_seconds']:.2f}s)")
+    return ok
+
+
+def test_realtime_skips_when_late():
+    """A caller slower than the recording skips the captures it missed"""
+    backend = ReplayBackend(saved_and_loaded(), realtime=True)
+    served = []
+    while not backend.finished:
+        backend.grab_array(REGION)
+        served.append(backend.position - 1)
+        time.sleep(2.5 * INTERVAL)
+
+    ok = served[0] == 0 and served[-1] == 7 and len(served) < 8 and served == sorted(set(served))
+    print(f"{'✓' if ok else '✗'} Late realtime grabs skip missed captures ({served})")
+    return ok
+
+
+def main():
+    print("Testing replay harness...\n")
+    results = [
+        test_round_trip(),
+        test_replay_counts(),
+        test_realtime_is_paced(),
+        test_realtime_skips_when_late(),
+    ]
+    if all(results):
+        print("\n✓ All replay harness tests passed!")
+    else:
+        print("\n✗ Some replay harness tests failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
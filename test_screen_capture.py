@@ -0,0 +1,141 @@
+#!/usr/bin/env python
+"""
+Test script for the screen capture backends.
+
+Uses the file-backed fake screen, so it runs on machines without a display.
+When a display is available (for example under `xvfb-run python
+test_screen_capture.py`) and MSS is installed, the MSS backend is checked too.
+"""
+
+import os
+import sys
+
+import numpy as np
+from PIL import Image
+
+from screen_capture import (MSS_INSTALLED, FileBackend, MssBackend, create_capture_backend,
+                            get_capture_backend, set_capture_backend)
+
+
+def make_screen(width=320, height=200, seed=0):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 255, size=(height, width, 3), dtype=np.uint8)
+
+
+def test_file_backend_crop():
+    """Grabs return exactly the requested region of the fake screen"""
+    screen = make_screen()
+    backend = FileBackend([screen])
+    region = (10, 20, 100, 50)
+    array = backend.grab_array(region)
+    image = backend.grab(region)
+
+    ok = (
+        array.shape == (50, 100, 3)
+        and np.array_equal(array, screen[20:70, 10:110])
+        and image.size == (100, 50)
+        and np.array_equal(np.asarray(image), screen[20:70, 10:110])
+    )
+    print(f"{'✓' if ok else '✗'} File backend crops the requested region")
+    return ok
+
+
+def test_buffer_reuse():
+    """Same-size grabs reuse one buffer; PIL grabs are independent copies"""
+    backend = FileBackend([make_screen(seed=1), make_screen(seed=2)])
+    first = backend.grab_array((0, 0, 64, 32))
+    second = backend.grab_array((5, 5, 64, 32))
+    image_a = backend.grab((0, 0, 64, 32))
+    image_b = backend.grab((0, 0, 64, 32))
+    resized = backend.grab_array((0, 0, 32, 32))
+
+    ok = (
+        first is second
+        and resized is not first
+        and not np.array_equal(np.asarray(image_a), np.asarray(image_b))
+    )
+    print(f"{'✓' if ok else '✗'} Reusable frame buffer")
+    return ok
+
+
+def test_frame_sequence(tmp_dir="_capture_test_frames"):
+    """A folder of images plays back in name order and loops"""
+    os.makedirs(tmp_dir, exist_ok=True)
+    try:
+        for index in range(3):
+            Image.fromarray(np.full((40, 60, 3), index * 50, dtype=np.uint8)).save(
+                os.path.join(tmp_dir, f"frame_{index:03d}.png"))
+        backend = FileBackend(tmp_dir)
+        values = [int(backend.grab_array((0, 0, 60, 40))[0, 0, 0]) for _ in range(4)]
+
+        once = FileBackend(tmp_dir, loop=False)
+        last = [int(once.grab_array((0, 0, 60, 40))[0, 0, 0]) for _ in range(4)]
+    finally:
+        for name in os.listdir(tmp_dir):
+            os.remove(os.path.join(tmp_dir, name))
+        os.rmdir(tmp_dir)
+
+    ok = values == [0, 50, 100, 0] and last == [0, 50, 100, 100]
+    print(f"{'✓' if ok else '✗'} Frame sequence playback: {values}")
+    return ok
+
+
+def test_out_of_bounds():
+    """Regions outside the fake screen are rejected"""
+    backend = FileBackend([make_screen(100, 100)])
+    try:
+        backend.grab_array((50, 50, 100, 100))
+        ok = False
+    except ValueError:
+        ok = True
+    print(f"{'✓' if ok else '✗'} Out-of-bounds region rejected")
+    return ok
+
+
+def test_shared_backend_swap():
+    """set_capture_backend replaces what get_capture_backend returns"""
+    fake = FileBackend([make_screen()])
+    previous = set_capture_backend(fake)
+    try:
+        ok = get_capture_backend() is fake
+    finally:
+        set_capture_backend(previous)
+    ok = ok and create_capture_backend("pyautogui").name == "pyautogui"
+    print(f"{'✓' if ok else '✗'} Shared backend can be swapped")
+    return ok
+
+
+def test_mss_backend():
+    """MSS grabs the requested size from a real (or virtual) display"""
+    if not MSS_INSTALLED or (sys.platform.startswith("linux") and not os.environ.get("DISPLAY")):
+        print("- MSS backend skipped (mss not installed or no display)")
+        return True
+
+    backend = MssBackend()
+    first = backend.grab_array((0, 0, 64, 48))
+    second = backend.grab_array((0, 0, 64, 48))
+    backend.close()
+    ok = first.shape == (48, 64, 3) and first is second
+    print(f"{'✓' if ok else '✗'} MSS backend grab")
+    return ok
+
+
+def main():
+    print("Testing screen capture backends...\n")
+    results = [
+        test_file_backend_crop(),
+        test_buffer_reuse(),
+        test_frame_sequence(),
+        test_out_of_bounds(),
+        test_shared_backend_swap(),
+        test_mss_backend(),
+    ]
+    if all(results):
+        print("\n✓ All screen capture tests passed!")
+    else:
+        print("\n✗ Some screen capture tests failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
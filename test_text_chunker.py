@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+"""
+Test script for sentence-aware chunking of OCR text.
+"""
+
+import sys
+
+from text_chunker import estimate_tokens, iter_chunks, iter_sentences
+
+
+def test_sentence_split():
+    """Sentences keep their punctuation and closing quotes; joining restores the text"""
+    text = "「本当？」「うん！」そうか……\n次の行です。最後"
+    sentences = list(iter_sentences(text))
+
+    ok = (
+        sentences == ["「本当？」", "「うん！」", "そうか……", "\n", "次の行です。", "最後"]
+        and "".join(sentences) == text
+    )
+    print(f"{'✓' if ok else '✗'} Sentences split after enders, quotes and line breaks")
+    return ok
+
+
+def test_periods_inside_tokens():
+    """Decimals, versions and ellipses inside text are not sentence ends"""
+    cases = {
+        "円周率は3.14です。": ["円周率は3.14です。"],
+        "Ver.2に更新しました。": ["Ver.2に更新しました。"],
+        "Wait...what? OK.": ["Wait...what?", " OK."],
+        "It costs 2.5 gold. Buy it.": ["It costs 2.5 gold.", " Buy it."],
+        '"Fine." He left.': ['"Fine."', " He left."],
+    }
+    failures = [text for text, expected in cases.items() if list(iter_sentences(text)) != expected]
+
+    ok = not failures
+    print(f"{'✓' if ok else '✗'} ASCII periods split only before whitespace{f' ({failures})' if failures else ''}")
+    return ok
+
+
+def test_long_input_within_budget():
+    """A long text becomes chunks of whole sentences, each within the budget"""
+    sentences = [f"これは{i}番目の文です。" for i in range(200)]
+    text = "".join(sentences)
+    chunks = list(iter_chunks(text, max_tokens=50))
+
+    ok = (
+        len(chunks) > 1
+        and all(estimate_tokens(chunk) <= 50 for chunk in chunks)
+        and all(chunk.endswith("。") for chunk in chunks)
+        and "".join(chunks) == text
+    )
+    print(f"{'✓' if ok else '✗'} Long input packed into {len(chunks)} chunks within the budget")
+    return ok
+
+
+def test_budget_boundary():
+    """Sentences that exactly fill the budget share a chunk; one more token starts the next"""
+    sentence = "あいうえお。"  # 6 tokens
+    exact = list(iter_chunks(sentence * 2, max_tokens=12))
+    over = list(iter_chunks(sentence * 2, max_tokens=11))
+
+    ok = exact == [sentence * 2] and over == [sentence, sentence]
+    print(f"{'✓' if ok else '✗'} Budget boundary is inclusive")
+    return ok
+
+
+def test_oversized_sentence_and_empty_input():
+    """A sentence longer than the budget is split inside; blank text gives no chunks"""
+    sentence = "あ" * 25 + "。"
+    chunks = list(iter_chunks(sentence, max_tokens=10))
+
+    ok = (
+        [len(chunk) for chunk in chunks] == [10, 10, 6]
+        and "".join(chunks) == sentence
+        and list(iter_chunks("  \n \n")) == []
+    )
+    print(f"{'✓' if ok else '✗'} Oversized sentences are split; blank input is skipped")
+    return ok
+
+
+def main():
+    print("Testing text chunker...\n")
+    results = [
+        test_sentence_split(),
+        test_periods_inside_tokens(),
+        test_long_input_within_budget(),
+        test_budget_boundary(),
+        test_oversized_sentence_and_empty_input(),
+    ]
+    if all(results):
+        print("\n✓ All text chunker tests passed!")
+    else:
+        print("\n✗ Some text chunker tests failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
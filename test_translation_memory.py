@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+"""
+Test script for the fuzzy translation memory and its use by TranslationCache.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from translation_cache import TranslationCache
+from translation_memory import TranslationMemory
+
+
+def test_exact_and_fuzzy_lookup():
+    """A line with one kana misread finds the original's translation"""
+    memory = TranslationMemory()
+    memory.add("今日はとても良い天気ですね", "The weather is really nice today.")
+    memory.add("明日はきっと雨が降るでしょう", "It will surely rain tomorrow.")
+
+    exact = memory.lookup("今日はとても良い天気ですね")
+    fuzzy = memory.lookup("今日はとても良い天気でずね")
+    ok = (
+        exact == ("The weather is really nice today.", 1.0, "今日はとても良い天気ですね")
+        and fuzzy is not None
+        and fuzzy[0] == "The weather is really nice today."
+        and fuzzy[1] >= memory.threshold
+    )
+    print(f"{'✓' if ok else '✗'} Exact and near-duplicate lookups")
+    return ok
+
+
+def test_meaning_changing_edits():
+    """Added or dropped characters are not treated as OCR noise"""
+    memory = TranslationMemory()
+    memory.add("好きです", "I like it")
+    memory.add("分かりました", "Understood")
+    memory.add("本当にありがとうございました", "Thank you very much")
+
+    ok = (
+        memory.lookup("好きですか") is None
+        and memory.lookup("分かりましたか") is None
+        and memory.lookup("本当にありがとうございます") is None
+        and memory.lookup("本当にありがどうございました") is not None
+    )
+    print(f"{'✓' if ok else '✗'} Meaning-changing edits are not fuzzy matches")
+    return ok
+
+
+def test_unrelated_and_short_lines():
+    """Different lines and short lines do not match fuzzily"""
+    memory = TranslationMemory()
+    memory.add("今日はとても良い天気ですね", "The weather is really nice today.")
+    memory.add("はい", "Yes.")
+
+    ok = (
+        memory.lookup("お腹が空いたので何か食べたい") is None
+        and memory.lookup("いい") is None
+        and memory.lookup("はい") == ("Yes.", 1.0, "はい")
+    )
+    print(f"{'✓' if ok else '✗'} Unrelated and short lines are not fuzzy matches")
+    return ok
+
+
+def test_short_line_substitution():
+    """Short lines still match with one misread character, but not with two"""
+    memory = TranslationMemory()
+    memory.add("分かった", "Got it.")
+    memory.add("ありがとう", "Thanks.")
+    memory.add("どうしたの？", "What's wrong?")
+
+    four = memory.lookup("分がった")
+    five = memory.lookup("ありがどう")
+    six = memory.lookup("どうじたの？")
+    ok = (
+        four is not None and four[0] == "Got it."
+        and five is not None and five[0] == "Thanks."
+        and six is not None and six[0] == "What's wrong?"
+        and memory.lookup("あリがどう") is None
+    )
+    print(f"{'✓' if ok else '✗'} Short lines allow one substitution")
+    return ok
+
+
+def test_clear_during_lookups():
+    """Clearing from another thread never breaks a lookup in progress"""
+    memory = TranslationMemory()
+    lines = [f"今日はとても良い天気ですね{i:03d}" for i in range(200)]
+    errors = []
+    done = threading.Event()
+
+    def look_up():
+        while not done.is_set():
+            try:
+                for line in lines[::10]:
+                    memory.lookup(line[:-1] + "x")
+            except Exception as e:
+                errors.append(e)
+                return
+
+    reader = threading.Thread(target=look_up)
+    reader.start()
+    for _ in range(30):
+        for line in lines:
+            memory.add(line, "translation")
+        memory.clear()
+    done.set()
+    reader.join()
+
+    ok = not errors
+    print(f"{'✓' if ok else '✗'} Concurrent clear and lookup{f' ({errors[0]!r})' if errors else ''}")
+    return ok
+
+
+def test_update_and_clear():
+    """Re-adding a line updates its translation; clear empties the memory"""
+    memory = TranslationMemory()
+    memory.add("今日はとても良い天気ですね", "Nice weather.")
+    memory.add("今日はとても良い天気ですね", "The weather is really nice today.")
+    updated = memory.lookup("今日はとても良い天気でずね")
+    size = len(memory)
+    memory.clear()
+
+    ok = (
+        size == 1
+        and updated is not None and updated[0] == "The weather is really nice today."
+        and len(memory) == 0
+        and memory.lookup("今日はとても良い天気ですね") is None
+    )
+    print(f"{'✓' if ok else '✗'} Updating and clearing entries")
+    return ok
+
+
+def test_cache_fuzzy_fallback():
+    """TranslationCache rebuilds the memory from disk and serves near-duplicates per model"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "cache.sqlite3")
+        cache = TranslationCache(db_path)
+        cache.put("今日はとても良い天気ですね", "model-a", 1, "The weather is really nice today.")
+        cache.close()
+
+        cache = TranslationCache(db_path)
+        cache.wait_ready(5)
+        miss = cache.get("今日はとても良い天気でずね", "model-a", 1)
+        match = cache.get_similar("今日はとても良い天気でずね", "model-a", 1)
+        other_model = cache.get_similar("今日はとても良い天気でずね", "model-b", 1)
+        stats = cache.stats()
+        cache.close()
+
+    ok = (
+        miss is None
+        and match is not None and match[0] == "The weather is really nice today."
+        and other_model is None
+        and stats["fuzzy_hits"] == 1
+        and stats["fuzzy_index_entries"] == 1
+    )
+    print(f"{'✓' if ok else '✗'} Cache fuzzy fallback after restart")
+    return ok
+
+
+def test_lookup_speed(lines=20000):
+    """Lookups stay fast with many stored lines"""
+    memory = TranslationMemory()
+    kana = "あいうえおかきくけこさしすせそたちつてとなにぬねのはひふへほまみむめもやゆよらりるれろわをん"
+    for i in range(lines):
+        line = "".join(kana[(i * 7 + j * (i % 13 + 1)) % len(kana)] for j in range(12 + i % 10))
+        memory.add(line, f"translation {i}")
+
+    start = time.perf_counter()
+    for i in range(1000):
+        memory.lookup("".join(kana[(i * 11 + j * 3) % len(kana)] for j in range(16)))
+    per_lookup = (time.perf_counter() - start) / 1000
+
+    ok = per_lookup < 0.005
+    print(f"{'✓' if ok else '✗'} {per_lookup * 1000:.3f} ms per lookup with {lines} lines")
+    return ok
+
+
+def main():
+    print("Testing translation memory...\n")
+    results = [
+        test_exact_and_fuzzy_lookup(),
+        test_meaning_changing_edits(),
+        test_unrelated_and_short_lines(),
+        test_short_line_substitution(),
+        test_clear_during_lookups(),
+        test_update_and_clear(),
+        test_cache_fuzzy_fallback(),
+        test_lookup_speed(),
+    ]
+    if all(results):
+        print("\n✓ All translation memory tests passed!")
+    else:
+        print("\n✗ Some translation memory tests failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
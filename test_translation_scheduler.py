@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Test script for the translation scheduler's batching.
+
+Handlers only record what they were given, so no Ollama server is needed.
+"""
+
+import sys
+import threading
+import time
+
+from translation_scheduler import TranslationScheduler
+
+
+class Recorder:
+    """Handlers that note when and with which lines they were called"""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+        self.release.set()
+
+    def handler(self, request):
+        self.release.wait()
+        self.calls.append((time.monotonic(), [request.text]))
+
+    def batch_handler(self, requests):
+        self.calls.append((time.monotonic(), [request.text for request in requests]))
+
+
+def test_lone_request_not_delayed():
+    """A single request (e.g. Re-OCR) is handled without waiting out the batch window"""
+    recorder = Recorder()
+    scheduler = TranslationScheduler(recorder.handler, batch_handler=recorder.batch_handler,
+                                     batch_window=0.5, max_batch=8)
+    start = time.monotonic()
+    scheduler.submit("もう一度")
+    deadline = start + 2
+    while not recorder.calls and time.monotonic() < deadline:
+        time.sleep(0.005)
+    scheduler.stop()
+
+    latency = recorder.calls[0][0] - start if recorder.calls else None
+    ok = latency is not None and latency < 0.1 and recorder.calls[0][1] == ["もう一度"]
+    print(f"{'✓' if ok else '✗'} Lone request handled at once "
+          f"({'never' if latency is None else f'{latency * 1000:.0f} ms'})")
+    return ok
+
+
+def test_burst_is_batched():
+    """Lines queued while the worker is busy go out together"""
+    recorder = Recorder()
+    recorder.release.clear()
+    scheduler = TranslationScheduler(recorder.handler, batch_handler=recorder.batch_handler,
+                                     batch_window=0.05, max_batch=8)
+    scheduler.submit("一行目", source="a")
+    time.sleep(0.05)
+    for i in range(3):
+        scheduler.submit(f"行{i}", source=f"b{i}")
+    recorder.release.set()
+    time.sleep(0.3)
+    scheduler.stop()
+
+    ok = [lines for _, lines in recorder.calls] == [["一行目"], ["行0", "行1", "行2"]]
+    print(f"{'✓' if ok else '✗'} Queued lines share one batch")
+    return ok
+
+
+def test_overflow_drops_whole_submissions():
+    """A full queue drops the oldest submission with all its parts, never just its first chunk"""
+    recorder = Recorder()
+    recorder.release.clear()
+    scheduler = TranslationScheduler(recorder.handler, max_pending=4)
+    scheduler.submit("busy", source="z")
+    time.sleep(0.05)
+
+    chunked = [scheduler.submit(f"長文{part}", source="a", part=part) for part in range(3)]
+    newer = [scheduler.submit("次", source="b"), scheduler.submit("その次", source="c")]
+    long_submission = [scheduler.submit(f"部{part}", source="d", part=part) for part in range(6)]
+    depth = scheduler.queue_depth()
+    dropped = [request.is_cancelled() for request in chunked + newer + long_submission]
+    scheduler.stop()
+    recorder.release.set()
+
+    # a, then b and c make room; d alone is longer than the queue and kept whole
+    ok = dropped == [True] * 5 + [False] * 6 and depth == 6
+    print(f"{'✓' if ok else '✗'} Overflow drops whole submissions")
+    return ok
+
+
+def main():
+    print("Testing translation scheduler...\n")
+    results = [
+        test_lone_request_not_delayed(),
+        test_burst_is_batched(),
+        test_overflow_drops_whole_submissions(),
+    ]
+    if all(results):
+        print("\n✓ All translation scheduler tests passed!")
+    else:
+        print("\n✗ Some translation scheduler tests failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
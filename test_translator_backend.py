@@ -0,0 +1,242 @@
+#!/usr/bin/env python
+"""
+Test script for the pooled Ollama translator backend.
+
+Runs against a local HTTP stub that imitates the Ollama chat endpoint, so no
+Ollama server or model is needed.
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+from translator_backend import OllamaTranslator, parse_batch_reply
+
+STUB_REPLY = "Hello, world!"
+
+
+class OllamaStubHandler(BaseHTTPRequestHandler):
+    """Answers /api/chat and /api/generate like Ollama does"""
+
+    protocol_version = "HTTP/1.1"  # keep-alive, so connection reuse is observable
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_chunk(self, payload):
+        data = (json.dumps(payload) + "\n").encode('utf-8')
+        self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        self.server.requests.append((self.path, body, self.client_address))
+
+        if self.server.delay:
+            time.sleep(self.server.delay)
+
+        base = {"model": body.get("model", ""), "created_at": datetime.now(timezone.utc).isoformat()}
+
+        if self.path == "/api/generate":
+            self._send_json({**base, "response": "", "done": True})
+            return
+
+        if self.path != "/api/chat":
+            self.send_error(404)
+            return
+
+        # Batch prompts get a JSON array with one numbered reply per line
+        batch = re.search(r"exactly (\d+) strings", body["messages"][0]["content"])
+        if batch:
+            reply = json.dumps([f"{STUB_REPLY} {i}" for i in range(1, int(batch.group(1)) + 1)])
+            self._send_json({**base, "message": {"role": "assistant", "content": reply},
+                             "done": True, "done_reason": "stop"})
+            return
+
+        if not body.get("stream", True):
+            self._send_json({**base, "message": {"role": "assistant", "content": STUB_REPLY},
+                             "done": True, "done_reason": "stop"})
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for word in STUB_REPLY.split(" "):
+            piece = word if word == STUB_REPLY.split(" ")[0] else " " + word
+            self._send_chunk({**base, "message": {"role": "assistant", "content": piece}, "done": False})
+        self._send_chunk({**base, "message": {"role": "assistant", "content": ""},
+                          "done": True, "done_reason": "stop"})
+        self.wfile.write(b"0\r\n\r\n")
+        self.wfile.flush()
+
+
+class OllamaStubServer:
+    """Runs the stub on a free localhost port in a background thread"""
+
+    def __init__(self, delay=0.0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), OllamaStubHandler)
+        self.httpd.requests = []
+        self.httpd.delay = delay
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def test_translate():
+    """Blocking translation returns the reply and sends model and keep_alive"""
+    with OllamaStubServer() as stub:
+        translator = OllamaTranslator(host=stub.url, keep_alive="10m")
+        result = translator.translate("こんにちは世界")
+        translator.close()
+
+        path, body, _ = stub.requests[-1]
+        ok = (
+            result == STUB_REPLY
+            and path == "/api/chat"
+            and body.get("model") == translator.model
+            and body.get("keep_alive") == "10m"
+            and "こんにちは世界" in body["messages"][0]["content"]
+        )
+    print(f"{'✓' if ok else '✗'} Blocking translation: {result!r}")
+    return ok
+
+
+def test_translate_stream():
+    """Streaming translation yields the reply piece by piece"""
+    with OllamaStubServer() as stub:
+        translator = OllamaTranslator(host=stub.url)
+        pieces = list(translator.translate_stream("こんにちは世界"))
+        translator.close()
+
+    ok = len(pieces) > 1 and "".join(pieces) == STUB_REPLY
+    print(f"{'✓' if ok else '✗'} Streaming translation: {pieces!r}")
+    return ok
+
+
+def test_connection_reuse():
+    """Sequential translations reuse one pooled connection"""
+    with OllamaStubServer() as stub:
+        translator = OllamaTranslator(host=stub.url)
+        for _ in range(3):
+            translator.translate("テスト")
+        translator.close()
+
+        client_ports = {address[1] for _, _, address in stub.requests}
+    ok = len(stub.requests) == 3 and len(client_ports) == 1
+    print(f"{'✓' if ok else '✗'} Connection reuse: {len(client_ports)} connection(s) for {len(stub.requests)} requests")
+    return ok
+
+
+def test_warm_up():
+    """warm_up asks the server to load the model with keep_alive"""
+    with OllamaStubServer() as stub:
+        translator = OllamaTranslator(host=stub.url, keep_alive=-1)
+        loaded = translator.warm_up()
+        translator.close()
+
+        path, body, _ = stub.requests[-1]
+    ok = loaded and path == "/api/generate" and body.get("keep_alive") == -1
+    print(f"{'✓' if ok else '✗'} Model warm-up request")
+    return ok
+
+
+def test_translate_batch():
+    """Several lines go out in one request with context and come back split per line"""
+    with OllamaStubServer() as stub:
+        translator = OllamaTranslator(host=stub.url)
+        results = translator.translate_batch(["おはよう", "元気？", "またね"],
+                                             context=[("こんにちは", "Hello")])
+        translator.close()
+
+        prompt = stub.requests[-1][1]["messages"][0]["content"]
+        ok = (
+            len(stub.requests) == 1
+            and results == [f"{STUB_REPLY} {i}" for i in (1, 2, 3)]
+            and "1. おはよう" in prompt and "3. またね" in prompt
+            and "Japanese: こんにちは" in prompt
+        )
+    print(f"{'✓' if ok else '✗'} Batched translation: {results!r}")
+    return ok
+
+
+def test_batch_reply_parsing():
+    """Batch replies are split from JSON arrays or numbered lines, and rejected otherwise"""
+    ok = (
+        parse_batch_reply('Here you go: ["Hi", "Bye"]', 2) == ["Hi", "Bye"]
+        and parse_batch_reply('1. Hi\n2) "Bye"', 2) == ["Hi", "Bye"]
+        and parse_batch_reply('["Only one"]', 2) is None
+        and parse_batch_reply('Hi and bye', 2) is None
+    )
+    print(f"{'✓' if ok else '✗'} Batch reply parsing")
+    return ok
+
+
+def test_timeout():
+    """Requests slower than the timeout fail instead of hanging"""
+    with OllamaStubServer(delay=1.0) as stub:
+        translator = OllamaTranslator(host=stub.url, timeout=0.2)
+        start = time.perf_counter()
+        try:
+            translator.translate("テスト")
+            timed_out = False
+        except httpx.TimeoutException:
+            # The ollama client lets httpx timeouts through unwrapped
+            timed_out = True
+        elapsed = time.perf_counter() - start
+        translator.close()
+    ok = timed_out and elapsed < 0.6
+    print(f"{'✓' if ok else '✗'} Request timeout enforced (gave up after {elapsed:.2f}s)")
+    return ok
+
+
+def main():
+    print("Testing OllamaTranslator against a local stub...\n")
+    results = [
+        test_translate(),
+        test_translate_stream(),
+        test_connection_reuse(),
+        test_warm_up(),
+        test_translate_batch(),
+        test_batch_reply_parsing(),
+        test_timeout(),
+    ]
+    if all(results):
+        print("\n✓ All translator backend tests passed!")
+    else:
+        print("\n✗ Some translator backend tests failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
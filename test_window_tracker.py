@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+"""
+Test script for the foreground window tracker.
+
+Uses FakeWindowProvider, so it runs on Linux and machines without a desktop.
+"""
+
+import sys
+import time
+
+from window_tracker import (NO_PROVIDER_WINDOW, FakeWindowProvider, WindowTracker,
+                            create_window_provider)
+
+
+def make_provider(event_driven=False):
+    provider = FakeWindowProvider(event_driven=event_driven)
+    provider.add_window(1, 100, "Game.exe", "Visual Novel")
+    provider.add_window(2, 200, "python.exe", "OCR Text Extractor Launcher")
+    provider.focus(1)
+    return provider
+
+
+def test_polling_throttle():
+    """Polling callers share one snapshot until min_interval passes"""
+    provider = make_provider()
+    tracker = WindowTracker(provider, min_interval=0.05)
+    snapshots = [tracker.current() for _ in range(100)]
+    polls_burst = provider.foreground_calls
+    time.sleep(0.06)
+    tracker.current()
+
+    ok = (
+        all(snapshot is snapshots[0] for snapshot in snapshots)
+        and snapshots[0].exe_name == "game.exe"
+        and snapshots[0].title == "Visual Novel"
+        and polls_burst == 1
+        and provider.foreground_calls == 2
+        and provider.process_calls == 1
+    )
+    print(f"{'✓' if ok else '✗'} Polling is throttled and shared")
+    return ok
+
+
+def test_pid_cache():
+    """Switching back to a window does not look its process up again"""
+    provider = make_provider()
+    tracker = WindowTracker(provider, min_interval=0)
+    names = []
+    for handle in (1, 2, 1, 2, 1):
+        provider.focus(handle)
+        names.append(tracker.current().exe_name)
+
+    ok = (
+        names == ["game.exe", "python.exe", "game.exe", "python.exe", "game.exe"]
+        and provider.process_calls == 2
+        and tracker.stats()["refreshes"] == 5
+    )
+    print(f"{'✓' if ok else '✗'} PID to executable names are cached")
+    return ok
+
+
+def test_pid_reuse():
+    """A new process that reuses an exited game's PID is not reported as the game"""
+    provider = make_provider()
+    tracker = WindowTracker(provider, min_interval=0)
+    game = tracker.current()
+    provider.close_window(1)
+    provider.add_window(5, 100, "Notepad.exe", "memo.txt")
+    provider.focus(5)
+    reused = tracker.current()
+
+    ok = game.exe_name == "game.exe" and reused.exe_name == "notepad.exe" and reused.pid == 100
+    print(f"{'✓' if ok else '✗'} Reused PIDs are looked up again")
+    return ok
+
+
+def test_title_changes():
+    """Title changes of the foreground window are picked up in both modes"""
+    results = []
+    for event_driven in (False, True):
+        provider = make_provider(event_driven=event_driven)
+        tracker = WindowTracker(provider, min_interval=0.05)
+        before = tracker.current()
+        provider.set_title(1, "Visual Novel - Chapter 2")
+        throttled = tracker.current()
+        time.sleep(0.06)
+        after = tracker.current()
+        results.append(
+            before.title == "Visual Novel"
+            and throttled is before
+            and after.title == "Visual Novel - Chapter 2"
+            and after.exe_name == "game.exe"
+            and provider.process_calls == 1
+        )
+
+    ok = all(results)
+    print(f"{'✓' if ok else '✗'} Window title changes are refreshed")
+    return ok
+
+
+def test_event_driven():
+    """With an event hook, the OS is queried only after a foreground change"""
+    provider = make_provider(event_driven=True)
+    tracker = WindowTracker(provider, min_interval=0)
+    first = [tracker.current() for _ in range(50)]
+    calls_before_switch = provider.foreground_calls
+    provider.focus(2)
+    second = tracker.current()
+    tracker.current()
+
+    ok = (
+        tracker.event_driven
+        and calls_before_switch == 1
+        and first[-1].exe_name == "game.exe"
+        and second.exe_name == "python.exe"
+        and provider.foreground_calls == 2
+    )
+    print(f"{'✓' if ok else '✗'} Event-driven refreshes")
+    return ok
+
+
+def test_errors_and_missing_provider():
+    """Lookup failures report an unknown window and are retried next time"""
+    provider = make_provider()
+    provider.add_window(3, 300, "Gone.exe")
+    del provider.processes[300]
+    tracker = WindowTracker(provider, min_interval=0)
+    provider.focus(3)
+    failed = tracker.current()
+    provider.processes[300] = "Gone.exe"
+    recovered = tracker.current()
+
+    # Without pywin32 the default tracker reports the missing dependency
+    platform_ok = (create_window_provider() is not None
+                   or WindowTracker().current() is NO_PROVIDER_WINDOW)
+
+    ok = failed.exe_name == "unknown" and recovered.exe_name == "gone.exe" and platform_ok
+    print(f"{'✓' if ok else '✗'} Errors and missing provider")
+    return ok
+
+
+def main():
+    print("Testing window tracker...\n")
+    results = [
+        test_polling_throttle(),
+        test_pid_cache(),
+        test_pid_reuse(),
+        test_title_changes(),
+        test_event_driven(),
+        test_errors_and_missing_provider(),
+    ]
+    if all(results):
+        print("\n✓ All window tracker tests passed!")
+    else:
+        print("\n✗ Some window tracker tests failed.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
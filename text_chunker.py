@@ -0,0 +1,113 @@
+"""
+Sentence-aware chunking of OCR text for translation.
+
+The text is scanned once, left to right, and split after sentence-ending
+punctuation (kept with its sentence, together with any closing quotes or
+brackets that follow it) and at line breaks. An ASCII period only ends a
+sentence before whitespace or the end of the text, so "3.14" and "Ver.2"
+stay whole. Sentences are then packed into
+chunks up to a token budget for the translation model, and chunks are
+yielded as soon as they are complete, so the first one can be translated
+while the rest of the text is still being split.
+
+Token counts are estimated for the Qwen 2.5 tokenizer used by the translator
+model: roughly one token per CJK character and one per four characters of
+other text. The estimate errs on the high side, so chunks stay within the
+budget.
+"""
+
+DEFAULT_MAX_TOKENS = 256
+
+_SENTENCE_ENDINGS = frozenset('。！？!?.…‥')
+_PERIOD = '.'  # also used inside numbers, versions and abbreviations
+_CLOSING = frozenset('」』）)]】〉》"\'”’')
+
+
+def _is_cjk(char):
+    code = ord(char)
+    return (0x3000 <= code <= 0x30FF      # CJK punctuation, hiragana, katakana
+            or 0x3400 <= code <= 0x9FFF   # CJK ideographs
+            or 0xFF00 <= code <= 0xFFEF)  # full-width forms
+
+
+def estimate_tokens(text):
+    """Approximate token count of text for the Qwen translator model"""
+    cjk = sum(1 for char in text if _is_cjk(char))
+    other = len(text) - cjk
+    return cjk + (other + 3) // 4
+
+
+def iter_sentences(text):
+    """
+    Yield sentences of text in order, in linear time. Each sentence keeps its
+    ending punctuation and closing quotes; line breaks also end a sentence.
+    Joining the sentences gives back the original text.
+    """
+    start = 0
+    i = 0
+    length = len(text)
+    while i < length:
+        char = text[i]
+        if char == '\n':
+            yield text[start:i + 1]
+            start = i = i + 1
+            continue
+        if char in _SENTENCE_ENDINGS:
+            # Take the whole run of enders ("！？", "…") and any closing quotes
+            end = i + 1
+            periods_only = char == _PERIOD
+            while end < length and text[end] in _SENTENCE_ENDINGS:
+                periods_only = periods_only and text[end] == _PERIOD
+                end += 1
+            while end < length and text[end] in _CLOSING:
+                end += 1
+            if not periods_only or end == length or text[end].isspace():
+                yield text[start:end]
+                start = i = end
+                continue
+        i += 1
+    if start < length:
+        yield text[start:]
+
+
+def _split_long(sentence, max_tokens, count_tokens):
+    """Hard-split a sentence that alone exceeds the budget (character by character, linear)"""
+    piece_start, used = 0, 0
+    for i, char in enumerate(sentence):
+        cost = count_tokens(char)
+        if used + cost > max_tokens and i > piece_start:
+            yield sentence[piece_start:i]
+            piece_start, used = i, 0
+        used += cost
+    if piece_start < len(sentence):
+        yield sentence[piece_start:]
+
+
+def iter_chunks(text, max_tokens=DEFAULT_MAX_TOKENS, count_tokens=estimate_tokens):
+    """
+    Lazily yield stripped, non-empty chunks of whole sentences, each within
+    max_tokens (a single sentence longer than that is split inside).
+    """
+    pieces, used = [], 0
+
+    for sentence in iter_sentences(text):
+        cost = count_tokens(sentence)
+
+        if cost > max_tokens:
+            parts = list(_split_long(sentence, max_tokens, count_tokens))
+        else:
+            parts = [sentence]
+
+        for part in parts:
+            part_cost = cost if len(parts) == 1 else count_tokens(part)
+            if pieces and used + part_cost > max_tokens:
+                chunk = ''.join(pieces).strip()
+                if chunk:
+                    yield chunk
+                pieces, used = [], 0
+            pieces.append(part)
+            used += part_cost
+
+    chunk = ''.join(pieces).strip()
+    if chunk:
+        yield chunk
@@ -0,0 +1,105 @@
+"""
+OCR text normalization engine shared by every entry point.
+
+All patterns are compiled once at import. Compared with the original
+per-call implementations this also fuses passes that cannot change the
+result when merged:
+- the early "collapse 2+ spaces" pass is dropped, the later whitespace passes
+  remove or collapse the same runs
+- "strip spaces after punctuation" and "strip spaces before punctuation"
+  become one pass
+- the two "limit repeated punctuation" passes become one pass
+The punctuation fix table stays an ordered sequence of replacements: its rules
+chain (e.g. '？！' -> '！？' can create the '？』' that the next rule rewrites),
+so applying them in a single simultaneous pass would change the output.
+"""
+
+import re
+
+_KANA = r'\u3041-\u3096\u30A1-\u30FA'
+_CJK = _KANA + r'\u4E00-\u9FFF'
+
+# Full OCR post-processing (used for translator input)
+_TRAILING_KANA_RE = re.compile(rf'\s*[{_KANA}]{{1,2}}\s*$')
+_LEADING_KANA_RE = re.compile(rf'^\s*[{_KANA}]{{1,2}}\s*')
+_REPEATED_SYMBOLS_RE = re.compile(r'[\uFF5E\u301C\u2026\u2025]{2,}')
+_BROKEN_LINE_RE = re.compile(rf'(?<=[{_CJK}])\n(?=[{_CJK}])')
+_PUNCTUATION_SPACING_RE = re.compile(r'\s*([、。！？])\s*')
+_REPEATED_PUNCTUATION_RE = re.compile(r'([、。！？])\1{2,}')
+_WHITESPACE_RE = re.compile(r'\s+')
+_SENTENCE_BOUNDARY_RE = re.compile(rf'([。！？])([{_CJK}])')
+
+# Ordered: later rules see the output of earlier ones.
+# ('……' is not listed: _REPEATED_SYMBOLS_RE has already removed every run of '…')
+_PUNCTUATION_FIXES = (
+    ('？！', '！？'),
+    ('？』', '！？'),
+    ('?!', '！？'),
+    ('!?', '！？'),
+    ('。、', '、'),
+    ('、。', '。'),
+)
+
+# Light clean-up (meaning-preserving fixes only)
+_LIGHT_FIXES = (
+    ("．．．", "・・・"),
+    ("...", "・・・"),
+    ("？！」", "！？"),
+    ("？」", "！？"),
+    ("?!", "！？"),
+    ("!?", "！？"),
+    ("»", ""),
+    ("«", ""),
+)
+
+
+def normalize_for_translation(text: str) -> str:
+    """
+    Critical OCR post-processing to clean manga-style artifacts while preserving meaning.
+    Handles OCR noise, punctuation normalization, and text structure preservation.
+    """
+    if not text:
+        return text
+
+    # Remove trailing/leading single kana characters (common OCR artifacts)
+    text = _TRAILING_KANA_RE.sub(' ', text)
+    text = _LEADING_KANA_RE.sub(' ', text)
+
+    # Remove repeated symbols and noise
+    text = _REPEATED_SYMBOLS_RE.sub(' ', text)
+
+    # Normalize punctuation
+    for bad, good in _PUNCTUATION_FIXES:
+        if bad in text:
+            text = text.replace(bad, good)
+
+    # Remove line breaks within sentences
+    text = _BROKEN_LINE_RE.sub('', text)
+
+    # Remove spaces around Japanese punctuation
+    text = _PUNCTUATION_SPACING_RE.sub(r'\1', text)
+
+    # Limit to 2 consecutive identical punctuation marks
+    text = _REPEATED_PUNCTUATION_RE.sub(r'\1\1', text)
+
+    # Normalize internal spacing
+    text = _WHITESPACE_RE.sub(' ', text).strip()
+
+    # Ensure proper sentence boundaries
+    text = _SENTENCE_BOUNDARY_RE.sub(r'\1 \2', text)
+
+    return text.strip()
+
+
+def normalize_light(text: str) -> str:
+    """
+    Fix OCR artifacts WITHOUT changing Japanese meaning or structure.
+    Safe for translators (LLMs, NMT, etc).
+    """
+    # Plain replace loop: for short OCR lines it beats a str.translate() pass
+    for bad, good in _LIGHT_FIXES:
+        if bad in text:
+            text = text.replace(bad, good)
+
+    # Remove accidental spaces inside JP sentences
+    return text.replace("  ", " ").strip()
@@ -0,0 +1,273 @@
+"""
+Persistent translation cache.
+
+Translations are keyed by the normalized Japanese source text, the model name
+and the prompt version. Recent entries live in an in-memory LRU; every entry is
+also written to a small SQLite database so the cache survives restarts.
+
+On an exact miss, get_similar() consults a fuzzy translation memory (one per
+model / prompt version) that finds near-duplicate source lines, e.g. the same
+line with one kana misread.
+
+The in-memory LRU and fuzzy memories are partitioned per game executable
+(set_game). Each game's rows are tagged in SQLite, so switching back to a
+game loads its partition from disk in the background, and only the most
+recently played games stay in memory.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+
+from cache_partitions import NO_GAME, GamePartitions
+from translation_memory import TranslationMemory
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_source_text(text):
+    """Normalize source text so trivially different OCR results share a key"""
+    text = unicodedata.normalize('NFKC', text)
+    return _WHITESPACE_RE.sub(' ', text).strip()
+
+
+class _TranslationPartition:
+    """One game's in-memory LRU and fuzzy translation memories"""
+
+    def __init__(self):
+        self.memory = OrderedDict()
+        self.translation_memories = {}  # (model, prompt version) -> TranslationMemory
+
+
+class TranslationCache:
+    """In-memory LRU cache of translations backed by SQLite, partitioned per game"""
+
+    def __init__(self, db_path="translation_cache.sqlite3", max_entries=2000, fuzzy_threshold=0.85,
+                 max_games=4):
+        """
+        max_entries: LRU size of each game partition
+        max_games: game partitions kept in memory
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.fuzzy_threshold = fuzzy_threshold
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.fuzzy_hits = 0
+        self.misses = 0
+        self.conn = None
+        self._open_db()
+        self.partitions = GamePartitions(_TranslationPartition, loader=self._load_partition,
+                                         max_games=max_games)
+        self.partitions.activate(NO_GAME)
+
+    def _open_db(self):
+        """Open (or create) the on-disk store; fall back to memory-only on failure"""
+        if not self.db_path:
+            return
+        try:
+            directory = os.path.dirname(self.db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            columns = [row[1] for row in self.conn.execute("PRAGMA table_info(translations)")]
+            if columns and "game" not in columns:
+                # Caches from before per-game partitions: keep their rows under NO_GAME
+                self.conn.execute("ALTER TABLE translations RENAME TO translations_old")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT, game TEXT, source TEXT, model TEXT, "
+                "prompt_version TEXT, translation TEXT, PRIMARY KEY (key, game))"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS translations_game ON translations (game)")
+            if columns and "game" not in columns:
+                self.conn.execute(
+                    "INSERT INTO translations SELECT key, ?, source, model, prompt_version, translation "
+                    "FROM translations_old", (NO_GAME,)
+                )
+                self.conn.execute("DROP TABLE translations_old")
+            self.conn.commit()
+        except sqlite3.Error as e:
+            print(f"Translation cache disabled on disk: {e}")
+            self.conn = None
+
+    def _load_partition(self, game, partition):
+        """Fill a game's LRU and fuzzy memories from its stored rows (background thread)"""
+        with self.lock:
+            if self.conn is None:
+                return
+            try:
+                rows = self.conn.execute(
+                    "SELECT key, source, model, prompt_version, translation FROM translations "
+                    "WHERE game = ? ORDER BY rowid", (game,)
+                ).fetchall()
+            except sqlite3.Error as e:
+                print(f"Translation cache partition load failed: {e}")
+                return
+
+        for key, source, model, prompt_version, translation in rows:
+            with self.lock:
+                # Entries added since the switch are newer than anything on disk
+                if key in partition.memory:
+                    continue
+            self._translation_memory(model, prompt_version, partition).add(source, translation)
+        with self.lock:
+            # Newest first, each in front of the entries added since the switch
+            for key, _, _, _, translation in reversed(rows[-self.max_entries:]):
+                if key not in partition.memory:
+                    partition.memory[key] = translation
+                    partition.memory.move_to_end(key, last=False)
+            while len(partition.memory) > self.max_entries:
+                partition.memory.popitem(last=False)
+
+    def set_game(self, game):
+        """Switch to a game's partition, loading it from disk in the background if needed"""
+        self.partitions.activate(game or NO_GAME)
+
+    @property
+    def game(self):
+        return self.partitions.game
+
+    def wait_ready(self, timeout=None):
+        """Block until the current game's partition has been loaded"""
+        return self.partitions.wait_ready(timeout)
+
+    def _translation_memory(self, model, prompt_version, partition=None):
+        """The fuzzy index for a model / prompt version (created on first use)"""
+        key = (model, str(prompt_version))
+        with self.lock:
+            memories = (partition or self.partitions.active).translation_memories
+            memory = memories.get(key)
+            if memory is None:
+                memory = memories[key] = TranslationMemory(self.fuzzy_threshold)
+            return memory
+
+    @staticmethod
+    def make_key(text, model, prompt_version):
+        """Build the cache key for a source text / model / prompt combination"""
+        raw = "\x1f".join([normalize_source_text(text), model, str(prompt_version)])
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _remember(self, memory, key, translation):
+        """Insert into an LRU, evicting the least recently used entry if full"""
+        memory[key] = translation
+        memory.move_to_end(key)
+        while len(memory) > self.max_entries:
+            memory.popitem(last=False)
+
+    def get(self, text, model, prompt_version):
+        """Return the cached translation or None"""
+        key = self.make_key(text, model, prompt_version)
+        with self.lock:
+            game, partition = self.partitions.game, self.partitions.active
+            translation = partition.memory.get(key)
+            if translation is not None:
+                partition.memory.move_to_end(key)
+                self.hits += 1
+                return translation
+
+            if self.conn is not None:
+                try:
+                    # Prefer this game's row; a line first seen in another game is copied over
+                    row = self.conn.execute(
+                        "SELECT translation, source, game FROM translations WHERE key = ? "
+                        "ORDER BY game = ? DESC LIMIT 1", (key, game)
+                    ).fetchone()
+                    if row is not None and row[2] != game:
+                        self.conn.execute(
+                            "INSERT OR IGNORE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                            (key, game, row[1], model, str(prompt_version), row[0])
+                        )
+                        self.conn.commit()
+                except sqlite3.Error as e:
+                    print(f"Translation cache read failed: {e}")
+                    row = None
+                if row is not None:
+                    self._remember(partition.memory, key, row[0])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return row[0]
+
+            self.misses += 1
+            return None
+
+    def get_similar(self, text, model, prompt_version):
+        """
+        Return (translation, similarity, matched source) of the most similar
+        previously translated line of the current game, or None. Use after get() missed.
+        """
+        match = self._translation_memory(model, prompt_version).lookup(normalize_source_text(text))
+        if match is not None:
+            with self.lock:
+                self.fuzzy_hits += 1
+        return match
+
+    def put(self, text, model, prompt_version, translation):
+        """Store a translation in memory and on disk"""
+        key = self.make_key(text, model, prompt_version)
+        self._translation_memory(model, prompt_version).add(normalize_source_text(text), translation)
+        with self.lock:
+            self._remember(self.partitions.active.memory, key, translation)
+            if self.conn is not None:
+                try:
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                        (key, self.partitions.game, normalize_source_text(text), model,
+                         str(prompt_version), translation)
+                    )
+                    self.conn.commit()
+                except sqlite3.Error as e:
+                    print(f"Translation cache write failed: {e}")
+
+    def clear(self):
+        """Drop every cached translation of every game, in memory and on disk"""
+        partitions = self.partitions.items()
+        with self.lock:
+            for _, partition in partitions:
+                partition.memory.clear()
+                for translation_memory in partition.translation_memories.values():
+                    translation_memory.clear()
+            self.hits = self.disk_hits = self.fuzzy_hits = self.misses = 0
+            if self.conn is not None:
+                try:
+                    self.conn.execute("DELETE FROM translations")
+                    self.conn.commit()
+                except sqlite3.Error as e:
+                    print(f"Translation cache clear failed: {e}")
+
+    def stats(self):
+        """Hit/miss counters and sizes for display"""
+        with self.lock:
+            partition = self.partitions.active
+            lookups = self.hits + self.misses
+            stored = len(partition.memory)
+            if self.conn is not None:
+                try:
+                    stored = self.conn.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "fuzzy_hits": self.fuzzy_hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "game": self.partitions.game,
+                "loaded_games": len(self.partitions),
+                "memory_entries": len(partition.memory),
+                "fuzzy_index_entries": sum(len(m) for m in partition.translation_memories.values()),
+                "stored_entries": stored,
+            }
+
+    def close(self):
+        """Close the SQLite connection"""
+        self.partitions.wait_idle()
+        with self.lock:
+            if self.conn is not None:
+                self.conn.close()
+                self.conn = None
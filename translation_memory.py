@@ -0,0 +1,178 @@
+"""
+Fuzzy translation memory for near-duplicate OCR lines.
+
+OCR noise often returns a known line with one kana different, which an
+exact-match cache misses. TranslationMemory indexes every translated source
+line with MinHash signatures over character bigrams and banded LSH buckets:
+
+- a lookup hashes the line once and only looks at entries that share at
+  least one LSH band with it (a handful, whatever the size of the memory)
+- one substituted character changes most bigrams of a short line, so lines
+  that may differ by a single substitution are also indexed by each of
+  their one-character wildcards ("好き*す"), which finds them exactly
+- candidates are verified position by position: only lines of the same
+  length, differing by substituted characters (misreads) in at most
+  (1 - threshold) of the positions, and always allowing one, are accepted.
+  Inserted or dropped characters ("好きです" / "好きですか") usually change
+  the meaning, so they never match
+
+With 32 hashes in 8 bands of 4, lines with ~80% bigram overlap collide in
+some band with ~98% probability, and lookups stay sub-millisecond for
+hundreds of thousands of lines.
+"""
+
+import threading
+
+import numpy as np
+
+_MAX_HASH = (1 << 32) - 1
+_WILDCARD = "\x00"
+
+
+def bigrams(text):
+    """Set of character bigrams (the whole text for one-character lines)"""
+    if len(text) < 2:
+        return {text}
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def wildcards(text):
+    """The text with each position in turn replaced by a wildcard"""
+    return [text[:i] + _WILDCARD + text[i + 1:] for i in range(len(text))]
+
+
+class TranslationMemory:
+    """MinHash/LSH index of (source line -> translation) with similarity-checked lookups"""
+
+    def __init__(self, threshold=0.85, num_perm=32, bands=8, min_length=4, max_candidates=32, seed=1):
+        """
+        threshold: minimum share (0-1) of identical characters, position by position;
+            one substitution is always allowed
+        num_perm: MinHash signature length; must be divisible by bands
+        bands: LSH bands (more bands = more candidates, higher recall)
+        min_length: shorter lines only match exactly (one kana matters there)
+        max_candidates: most candidates verified per lookup
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.min_length = min_length
+        self.max_candidates = max_candidates
+
+        # Multiply-shift hash family: h_i(x) = high 32 bits of (a_i * x + b_i) mod 2**64
+        rng = np.random.default_rng(seed)
+        self.multipliers = (rng.integers(1, 1 << 63, size=(num_perm, 1), dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+        self.offsets = rng.integers(0, 1 << 63, size=(num_perm, 1), dtype=np.uint64)
+
+        self.sources = []        # entry id -> source text
+        self.translations = []   # entry id -> translation
+        self.ids = {}            # source text -> entry id
+        self.buckets = [{} for _ in range(bands)]  # band -> {band signature: [entry ids]}
+        self.wildcard_ids = {}   # one-character wildcard of a short line -> [entry ids]
+        self.lock = threading.Lock()
+        self.lookups = 0
+        self.fuzzy_hits = 0
+
+    def __len__(self):
+        return len(self.sources)
+
+    def signature(self, text):
+        """MinHash signature (num_perm uint64 values) of the text's character bigrams"""
+        grams = bigrams(text)
+        # hash() of str is salted per process; fine, the index lives in memory only
+        hashes = np.fromiter((hash(gram) & _MAX_HASH for gram in grams), dtype=np.uint64, count=len(grams))
+        # (num_perm, grams) hash matrix in one vectorized pass; uint64 arithmetic wraps mod 2**64
+        return ((self.multipliers * hashes + self.offsets) >> np.uint64(32)).min(axis=1)
+
+    def _band_keys(self, signature):
+        """One hashable key per LSH band"""
+        return [band.tobytes() for band in signature.reshape(self.bands, self.rows)]
+
+    def max_substitutions(self, length):
+        """Characters a line of this length may differ by and still match"""
+        return max(1, int((1 - self.threshold) * length + 1e-9))
+
+    def add(self, source, translation):
+        """Index a translated line (re-adding a source updates its translation)"""
+        with self.lock:
+            entry = self.ids.get(source)
+            if entry is not None:
+                self.translations[entry] = translation
+                return
+
+            entry = len(self.sources)
+            self.sources.append(source)
+            self.translations.append(translation)
+            self.ids[source] = entry
+
+        if len(source) < self.min_length:
+            return
+        keys = self._band_keys(self.signature(source))
+        single = self.max_substitutions(len(source)) == 1
+        with self.lock:
+            if self.ids.get(source) != entry:
+                return  # cleared meanwhile
+            for band, key in enumerate(keys):
+                self.buckets[band].setdefault(key, []).append(entry)
+            if single:
+                for key in wildcards(source):
+                    self.wildcard_ids.setdefault(key, []).append(entry)
+
+    def lookup(self, source):
+        """
+        Return (translation, similarity, matched source) for the most similar
+        stored line within max_substitutions(len(source)) misread characters,
+        or None.
+        """
+        with self.lock:
+            self.lookups += 1
+            entry = self.ids.get(source)
+            if entry is not None:
+                return self.translations[entry], 1.0, source
+
+        if len(source) < self.min_length:
+            return None
+
+        length = len(source)
+        max_substitutions = self.max_substitutions(length)
+        keys = self._band_keys(self.signature(source))
+        votes = {}
+        with self.lock:
+            if max_substitutions == 1:
+                for key in wildcards(source):
+                    for candidate in self.wildcard_ids.get(key, ()):
+                        votes[candidate] = self.bands + 1  # a one-substitution neighbour
+            for band, key in enumerate(keys):
+                for candidate in self.buckets[band].get(key, ()):
+                    votes[candidate] = votes.get(candidate, 0) + 1
+            # Most band collisions first; they are the most likely to be similar.
+            # Copied under the lock: clear() may empty the entries at any time
+            candidates = [(self.sources[candidate], self.translations[candidate])
+                          for candidate in sorted(votes, key=votes.get, reverse=True)[:self.max_candidates]]
+
+        best, best_same = None, length - max_substitutions
+        for other, translation in candidates:
+            if len(other) != length:
+                continue
+            same = sum(1 for a, b in zip(source, other) if a == b)
+            if same >= best_same:
+                best, best_same = (translation, other), same
+
+        if best is None:
+            return None
+        with self.lock:
+            self.fuzzy_hits += 1
+        return best[0], best_same / length, best[1]
+
+    def clear(self):
+        with self.lock:
+            self.sources.clear()
+            self.translations.clear()
+            self.ids.clear()
+            for bucket in self.buckets:
+                bucket.clear()
+            self.wildcard_ids.clear()
+            self.lookups = self.fuzzy_hits = 0
@@ -0,0 +1,180 @@
+"""
+Single-worker translation scheduler.
+
+OCR can produce text faster than the LLM translates it. Instead of one thread
+per request, every translation goes through this scheduler: a bounded queue
+drained by one worker thread, so results come back in submission order. New
+text from a source (e.g. a screen region) cancels that source's queued and
+in-flight requests, so stale lines never overwrite fresh ones.
+
+With a batch_handler, the worker hands up to max_batch queued requests to
+the handler at once, so several dialogue lines can share one LLM call. A
+request that is alone in the queue is sent right away; only while a burst is
+arriving does the worker wait, up to batch_window seconds per gap, for the
+next line.
+"""
+
+import itertools
+import threading
+import time
+from collections import deque
+
+
+class TranslationRequest:
+    """One piece of text waiting to be translated"""
+
+    def __init__(self, seq, source, text, part=0):
+        self.seq = seq
+        self.source = source
+        self.text = text
+        self.part = part
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        """Mark the request obsolete; handlers should stop and discard their result"""
+        self._cancelled.set()
+
+    def is_cancelled(self):
+        return self._cancelled.is_set()
+
+
+class TranslationScheduler:
+    """Bounded FIFO of translation requests processed by one worker thread"""
+
+    def __init__(self, handler, max_pending=8, batch_handler=None, batch_window=0.15, max_batch=1):
+        """
+        handler: called as handler(request) on the worker thread
+        max_pending: queued requests kept; beyond this the oldest submissions
+            (all their parts) are dropped
+        batch_handler: called as batch_handler([request, ...]) when more than
+            one request was collected (max_batch > 1)
+        batch_window: longest gap between requests of one burst before the
+            batch is sent
+        max_batch: most requests per batch (1 disables batching)
+        """
+        self.handler = handler
+        self.max_pending = max_pending
+        self.batch_handler = batch_handler
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.pending = deque()
+        self.in_flight = []
+        self.condition = threading.Condition()
+        self.sequence = itertools.count(1)
+        self.running = True
+        self.dropped = 0
+        self.completed = 0
+
+        self.worker = threading.Thread(target=self._run, daemon=True)
+        self.worker.start()
+
+    def submit(self, text, source="default", part=0):
+        """
+        Queue text for translation and return the request.
+
+        part 0 starts a new submission for the source and cancels everything
+        still queued or running for it; later parts of the same submission
+        (long text split into chunks) are queued behind it.
+        """
+        with self.condition:
+            if part == 0:
+                self._cancel_source(source)
+
+            request = TranslationRequest(next(self.sequence), source, text, part)
+            self.pending.append(request)
+
+            # Drop whole submissions, oldest first: a line missing its first chunk is
+            # worse than no line. One submission longer than the queue is kept whole.
+            while len(self.pending) > self.max_pending:
+                oldest = next((queued for queued in self.pending if queued.source != source), None)
+                if oldest is None:
+                    break
+                self._cancel_source(oldest.source)
+
+            self.condition.notify()
+            return request
+
+    def _cancel_source(self, source):
+        """Cancel queued and in-flight requests from a source (lock held)"""
+        kept = deque()
+        for request in self.pending:
+            if request.source == source:
+                request.cancel()
+                self.dropped += 1
+            else:
+                kept.append(request)
+        self.pending = kept
+
+        for request in self.in_flight:
+            if request.source == source and not request.is_cancelled():
+                request.cancel()
+                self.dropped += 1
+
+    def cancel_all(self):
+        """Cancel every queued and in-flight request"""
+        with self.condition:
+            for request in self.pending:
+                request.cancel()
+            self.dropped += len(self.pending)
+            self.pending.clear()
+            for request in self.in_flight:
+                request.cancel()
+
+    def stop(self):
+        """Cancel everything and stop the worker thread"""
+        self.cancel_all()
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+
+    def queue_depth(self):
+        with self.condition:
+            return len(self.pending)
+
+    def _collect_batch(self):
+        """Take the next request plus the rest of its burst (lock held)"""
+        batch = [self.pending.popleft()]
+        if self.batch_handler is None or self.max_batch <= 1:
+            return batch
+
+        while self.running and len(batch) < self.max_batch:
+            if self.pending:
+                batch.append(self.pending.popleft())
+                continue
+            if len(batch) == 1:
+                # Nothing else queued (e.g. a single Re-OCR): don't delay it
+                break
+            # Mid-burst: give the next line up to batch_window to arrive
+            deadline = time.monotonic() + self.batch_window
+            while self.running and not self.pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self.condition.wait(remaining)
+            if not self.pending:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                batch = self._collect_batch()
+                self.in_flight = batch
+
+            try:
+                # Requests cancelled while the batch was collected are simply left out
+                live = [request for request in batch if not request.is_cancelled()]
+                if len(live) == 1:
+                    self.handler(live[0])
+                elif live:
+                    self.batch_handler(live)
+                self.completed += len(live)
+            except Exception as e:
+                print(f"Translation request failed: {e}")
+            finally:
+                with self.condition:
+                    self.in_flight = []
@@ -1,16 +1,21 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox, filedialog
-import ollama
 import pyperclip
 import threading
+import time
 import re
-import pyautogui
-import cv2
-import numpy as np
 from PIL import Image
-from manga_ocr import MangaOcr
+from ocr_engine import get_ocr_engine
 import json
 import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from perf_trace import get_tracer, traced
+from screen_capture import get_capture_backend
+from translation_cache import TranslationCache
+from translation_scheduler import TranslationScheduler
+from translator_backend import BATCH_PROMPT_VERSION, OllamaTranslator, PROMPT_VERSION
+from text_normalizer import normalize_for_translation
 
 class ScreenTranslatorApp:
     def __init__(self, root):
@@ -19,8 +24,8 @@ class ScreenTranslatorApp:
         self.root.geometry("900x700")
         self.root.resizable(True, True)
         
-        # Initialize MangaOCR
-        self.manga_ocr = None
+        # Initialize MangaOCR (loads in the background, shared with other windows)
+        self.ocr_engine = None
         self.initialize_ocr()
         
         # Configure style
@@ -31,98 +36,87 @@ class ScreenTranslatorApp:
         self.last_region = None
         self.ocr_running = False
         
+        # Persistent Ollama client; preload the model so the first line is fast
+        self.translator = OllamaTranslator()
+        threading.Thread(target=self.translator.warm_up, daemon=True).start()
+        
+        # Translation cache (memory LRU + SQLite)
+        self.translation_cache = TranslationCache()
+        
+        # Near-duplicate OCR lines reuse the closest cached translation; optionally
+        # re-translated in the background so the cache gets the exact answer
+        self.fuzzy_translation_var = tk.BooleanVar(value=True)
+        self.confirm_fuzzy_var = tk.BooleanVar(value=True)
+        self.confirm_executor = ThreadPoolExecutor(max_workers=1)
+        
+        # Stream translated tokens into the output pane as they arrive
+        self.stream_translation_var = tk.BooleanVar(value=True)
+        
+        # Lines that arrive together share one LLM call, with recent lines as context
+        self.batch_translation_var = tk.BooleanVar(value=True)
+        self.translation_context = deque(maxlen=6)  # (japanese, english) pairs
+        
+        # All OCR translations go through one worker with a bounded queue
+        self.translation_scheduler = TranslationScheduler(
+            self._run_ocr_translation,
+            batch_handler=self._run_batched_ocr_translation,
+            max_batch=8
+        )
+        
         self.setup_ui()
         
     def initialize_ocr(self):
-        """Initialize MangaOCR with error handling"""
-        try:
-            self.manga_ocr = MangaOcr()
-            print("✓ MangaOCR initialized successfully")
-        except Exception as e:
-            print(f"❌ Failed to initialize MangaOCR: {e}")
-            self.manga_ocr = None
+        """Start loading MangaOCR in the background; the UI is usable immediately"""
+        self.ocr_engine = get_ocr_engine()
+        self.ocr_engine.start()
+        self.ocr_engine.add_ready_callback(
+            lambda error: self.root.after(0, self.on_ocr_model_ready, error)
+        )
+        
+    def on_ocr_model_ready(self, error):
+        """Reflect the result of a (re)load of the OCR model in the UI"""
+        if error is None:
+            self.ocr_status_var.set("Ready")
+            self.ocr_status_label.config(foreground="green")
+            self.status_var.set("OCR model loaded")
+            self.update_cache_stats()
+        else:
+            self.ocr_status_var.set("Failed")
+            self.ocr_status_label.config(foreground="red")
+            self.status_var.set(f"Failed to load OCR model: {error}")
             
     def normalize_for_translation(self, text: str) -> str:
         """
         Critical OCR post-processing to clean manga-style artifacts while preserving meaning.
-        Handles OCR noise, punctuation normalization, and text structure preservation.
+        Delegates to the shared, precompiled engine in text_normalizer.
         """
-        if not text:
-            return text
-            
-        # Remove stray characters and OCR noise
-        import re
-        # Remove trailing/leading single kana characters (common OCR artifacts)
-        text = re.sub(r'[\u3000\s]*[\u3041-\u3096\u30A1-\u30FA]{1,2}[\u3000\s]*$', ' ', text)
-        text = re.sub(r'^[\u3000\s]*[\u3041-\u3096\u30A1-\u30FA]{1,2}[\u3000\s]*', ' ', text)
-            
-        # Remove repeated symbols and noise
-        text = re.sub(r'[\uFF5E\u301C\u2026\u2025]{2,}', ' ', text)
-        text = re.sub(r'[\u3000\s]{2,}', ' ', text)
-            
-        # Normalize punctuation
-        punctuation_fixes = {
-            '……': '・・・',
-            '。。': '。。',
-            '、、': '、、',
-            '？！': '！？',
-            '？』': '！？',
-            '?!' : '！？',
-            '!?' : '！？',
-            '。、': '、',
-            '、。': '。',
-        }
-            
-        for bad, good in punctuation_fixes.items():
-            text = text.replace(bad, good)
-            
-        # Fix broken line structures and merge split sentences
-        # Remove line breaks within sentences
-        text = re.sub(r'(?<=[\u3041-\u3096\u30A1-\u30FA\u4E00-\u9FFF])\n(?=[\u3041-\u3096\u30A1-\u30FA\u4E00-\u9FFF])', '', text)
-            
-        # Normalize Japanese punctuation spacing
-        text = re.sub(r'([、。！？])\s+', r'\1', text)  # Remove spaces after punctuation
-        text = re.sub(r'\s+([、。！？])', r'\1', text)  # Remove spaces before punctuation
-            
-        # Clean up multiple punctuation marks
-        text = re.sub(r'([。！？])\1{2,}', r'\1\1', text)  # Limit to 2 consecutive same punctuation
-        text = re.sub(r'([、])\1{2,}', r'\1\1', text)    # Limit to 2 consecutive commas
-            
-        # Remove leading/trailing whitespace and normalize internal spacing
-        text = re.sub(r'\s+', ' ', text).strip()
-            
-        # Ensure proper sentence boundaries
-        text = re.sub(r'([。！？])([\u3041-\u3096\u30A1-\u30FA\u4E00-\u9FFF])', r'\1 \2', text)
-            
-        return text.strip()
+        with get_tracer().span("normalize"):
+            return normalize_for_translation(text)
         
     def extract_japanese_text(self, region):
         """
         MangaOCR-based extraction with critical post-processing for clean output.
         Handles both vertical manga text and horizontal game text.
         """
-        if not self.manga_ocr:
+        if self.ocr_engine.has_failed():
             return "OCR not available - MangaOCR failed to initialize"
             
         try:
-            # Capture screen region
-            screenshot = pyautogui.screenshot(region=region)
-            img = cv2.cvtColor(np.array(screenshot), cv2.COLOR_RGB2BGR)
-            
-            # Save temp image for MangaOCR
-            temp_path = "_ocr_tmp.png"
-            cv2.imwrite(temp_path, img)
-            
-            # Extract raw text
-            raw_text = self.manga_ocr(temp_path)
+            # Capture screen region (kept in memory as a PIL image)
+            tracer = get_tracer()
+            with tracer.span("capture"):
+                screenshot = get_capture_backend().grab(region)
+            
+            # Extract raw text through the shared engine - MangaOCR accepts PIL
+            # images directly and repeated captures come from the OCR cache
+            # (waits here if the model is still loading)
+            with tracer.span("ocr"):
+                raw_text = self.ocr_engine.recognize(screenshot)
+            self.root.after(0, self.update_cache_stats)
             raw_text = raw_text.strip()
             
             # Apply critical post-processing
             processed_text = self.normalize_for_translation(raw_text)
-            
-            # Clean up temp file
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
                 
             return processed_text
             
@@ -260,10 +254,19 @@ class ScreenTranslatorApp:
         
         ttk.Label(model_status_frame, text="OCR Model Status:", font=("Arial", 10, "bold")).pack(anchor=tk.W)
         
-        self.ocr_status_var = tk.StringVar(value="Initializing..." if self.manga_ocr else "Not Available")
-        ocr_status_label = ttk.Label(model_status_frame, textvariable=self.ocr_status_var, 
-                                    foreground="green" if self.manga_ocr else "red")
-        ocr_status_label.pack(anchor=tk.W)
+        if self.ocr_engine.is_ready():
+            status, color = "Ready", "green"
+        elif self.ocr_engine.has_failed():
+            status, color = "Failed", "red"
+        else:
+            status, color = "Loading model...", "orange"
+        self.ocr_status_var = tk.StringVar(value=status)
+        self.ocr_status_label = ttk.Label(model_status_frame, textvariable=self.ocr_status_var, 
+                                         foreground=color)
+        self.ocr_status_label.pack(anchor=tk.W)
+        
+        self.ocr_engine_stats_var = tk.StringVar()
+        ttk.Label(model_status_frame, textvariable=self.ocr_engine_stats_var).pack(anchor=tk.W)
         
         # OCR Controls
         controls_frame = ttk.Frame(ocr_frame)
@@ -277,6 +280,79 @@ class ScreenTranslatorApp:
                                  command=self.test_ocr)
         test_ocr_btn.pack(side=tk.LEFT)
         
+        # Translation Settings Frame
+        translation_frame = ttk.LabelFrame(main_frame, text="Translation Settings", padding="10")
+        translation_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        stream_check = ttk.Checkbutton(translation_frame, text="Stream translation output as it is generated",
+                                      variable=self.stream_translation_var)
+        stream_check.pack(anchor=tk.W)
+        
+        batch_check = ttk.Checkbutton(translation_frame, 
+                                     text="Translate lines arriving together in one request (with dialogue context)",
+                                     variable=self.batch_translation_var,
+                                     command=self.update_batch_translation)
+        batch_check.pack(anchor=tk.W)
+        
+        fuzzy_check = ttk.Checkbutton(translation_frame,
+                                     text="Reuse translations of near-identical lines (fuzzy translation memory)",
+                                     variable=self.fuzzy_translation_var)
+        fuzzy_check.pack(anchor=tk.W)
+        
+        confirm_check = ttk.Checkbutton(translation_frame,
+                                       text="Re-translate fuzzy matches in the background to confirm them",
+                                       variable=self.confirm_fuzzy_var)
+        confirm_check.pack(anchor=tk.W)
+        
+        # Cache Frame
+        cache_frame = ttk.LabelFrame(main_frame, text="Caches", padding="10")
+        cache_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        self.cache_stats_var = tk.StringVar()
+        cache_stats_label = ttk.Label(cache_frame, textvariable=self.cache_stats_var, justify=tk.LEFT)
+        cache_stats_label.pack(anchor=tk.W)
+        
+        self.ocr_cache_stats_var = tk.StringVar()
+        ocr_cache_stats_label = ttk.Label(cache_frame, textvariable=self.ocr_cache_stats_var, justify=tk.LEFT)
+        ocr_cache_stats_label.pack(anchor=tk.W, pady=(5, 0))
+        
+        cache_controls_frame = ttk.Frame(cache_frame)
+        cache_controls_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        clear_cache_btn = ttk.Button(cache_controls_frame, text="🗑️ Clear Translation Cache", 
+                                    command=self.clear_translation_cache)
+        clear_cache_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
+        clear_ocr_cache_btn = ttk.Button(cache_controls_frame, text="🗑️ Clear OCR Cache", 
+                                        command=self.clear_ocr_cache)
+        clear_ocr_cache_btn.pack(side=tk.LEFT)
+        self.update_cache_stats()
+        
+        # Performance Frame
+        perf_frame = ttk.LabelFrame(main_frame, text="Performance (recent samples per stage)", padding="10")
+        perf_frame.pack(fill=tk.X, pady=(0, 20))
+        
+        self.perf_stats_var = tk.StringVar(value="No samples yet")
+        perf_stats_label = ttk.Label(perf_frame, textvariable=self.perf_stats_var, 
+                                    font=("Courier", 9), justify=tk.LEFT)
+        perf_stats_label.pack(anchor=tk.W)
+        
+        perf_controls_frame = ttk.Frame(perf_frame)
+        perf_controls_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        export_json_btn = ttk.Button(perf_controls_frame, text="📤 Export JSON", 
+                                    command=lambda: self.export_performance_trace(".json"))
+        export_json_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
+        export_csv_btn = ttk.Button(perf_controls_frame, text="📤 Export CSV", 
+                                   command=lambda: self.export_performance_trace(".csv"))
+        export_csv_btn.pack(side=tk.LEFT, padx=(0, 10))
+        
+        reset_perf_btn = ttk.Button(perf_controls_frame, text="🔄 Reset", 
+                                   command=self.reset_performance_trace)
+        reset_perf_btn.pack(side=tk.LEFT)
+        self.update_performance_panel()
+        
         # Information Section
         info_frame = ttk.LabelFrame(main_frame, text="Information", padding="10")
         info_frame.pack(fill=tk.X, pady=(0, 20))
@@ -325,26 +401,86 @@ class ScreenTranslatorApp:
         thread.daemon = True
         thread.start()
         
+    def cached_translation(self, text, prompt_version=PROMPT_VERSION):
+        """
+        Exact cache hit, or the translation of a near-identical cached line
+        (fuzzy translation memory), made with the given prompt version.
+        Returns None on a miss.
+        """
+        model = self.translator.model
+        cached = self.translation_cache.get(text, model, prompt_version)
+        if cached is not None or not self.fuzzy_translation_var.get():
+            return cached
+        
+        match = self.translation_cache.get_similar(text, model, prompt_version)
+        if match is None:
+            return None
+        translated_text, similarity, matched_source = match
+        print(f"Fuzzy translation match ({similarity:.0%}): {text!r} ~ {matched_source!r}")
+        if self.confirm_fuzzy_var.get():
+            self.confirm_executor.submit(self._confirm_fuzzy_translation, text, model)
+        return translated_text
+        
+    def _confirm_fuzzy_translation(self, text, model):
+        """Translate a fuzzy-matched line for real so its next lookup is an exact hit"""
+        try:
+            if self.translation_cache.get(text, model, PROMPT_VERSION) is None:
+                self.translation_cache.put(text, model, PROMPT_VERSION, self.translator.translate(text))
+        except Exception as e:
+            print(f"Fuzzy match confirmation failed: {e}")
+        
+    def translate_text(self, text_to_translate):
+        """Translate Japanese text with Ollama, answering repeats from the cache"""
+        model = self.translator.model
+        cached = self.cached_translation(text_to_translate)
+        if cached is not None:
+            self.root.after(0, self.update_cache_stats)
+            return cached
+        
+        # Call the Ollama model
+        translated_text = self.translator.translate(text_to_translate)
+        
+        self.translation_cache.put(text_to_translate, model, PROMPT_VERSION, translated_text)
+        self.root.after(0, self.update_cache_stats)
+        return translated_text
+        
+    def translate_text_stream(self, text_to_translate, on_chunk, should_stop=None):
+        """
+        Translate like translate_text, passing each streamed piece of the answer to on_chunk.
+        Returns None without caching if should_stop() turns true mid-stream.
+        """
+        model = self.translator.model
+        cached = self.cached_translation(text_to_translate)
+        if cached is not None:
+            self.root.after(0, self.update_cache_stats)
+            on_chunk(cached)
+            return cached
+        
+        stream = self.translator.translate_stream(text_to_translate)
+        
+        pieces = []
+        for piece in stream:
+            if should_stop is not None and should_stop():
+                stream.close()
+                return None
+            
+            # Drop the leading whitespace the model tends to emit before the answer
+            if not pieces:
+                piece = piece.lstrip()
+            if piece:
+                pieces.append(piece)
+                on_chunk(piece)
+        
+        translated_text = ''.join(pieces).strip()
+        self.translation_cache.put(text_to_translate, model, PROMPT_VERSION, translated_text)
+        self.root.after(0, self.update_cache_stats)
+        return translated_text
+        
     def perform_translation(self, text_to_translate, from_ocr=False):
         """Perform the actual translation using Ollama"""
         try:
-            # Prepare the prompt for the translator model
-            prompt = f"""Translate the following Japanese text to English. 
-            Only return the English translation without any additional commentary or explanation:
-
-            {text_to_translate}"""
-            
-            # Call the Ollama model
-            response = ollama.chat(
-                model='lauchacarro/qwen2.5-translator:latest',
-                messages=[{'role': 'user', 'content': prompt}]
-            )
-            
-            # Extract the translated text
-            if hasattr(response, 'message'):
-                translated_text = response.message.content.strip()
-            else:
-                translated_text = response['message']['content'].strip()
+            with get_tracer().span("translate"):
+                translated_text = self.translate_text(text_to_translate)
             
             # Update the UI in the main thread
             if from_ocr:
@@ -487,11 +623,14 @@ class ScreenTranslatorApp:
             messagebox.showwarning("Warning", "Please select an OCR region first.")
             return
             
-        if not self.manga_ocr:
+        if self.ocr_engine.has_failed():
             messagebox.showerror("Error", "OCR model not available. Check settings.")
             return
             
-        self.status_var.set("Extracting and processing OCR...")
+        if self.ocr_engine.is_loading():
+            self.status_var.set("OCR model loading - request queued...")
+        else:
+            self.status_var.set("Extracting and processing OCR...")
         
         # Run OCR in separate thread
         thread = threading.Thread(target=self._run_ocr_extraction)
@@ -506,6 +645,7 @@ class ScreenTranslatorApp:
         except Exception as e:
             self.root.after(0, self.ocr_extraction_error, str(e))
             
+    @traced("ui_update")
     def update_ocr_output(self, processed_text):
         """Update OCR output with processed text"""
         self.ocr_output_text.delete(1.0, tk.END)
@@ -526,41 +666,159 @@ class ScreenTranslatorApp:
             
         self.status_var.set("Translating processed OCR text...")
         
-        # Run translation in separate thread
-        thread = threading.Thread(target=self._run_ocr_translation, args=(processed_text,))
-        thread.daemon = True
-        thread.start()
+        # Queue on the translation scheduler (one worker, newest text wins)
+        self.translation_scheduler.submit(processed_text, source="manual")
+        
+    def submit_ocr_text(self, text, source="default", part=0):
+        """
+        Show OCR text and queue it for translation (safe to call from any thread).
+        part > 0 marks a follow-up chunk of the same OCR result, which is appended.
+        """
+        self.root.after(0, self.show_ocr_text, text, part)
+        return self.translation_scheduler.submit(text, source=source, part=part)
+        
+    @traced("ui_update")
+    def show_ocr_text(self, text, part=0):
+        """Put (or append) OCR text in the OCR output pane"""
+        if part == 0:
+            self.ocr_output_text.delete(1.0, tk.END)
+        else:
+            self.ocr_output_text.insert(tk.END, "\n")
+        self.ocr_output_text.insert(tk.END, text)
         
-    def _run_ocr_translation(self, text_to_translate):
-        """Run OCR text translation in background thread"""
+    def _run_ocr_translation(self, request):
+        """Translate a scheduled request on the scheduler's worker thread"""
+        if self.stream_translation_var.get():
+            self._run_streaming_ocr_translation(request)
+            return
+            
         try:
-            # Prepare translation prompt
-            prompt = f"""Translate the following Japanese text to English. 
-            Only return the English translation without any additional commentary:
-
-            {text_to_translate}"""
+            with get_tracer().span("translate"):
+                translated_text = self.translate_text(request.text)
             
-            # Call Ollama translation model
-            response = ollama.chat(
-                model='lauchacarro/qwen2.5-translator:latest',
-                messages=[{'role': 'user', 'content': prompt}]
-            )
+            self.translation_context.append((request.text, translated_text))
+            
+            if not request.is_cancelled():
+                self.root.after(0, self.update_translation_output, translated_text, request.part)
             
-            # Extract translated text
-            if hasattr(response, 'message'):
-                translated_text = response.message.content.strip()
+        except Exception as e:
+            if not request.is_cancelled():
+                self.root.after(0, self.ocr_translation_error, str(e))
+            
+    def _run_batched_ocr_translation(self, requests):
+        """
+        Translate several scheduled requests in one LLM call on the scheduler's worker thread.
+        Cached lines are answered directly; results are shown in submission order.
+        """
+        model = self.translator.model
+        translations = {}
+        missing = []
+        for request in requests:
+            cached = self.cached_translation(request.text, BATCH_PROMPT_VERSION)
+            if cached is not None:
+                translations[request.seq] = cached
             else:
-                translated_text = response['message']['content'].strip()
+                missing.append(request)
+        
+        try:
+            if missing:
+                with get_tracer().span("translate_batch"):
+                    results = self.translator.translate_batch([request.text for request in missing],
+                                                              list(self.translation_context))
+                for request, translated_text in zip(missing, results):
+                    self.translation_cache.put(request.text, model, BATCH_PROMPT_VERSION, translated_text)
+                    translations[request.seq] = translated_text
             
-            self.root.after(0, self.update_translation_output, translated_text)
+        except Exception as e:
+            if not all(request.is_cancelled() for request in requests):
+                self.root.after(0, self.ocr_translation_error, str(e))
+            return
+        
+        self.root.after(0, self.update_cache_stats)
+        for request in requests:
+            translated_text = translations[request.seq]
+            self.translation_context.append((request.text, translated_text))
+            if not request.is_cancelled():
+                self.root.after(0, self.update_translation_output, translated_text, request.part)
+        self.root.after(0, self.status_var.set,
+                        f"Translated {len(requests)} lines in one request ({len(requests) - len(missing)} cached)")
+        
+    def update_batch_translation(self):
+        """Turn request batching on or off"""
+        self.translation_scheduler.max_batch = 8 if self.batch_translation_var.get() else 1
+            
+    def _run_streaming_ocr_translation(self, request):
+        """Stream a scheduled translation into the output pane; stops early if the request is cancelled"""
+        start_time = time.perf_counter()
+        first_token_time = None
+        
+        def on_chunk(piece):
+            nonlocal first_token_time
+            if request.is_cancelled():
+                return
+            if first_token_time is None:
+                first_token_time = time.perf_counter() - start_time
+                get_tracer().record("translate_first_token", first_token_time)
+                self.root.after(0, self.status_var.set,
+                                f"Translating... first token after {first_token_time:.2f}s")
+            self.root.after(0, self.append_translation_output, piece)
+        
+        self.root.after(0, self.begin_translation_output, request.part)
+        try:
+            translated_text = self.translate_text_stream(request.text, on_chunk,
+                                                         should_stop=request.is_cancelled)
+            if translated_text is None or request.is_cancelled():
+                return
+            self.translation_context.append((request.text, translated_text))
+            total_time = time.perf_counter() - start_time
+            get_tracer().record("translate", total_time)
+            self.root.after(0, self.finish_translation_output, translated_text,
+                            first_token_time if first_token_time is not None else total_time, total_time)
             
         except Exception as e:
-            self.root.after(0, self.translation_error, str(e))
+            if not request.is_cancelled():
+                self.root.after(0, self.ocr_translation_error, str(e))
             
-    def update_translation_output(self, translated_text):
-        """Update translation output with English text"""
+    @traced("ui_update")
+    def begin_translation_output(self, part=0):
+        """Prepare the translation pane for streamed text (cleared for a new result, new line for a chunk)"""
         self.translation_output_text.config(state=tk.NORMAL)
-        self.translation_output_text.delete(1.0, tk.END)
+        if part == 0:
+            self.translation_output_text.delete(1.0, tk.END)
+        else:
+            self.translation_output_text.insert(tk.END, "\n")
+        self.translation_output_text.mark_set("part_start", "end-1c")
+        self.translation_output_text.mark_gravity("part_start", tk.LEFT)
+        self.translation_output_text.config(state=tk.DISABLED)
+        
+    @traced("ui_update")
+    def append_translation_output(self, piece):
+        """Append a streamed piece of the translation"""
+        self.translation_output_text.config(state=tk.NORMAL)
+        self.translation_output_text.insert(tk.END, piece)
+        self.translation_output_text.see(tk.END)
+        self.translation_output_text.config(state=tk.DISABLED)
+        
+    @traced("ui_update")
+    def finish_translation_output(self, translated_text, first_token_time, total_time):
+        """Show the final streamed translation and its latency"""
+        self.translation_output_text.config(state=tk.NORMAL)
+        self.translation_output_text.delete("part_start", tk.END)
+        self.translation_output_text.insert(tk.END, translated_text)
+        self.translation_output_text.config(state=tk.DISABLED)
+        self.status_var.set(
+            f"Translation completed ({len(translated_text)} characters) | "
+            f"first token {first_token_time:.2f}s, total {total_time:.2f}s"
+        )
+            
+    @traced("ui_update")
+    def update_translation_output(self, translated_text, part=0):
+        """Update translation output with English text (appended for follow-up chunks)"""
+        self.translation_output_text.config(state=tk.NORMAL)
+        if part == 0:
+            self.translation_output_text.delete(1.0, tk.END)
+        else:
+            self.translation_output_text.insert(tk.END, "\n")
         self.translation_output_text.insert(tk.END, translated_text)
         self.translation_output_text.config(state=tk.DISABLED)
         self.status_var.set(f"Translation completed ({len(translated_text)} characters)")
@@ -571,8 +829,8 @@ class ScreenTranslatorApp:
         self.ocr_output_text.insert(tk.END, f"OCR Error: {error_message}")
         self.status_var.set(f"OCR extraction failed: {error_message}")
         
-    def translation_error(self, error_message):
-        """Handle translation errors"""
+    def ocr_translation_error(self, error_message):
+        """Handle OCR translation errors"""
         self.translation_output_text.config(state=tk.NORMAL)
         self.translation_output_text.delete(1.0, tk.END)
         self.translation_output_text.insert(tk.END, f"Translation Error: {error_message}")
@@ -610,23 +868,91 @@ class ScreenTranslatorApp:
         """Reload the OCR model"""
         self.status_var.set("Reloading OCR model...")
         self.ocr_status_var.set("Reloading...")
+        self.ocr_status_label.config(foreground="orange")
+        
+        # Loads in the background; on_ocr_model_ready updates the UI when done
+        self.ocr_engine.reload()
+        
+    def update_cache_stats(self):
+        """Refresh the translation cache counters in the Settings tab"""
+        stats = self.translation_cache.stats()
+        self.cache_stats_var.set(
+            f"Translations - Hits: {stats['hits']} ({stats['disk_hits']} from disk) | "
+            f"Fuzzy hits: {stats['fuzzy_hits']} | "
+            f"Misses: {stats['misses']} | Hit rate: {stats['hit_rate']:.0%}\n"
+            f"Entries: {stats['memory_entries']} in memory, {stats['stored_entries']} on disk, "
+            f"{stats['fuzzy_index_entries']} in translation memory\n"
+            f"Game: {stats['game'] or 'none'} ({stats['loaded_games']} games loaded)"
+        )
         
-        def reload_thread():
-            try:
-                self.manga_ocr = MangaOcr()
-                self.root.after(0, lambda: self.ocr_status_var.set("Ready"))
-                self.root.after(0, lambda: self.status_var.set("OCR model reloaded successfully"))
-            except Exception as e:
-                self.root.after(0, lambda: self.ocr_status_var.set("Failed"))
-                self.root.after(0, lambda: self.status_var.set(f"Failed to reload OCR: {str(e)}"))
-                
-        thread = threading.Thread(target=reload_thread)
-        thread.daemon = True
-        thread.start()
+        ocr_cache = self.ocr_engine.cache
+        ocr_stats = ocr_cache.stats()
+        self.ocr_cache_stats_var.set(
+            f"OCR results - Hits: {ocr_stats['hits']} ({ocr_stats['near_hits']} near-identical) | "
+            f"Misses: {ocr_stats['misses']} | Hit rate: {ocr_stats['hit_rate']:.0%}\n"
+            f"Entries: {ocr_stats['entries']}/{ocr_cache.max_entries}, "
+            f"{ocr_stats['bytes'] / 1024:.1f} KB of {ocr_cache.max_bytes / 1024:.0f} KB "
+            f"for {ocr_stats['game'] or 'no game'} ({ocr_stats['loaded_games']} games loaded)"
+        )
+        
+        engine_stats = self.ocr_engine.stats()
+        rss = engine_stats['rss_bytes']
+        memory = f"{rss / (1024 * 1024):.0f} MB" if rss is not None else "unknown"
+        self.ocr_engine_stats_var.set(
+            f"Inferences: {engine_stats['inferences']} "
+            f"(avg {engine_stats['avg_inference_ms']:.0f} ms) | Process memory: {memory}"
+        )
+        
+    def update_performance_panel(self):
+        """Refresh the per-stage timing table once a second"""
+        summary = get_tracer().summary()
+        if summary:
+            lines = [f"{'stage':<22}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'last ms':>10}"]
+            for stage, stats in sorted(summary.items()):
+                lines.append(
+                    f"{stage:<22}{stats['count']:>7}{stats['p50_ms']:>10.1f}"
+                    f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['last_ms']:>10.1f}"
+                )
+            self.perf_stats_var.set("\n".join(lines))
+        else:
+            self.perf_stats_var.set("No samples yet")
+        self.root.after(1000, self.update_performance_panel)
+        
+    def export_performance_trace(self, extension):
+        """Save the buffered stage timings as JSON or CSV"""
+        path = filedialog.asksaveasfilename(
+            defaultextension=extension,
+            filetypes=[("JSON files", "*.json")] if extension == ".json" else [("CSV files", "*.csv")],
+            initialfile=f"perf_trace{extension}"
+        )
+        if not path:
+            return
+        try:
+            get_tracer().export(path)
+            self.status_var.set(f"Performance trace exported to {path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export performance trace: {e}")
+            
+    def reset_performance_trace(self):
+        """Drop every buffered stage timing"""
+        get_tracer().reset()
+        self.perf_stats_var.set("No samples yet")
+        
+    def clear_translation_cache(self):
+        """Remove all cached translations"""
+        self.translation_cache.clear()
+        self.update_cache_stats()
+        self.status_var.set("Translation cache cleared")
+        
+    def clear_ocr_cache(self):
+        """Remove all cached OCR results"""
+        self.ocr_engine.cache.clear()
+        self.update_cache_stats()
+        self.status_var.set("OCR cache cleared")
         
     def test_ocr(self):
         """Test OCR functionality with a small region"""
-        if not self.manga_ocr:
+        if self.ocr_engine.has_failed():
             messagebox.showerror("Error", "OCR model not available.")
             return
             
@@ -0,0 +1,189 @@
+"""
+Ollama translation backend.
+
+Wraps one long-lived ollama.Client so every translation reuses pooled HTTP
+connections, has a request timeout, and asks Ollama to keep the model loaded
+between sporadic requests (keep_alive). Without keep_alive the model is
+unloaded after a few idle minutes and the next line pays a multi-second load.
+"""
+
+import json
+import os
+import re
+import threading
+
+TRANSLATION_MODEL = 'lauchacarro/qwen2.5-translator:latest'
+
+# Bump PROMPT_VERSION whenever TRANSLATION_PROMPT changes so cached translations are not reused
+TRANSLATION_PROMPT = """Translate the following Japanese text to English. 
+Only return the English translation without any additional commentary or explanation:
+
+{text}"""
+PROMPT_VERSION = 1
+
+# Several dialogue lines per request; the reply is split back into one translation per line.
+# Batch translations are cached under their own version: bump BATCH_PROMPT_VERSION whenever
+# BATCH_TRANSLATION_PROMPT or BATCH_CONTEXT_PROMPT changes
+BATCH_TRANSLATION_PROMPT = """Translate each numbered line of Japanese dialogue below to English.
+{context}Return only a JSON array with exactly {count} strings: the English translation of each numbered line, in order.
+
+{lines}"""
+BATCH_CONTEXT_PROMPT = """Earlier dialogue, for context only (do not translate it again):
+{pairs}
+
+"""
+BATCH_PROMPT_VERSION = "batch-1"
+
+_NUMBERED_LINE_RE = re.compile(r'^\s*(\d+)[.):]\s*(.*?)\s*$', re.MULTILINE)
+
+DEFAULT_HOST = os.environ.get('OLLAMA_HOST', 'http://127.0.0.1:11434')
+
+
+def _message_content(response):
+    """Text of a chat response or stream chunk (object or dict style)"""
+    if hasattr(response, 'message'):
+        return response.message.content or ''
+    return response['message']['content'] or ''
+
+
+def parse_batch_reply(reply, count):
+    """
+    Split a batch reply into count translations: a JSON array of strings, or
+    failing that "1. ..." numbered lines. Returns None if neither matches.
+    """
+    start, end = reply.find('['), reply.rfind(']')
+    if 0 <= start < end:
+        try:
+            items = json.loads(reply[start:end + 1])
+            if isinstance(items, list) and len(items) == count:
+                return [str(item).strip() for item in items]
+        except ValueError:
+            pass
+
+    numbered = {int(number): text for number, text in _NUMBERED_LINE_RE.findall(reply)}
+    if all(number in numbered for number in range(1, count + 1)):
+        return [numbered[number].strip('"') for number in range(1, count + 1)]
+    return None
+
+
+class OllamaTranslator:
+    """Translator backed by a persistent, pooled Ollama client"""
+
+    def __init__(self, model=TRANSLATION_MODEL, host=None, timeout=120.0,
+                 keep_alive='30m', max_connections=4, client=None):
+        """
+        model: Ollama model name
+        host: Ollama server URL (defaults to $OLLAMA_HOST or localhost:11434)
+        timeout: per-request timeout in seconds
+        keep_alive: how long Ollama keeps the model loaded after a request
+        max_connections: size of the HTTP connection pool
+        client: pre-built ollama.Client (mainly for tests)
+        """
+        self.model = model
+        self.host = host or DEFAULT_HOST
+        self.timeout = timeout
+        self.keep_alive = keep_alive
+        self.max_connections = max_connections
+        self._client = client
+        self._client_lock = threading.Lock()
+
+    @property
+    def client(self):
+        """The shared ollama.Client, created on first use"""
+        with self._client_lock:
+            if self._client is None:
+                self._client = self._create_client()
+            return self._client
+
+    def _create_client(self):
+        import httpx
+        import ollama
+
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+        )
+        return ollama.Client(host=self.host, timeout=self.timeout, limits=limits)
+
+    def chat(self, messages):
+        """Send chat messages and return the reply text"""
+        response = self.client.chat(
+            model=self.model,
+            messages=messages,
+            keep_alive=self.keep_alive,
+        )
+        return _message_content(response).strip()
+
+    def chat_stream(self, messages):
+        """Send chat messages and yield the reply as it is generated"""
+        stream = self.client.chat(
+            model=self.model,
+            messages=messages,
+            keep_alive=self.keep_alive,
+            stream=True,
+        )
+        try:
+            for chunk in stream:
+                piece = _message_content(chunk)
+                if piece:
+                    yield piece
+        finally:
+            close = getattr(stream, 'close', None)
+            if close is not None:
+                close()
+
+    @staticmethod
+    def build_messages(text):
+        """Chat messages for translating one piece of Japanese text"""
+        return [{'role': 'user', 'content': TRANSLATION_PROMPT.format(text=text)}]
+
+    def translate(self, text):
+        """Translate Japanese text to English"""
+        return self.chat(self.build_messages(text))
+
+    def translate_stream(self, text):
+        """Translate Japanese text to English, yielding pieces as they stream in"""
+        return self.chat_stream(self.build_messages(text))
+
+    @staticmethod
+    def build_batch_messages(lines, context=()):
+        """Chat messages for translating several lines at once; context is [(japanese, english), ...]"""
+        context_text = ''
+        if context:
+            pairs = "\n".join(f"Japanese: {jp}\nEnglish: {en}" for jp, en in context)
+            context_text = BATCH_CONTEXT_PROMPT.format(pairs=pairs)
+        numbered = "\n".join(f"{i}. {' '.join(line.split())}" for i, line in enumerate(lines, 1))
+        prompt = BATCH_TRANSLATION_PROMPT.format(context=context_text, count=len(lines), lines=numbered)
+        return [{'role': 'user', 'content': prompt}]
+
+    def translate_batch(self, lines, context=()):
+        """
+        Translate several lines in one request, with earlier (japanese, english)
+        pairs as context. Returns one translation per line; falls back to
+        line-by-line requests if the reply cannot be split.
+        """
+        if len(lines) == 1 and not context:
+            return [self.translate(lines[0])]
+
+        translations = parse_batch_reply(self.chat(self.build_batch_messages(lines, context)), len(lines))
+        if translations is None:
+            print("Batch translation reply could not be split, translating line by line")
+            translations = [self.translate(line) for line in lines]
+        return translations
+
+    def warm_up(self):
+        """Ask Ollama to load the model now so the first translation is fast"""
+        try:
+            self.client.generate(model=self.model, prompt='', keep_alive=self.keep_alive)
+            return True
+        except Exception as e:
+            print(f"Could not preload translation model: {e}")
+            return False
+
+    def close(self):
+        """Close pooled connections"""
+        with self._client_lock:
+            inner = getattr(self._client, '_client', None)
+            if inner is not None:
+                inner.close()
+            self._client = None
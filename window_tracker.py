@@ -0,0 +1,304 @@
+"""
+Foreground window tracking shared by the launcher and region manager.
+
+Looking up the foreground game used to cost a win32 foreground query plus a
+fresh psutil.Process(pid).name() on every call, once a second and again on
+every hotkey. WindowTracker keeps one snapshot of the foreground window for
+all callers:
+
+- with a foreground-change event hook (SetWinEventHook on Windows), the
+  snapshot is refreshed only after the foreground window changed
+- without one, the foreground handle is polled at most every min_interval
+  seconds, and the snapshot is rebuilt only when the handle differs
+- the window title, which games change between scenes, is re-read at most
+  every min_interval seconds in both modes
+- PID -> executable names are cached, so switching back to a window costs
+  no process lookup; an entry is dropped when the PID shows up with another
+  window handle, since Windows reuses the PIDs of exited processes
+
+Window providers wrap the platform API; FakeWindowProvider scripts windows
+for tests on machines without a desktop.
+"""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import win32gui
+    import win32process
+    WIN32_AVAILABLE = True
+except ImportError:
+    WIN32_AVAILABLE = False
+
+WindowSnapshot = namedtuple("WindowSnapshot", "handle pid exe_name title")
+
+UNKNOWN_WINDOW = WindowSnapshot(None, None, "unknown", "Unknown Window")
+NO_PROVIDER_WINDOW = WindowSnapshot(
+    None, None, "unknown", "Unknown Window (pywin32 not available)"
+)
+
+EVENT_SYSTEM_FOREGROUND = 0x0003
+WINEVENT_OUTOFCONTEXT = 0x0000
+
+
+class Win32WindowProvider:
+    """Foreground window queries through pywin32 and psutil"""
+
+    def foreground_window(self):
+        return win32gui.GetForegroundWindow()
+
+    def window_pid(self, handle):
+        return win32process.GetWindowThreadProcessId(handle)[1]
+
+    def window_title(self, handle):
+        return win32gui.GetWindowText(handle)
+
+    def process_name(self, pid):
+        return psutil.Process(pid).name()
+
+    def watch(self, callback):
+        """
+        Call callback(handle) on every foreground change, from a hook thread.
+        Returns False if the event hook could not be installed.
+        """
+        import ctypes
+        from ctypes import wintypes
+
+        hooked = {}
+        ready = threading.Event()
+
+        def run():
+            user32 = ctypes.WinDLL("user32", use_last_error=True)
+            win_event_proc = ctypes.WINFUNCTYPE(
+                None, wintypes.HANDLE, wintypes.DWORD, wintypes.HWND,
+                wintypes.LONG, wintypes.LONG, wintypes.DWORD, wintypes.DWORD
+            )
+            user32.SetWinEventHook.restype = wintypes.HANDLE
+            user32.SetWinEventHook.argtypes = [
+                wintypes.DWORD, wintypes.DWORD, wintypes.HMODULE,
+                win_event_proc, wintypes.DWORD, wintypes.DWORD,
+                wintypes.DWORD
+            ]
+
+            def on_event(hook, event, handle, id_object, id_child,
+                         thread_id, event_time):
+                callback(handle)
+
+            # Keep the ctypes callback alive as long as the hook
+            self._event_proc = win_event_proc(on_event)
+            hook = user32.SetWinEventHook(
+                EVENT_SYSTEM_FOREGROUND, EVENT_SYSTEM_FOREGROUND, 0,
+                self._event_proc, 0, 0, WINEVENT_OUTOFCONTEXT
+            )
+            hooked["ok"] = bool(hook)
+            ready.set()
+            if not hook:
+                return
+
+            # Out-of-context hooks are delivered through this thread's
+            # message loop
+            msg = wintypes.MSG()
+            while user32.GetMessageW(ctypes.byref(msg), 0, 0, 0) > 0:
+                user32.TranslateMessage(ctypes.byref(msg))
+                user32.DispatchMessageW(ctypes.byref(msg))
+
+        threading.Thread(target=run, daemon=True).start()
+        ready.wait(2)
+        return hooked.get("ok", False)
+
+
+class FakeWindowProvider:
+    """Scripted windows for tests; counts the calls a real provider makes"""
+
+    def __init__(self, event_driven=False):
+        self.event_driven = event_driven
+        self.windows = {}    # handle -> (pid, title)
+        self.processes = {}  # pid -> executable name
+        self.foreground = None
+        self.callback = None
+        self.foreground_calls = 0
+        self.process_calls = 0
+
+    def add_window(self, handle, pid, exe_name, title=""):
+        self.windows[handle] = (pid, title)
+        self.processes[pid] = exe_name
+
+    def set_title(self, handle, title):
+        """Retitle a window (no foreground event, like a real title change)"""
+        self.windows[handle] = (self.windows[handle][0], title)
+
+    def close_window(self, handle):
+        """Destroy a window and exit its process, freeing the PID for reuse"""
+        pid = self.windows.pop(handle)[0]
+        self.processes.pop(pid, None)
+        if self.foreground == handle:
+            self.foreground = None
+
+    def focus(self, handle):
+        """Bring a window to the foreground (fires the hook if watched)"""
+        self.foreground = handle
+        if self.callback is not None:
+            self.callback(handle)
+
+    def foreground_window(self):
+        self.foreground_calls += 1
+        return self.foreground
+
+    def window_pid(self, handle):
+        return self.windows[handle][0]
+
+    def window_title(self, handle):
+        return self.windows[handle][1]
+
+    def process_name(self, pid):
+        self.process_calls += 1
+        if pid not in self.processes:
+            raise LookupError(f"No process {pid}")
+        return self.processes[pid]
+
+    def watch(self, callback):
+        if not self.event_driven:
+            return False
+        self.callback = callback
+        return True
+
+
+def create_window_provider():
+    """
+    Platform window provider, or None where foreground windows cannot be
+    queried
+    """
+    if WIN32_AVAILABLE and psutil is not None:
+        return Win32WindowProvider()
+    return None
+
+
+class WindowTracker:
+    """One cached snapshot of the foreground window, shared by every caller"""
+
+    def __init__(self, provider=None, min_interval=0.25, max_cached_pids=256,
+                 use_events=True):
+        """
+        provider: window provider (default: the platform one, if any)
+        min_interval: seconds between foreground polls (without an event
+            hook) and between title refreshes
+        max_cached_pids: PID -> executable names remembered
+        """
+        if provider is None:
+            provider = create_window_provider()
+        self.provider = provider
+        self.min_interval = min_interval
+        self.max_cached_pids = max_cached_pids
+        self.snapshot = None
+        self.last_poll = 0.0
+        self.pid_names = OrderedDict()  # pid -> (window handle, exe name)
+        self.lock = threading.Lock()
+        self.dirty = True
+        self.refreshes = 0
+        self.process_lookups = 0
+
+        self.event_driven = False
+        if self.provider is not None and use_events:
+            try:
+                self.event_driven = self.provider.watch(
+                    self._on_foreground_change
+                )
+            except Exception as e:
+                print(f"Foreground event hook unavailable, "
+                      f"polling instead: {e}")
+
+    def _on_foreground_change(self, handle):
+        self.dirty = True
+
+    def _exe_name(self, pid, handle):
+        """
+        Executable name of a process, from the PID cache when possible.
+        The cached name is only trusted for the window it was looked up
+        for: a PID seen with a new handle may belong to a new process.
+        """
+        cached = self.pid_names.get(pid)
+        if cached is not None and cached[0] == handle:
+            self.pid_names.move_to_end(pid)
+            return cached[1]
+
+        self.process_lookups += 1
+        name = self.provider.process_name(pid).lower()
+        self.pid_names[pid] = (handle, name)
+        self.pid_names.move_to_end(pid)
+        while len(self.pid_names) > self.max_cached_pids:
+            self.pid_names.popitem(last=False)
+        return name
+
+    def current(self, force=False):
+        """
+        Snapshot of the foreground window; cheap enough to call on every
+        hotkey
+        """
+        if self.provider is None:
+            return NO_PROVIDER_WINDOW
+
+        with self.lock:
+            now = time.monotonic()
+            cached = self.snapshot is not None and not force
+            # With an event hook, a clean snapshot still has the right window
+            same_window = cached and self.event_driven and not self.dirty
+            if cached and now - self.last_poll < self.min_interval:
+                if same_window or not self.event_driven:
+                    return self.snapshot
+
+            self.last_poll = now
+            try:
+                if same_window:
+                    # Title changes raise no foreground event
+                    handle = self.snapshot.handle
+                else:
+                    self.dirty = False
+                    handle = self.provider.foreground_window()
+
+                title = self.provider.window_title(handle)
+                if cached and handle == self.snapshot.handle:
+                    if title != self.snapshot.title:
+                        self.snapshot = self.snapshot._replace(title=title)
+                    return self.snapshot
+
+                pid = self.provider.window_pid(handle)
+                exe_name = self._exe_name(pid, handle)
+                self.snapshot = WindowSnapshot(handle, pid, exe_name, title)
+                self.refreshes += 1
+                return self.snapshot
+            except Exception as e:
+                print(f"Error getting active window: {e}")
+                self.snapshot = None
+                return UNKNOWN_WINDOW
+
+    def stats(self):
+        """Refresh counters for tuning"""
+        with self.lock:
+            return {
+                "event_driven": self.event_driven,
+                "refreshes": self.refreshes,
+                "process_lookups": self.process_lookups,
+                "cached_pids": len(self.pid_names),
+            }
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_window_tracker():
+    """Return the process-wide window tracker"""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            if not WIN32_AVAILABLE:
+                print("Warning: pywin32 not available. "
+                      "Game detection will be limited.")
+            _tracker = WindowTracker()
+        return _tracker